@@ -13,6 +13,7 @@ __all__ = [
     "Forward",
     "Info",
     "Label",
+    "LabelExtractor",
     "MixedSourceEstimate",
     "MixedVectorSourceEstimate",
     "Projection",
@@ -375,6 +376,7 @@ from .proj import (
 from .rank import compute_rank
 from .report import Report, open_report
 from .source_estimate import (
+    LabelExtractor,
     MixedSourceEstimate,
     MixedVectorSourceEstimate,
     SourceEstimate,
@@ -27,6 +27,10 @@ from ..utils import (
     warn,
 )
 
+# Memory (in bytes) allowed for the intermediate arrays of each block of
+# sources when computing beamformer filters
+_BF_BLOCK_BYTES = 100e6
+
 
 def _check_proj_match(proj, filters):
     """Check whether SSP projections in data and spatial filter match."""
@@ -172,13 +176,10 @@ def _sym_inv_sm(x, reduce_rank, inversion, sk):
             assert not reduce_rank  # guaranteed earlier
             with np.errstate(divide="ignore"):
                 diags = 1.0 / diags
-            # set the diagonal of each 3x3
+            # set the diagonal of each 3x3 and reapply source covariance
             x_inv = np.zeros_like(x)
-            for k in range(x.shape[0]):
-                this = diags[k]
-                # Reapply source covariance after inversion
-                this *= sk[k] * sk[k]
-                x_inv[k].flat[::4] = this
+            idx = np.arange(3)
+            x_inv[:, idx, idx] = diags * sk * sk
     return x_inv
 
 
@@ -265,10 +266,8 @@ def _compute_beamformer(
     logger.info(f"Computing beamformer filters for {n_sources} source{_pl(n_sources)}")
     n_channels = G.shape[0]
     assert n_orient in (3, 1)
-    Gk = np.reshape(G.T, (n_sources, n_orient, n_channels)).transpose(0, 2, 1)
-    assert Gk.shape == (n_sources, n_channels, n_orient)
     sk = np.reshape(orient_std, (n_sources, n_orient))
-    del G, orient_std
+    del orient_std
 
     _check_option("reduce_rank", reduce_rank, (True, False))
 
@@ -292,6 +291,88 @@ def _compute_beamformer(
             "model with MEG channels), otherwise consider using "
             "reduce_rank=False"
         )
+
+    # The filters of all sources are computed at once using stacked
+    # operations, in blocks of sources to limit the memory used by the
+    # intermediate arrays for dense source spaces
+    n_orient_out = 1 if pick_ori in ("normal", "max-power") else n_orient
+    W = np.empty(
+        (n_sources, n_orient_out, n_channels), np.result_type(G.dtype, Cm_inv.dtype)
+    )
+    max_power_ori = np.empty((n_sources, 3)) if pick_ori == "max-power" else None
+    Cm_inv_sq = Cm_inv @ Cm_inv if pick_ori == "max-power" else None
+    n_block = _BF_BLOCK_BYTES // (16 * 4 * n_orient * n_channels)
+    n_block = max(int(n_block), 1)
+    for start in range(0, n_sources, n_block):
+        sl = slice(start, start + n_block)
+        Gk = np.reshape(
+            G[:, sl.start * n_orient : sl.stop * n_orient].T,
+            (-1, n_orient, n_channels),
+        ).transpose(0, 2, 1)
+        W[sl], this_ori = _compute_beamformer_block(
+            Gk,
+            Cm_inv,
+            Cm_inv_sq,
+            sk[sl],
+            nn[sl],
+            weight_norm,
+            pick_ori,
+            reduce_rank,
+            inversion,
+        )
+        if max_power_ori is not None:
+            max_power_ori[sl] = this_ori
+    del G, sk
+
+    if weight_norm == "nai":
+        # Estimate noise level based on covariance matrix, taking the
+        # first eigenvalue that falls outside the signal subspace or the
+        # loading factor used during regularization, whichever is largest.
+        if rank > len(Cm):
+            # Covariance matrix is full rank, no noise subspace!
+            # Use the loading factor as noise ceiling.
+            if loading_factor == 0:
+                raise RuntimeError(
+                    "Cannot compute noise subspace with a full-rank "
+                    "covariance matrix and no regularization. Try "
+                    "manually specifying the rank of the covariance "
+                    "matrix or using regularization."
+                )
+            noise = loading_factor
+        else:
+            noise, _ = np.linalg.eigh(Cm)
+            noise = noise[-rank]
+            noise = max(noise, loading_factor)
+        W /= np.sqrt(noise)
+
+    W = W.reshape(n_sources * n_orient_out, n_channels)
+    logger.info("Filter computation complete")
+    return W, max_power_ori
+
+
+def _compute_bf_terms(Gk, Cm_inv):
+    # A single matrix product over all sources is much faster than a stacked
+    # one with a broadcast Cm_inv
+    n_sources, n_channels, n_orient = Gk.shape
+    bf_numer = Gk.swapaxes(-2, -1).conj().reshape(n_sources * n_orient, n_channels)
+    bf_numer = (bf_numer @ Cm_inv).reshape(n_sources, n_orient, n_channels)
+    bf_denom = np.matmul(bf_numer, Gk)
+    return bf_numer, bf_denom
+
+
+def _compute_beamformer_block(
+    Gk,
+    Cm_inv,
+    Cm_inv_sq,
+    sk,
+    nn,
+    weight_norm,
+    pick_ori,
+    reduce_rank,
+    inversion,
+):
+    """Compute the (unit-gain or weight normalized) filters of some sources."""
+    n_sources, n_channels, n_orient = Gk.shape
     if n_orient > 1:
         _, Gk_s, _ = np.linalg.svd(Gk, full_matrices=False)
         assert Gk_s.shape == (n_sources, n_orient)
@@ -309,11 +390,6 @@ def _compute_beamformer(
     if reduce_rank:
         Gk = _reduce_leadfield_rank(Gk)
 
-    def _compute_bf_terms(Gk, Cm_inv):
-        bf_numer = np.matmul(Gk.swapaxes(-2, -1).conj(), Cm_inv)
-        bf_denom = np.matmul(bf_numer, Gk)
-        return bf_numer, bf_denom
-
     #
     # 2. Reorient lead field in direction of max power or normal
     #
@@ -327,9 +403,7 @@ def _compute_beamformer(
             # compute power, cf Sekihara & Nagarajan 2008, eq. 4.47
             ori_numer = bf_denom
             # Cm_inv should be Hermitian so no need for .T.conj()
-            ori_denom = np.matmul(
-                np.matmul(Gk.swapaxes(-2, -1).conj(), Cm_inv @ Cm_inv), Gk
-            )
+            _, ori_denom = _compute_bf_terms(Gk, Cm_inv_sq)
         ori_denom_inv = _sym_inv_sm(ori_denom, reduce_rank, inversion, sk)
         ori_pick = np.matmul(ori_denom_inv, ori_numer)
         assert ori_pick.shape == (n_sources, n_orient, n_orient)
@@ -389,64 +463,37 @@ def _compute_beamformer(
     # with W_ung referring to the unit-noise-gain (weight normalized) filter
     # and W_ug referring to the above-calculated unit-gain filter stored in W.
 
-    if weight_norm is not None:
-        # Three different ways to calculate the normalization factors here.
-        # Only matters when in vector mode, as otherwise n_orient == 1 and
-        # they are all equivalent.
-        #
-        # In MNE < 0.21, we just used the Frobenius matrix norm:
+    # Three different ways to calculate the normalization factors here.
+    # Only matters when in vector mode, as otherwise n_orient == 1 and
+    # they are all equivalent.
+    #
+    # In MNE < 0.21, we just used the Frobenius matrix norm:
+    #
+    #    noise_norm = np.linalg.norm(W, axis=(1, 2), keepdims=True)
+    #    assert noise_norm.shape == (n_sources, 1, 1)
+    #    W /= noise_norm
+    #
+    # Sekihara 2008 says to use sqrt(diag(W_ug @ W_ug.T)), which is not
+    # rotation invariant:
+    if weight_norm in ("unit-noise-gain", "nai"):
+        noise_norm = np.matmul(W, W.swapaxes(-2, -1).conj()).real
+        noise_norm = np.reshape(  # np.diag operation over last two axes
+            noise_norm, (n_sources, -1, 1)
+        )[:, :: n_orient + 1]
+        np.sqrt(noise_norm, out=noise_norm)
+        noise_norm[noise_norm == 0] = np.inf
+        assert noise_norm.shape == (n_sources, n_orient, 1)
+        W /= noise_norm
+    elif weight_norm == "unit-noise-gain-invariant":
+        # Here we use sqrtm. The shortcut:
         #
-        #    noise_norm = np.linalg.norm(W, axis=(1, 2), keepdims=True)
-        #    assert noise_norm.shape == (n_sources, 1, 1)
-        #    W /= noise_norm
+        #    use = W
         #
-        # Sekihara 2008 says to use sqrt(diag(W_ug @ W_ug.T)), which is not
-        # rotation invariant:
-        if weight_norm in ("unit-noise-gain", "nai"):
-            noise_norm = np.matmul(W, W.swapaxes(-2, -1).conj()).real
-            noise_norm = np.reshape(  # np.diag operation over last two axes
-                noise_norm, (n_sources, -1, 1)
-            )[:, :: n_orient + 1]
-            np.sqrt(noise_norm, out=noise_norm)
-            noise_norm[noise_norm == 0] = np.inf
-            assert noise_norm.shape == (n_sources, n_orient, 1)
-            W /= noise_norm
-        else:
-            assert weight_norm == "unit-noise-gain-invariant"
-            # Here we use sqrtm. The shortcut:
-            #
-            #    use = W
-            #
-            # ... does not match the direct route (it is rotated!), so we'll
-            # use the direct one to match FieldTrip:
-            use = bf_numer
-            inner = np.matmul(use, use.swapaxes(-2, -1).conj())
-            W = np.matmul(_sym_mat_pow(inner, -0.5), use)
-            noise_norm = 1.0
-
-        if weight_norm == "nai":
-            # Estimate noise level based on covariance matrix, taking the
-            # first eigenvalue that falls outside the signal subspace or the
-            # loading factor used during regularization, whichever is largest.
-            if rank > len(Cm):
-                # Covariance matrix is full rank, no noise subspace!
-                # Use the loading factor as noise ceiling.
-                if loading_factor == 0:
-                    raise RuntimeError(
-                        "Cannot compute noise subspace with a full-rank "
-                        "covariance matrix and no regularization. Try "
-                        "manually specifying the rank of the covariance "
-                        "matrix or using regularization."
-                    )
-                noise = loading_factor
-            else:
-                noise, _ = np.linalg.eigh(Cm)
-                noise = noise[-rank]
-                noise = max(noise, loading_factor)
-            W /= np.sqrt(noise)
-
-    W = W.reshape(n_sources * n_orient, n_channels)
-    logger.info("Filter computation complete")
+        # ... does not match the direct route (it is rotated!), so we'll
+        # use the direct one to match FieldTrip:
+        use = bf_numer
+        inner = np.matmul(use, use.swapaxes(-2, -1).conj())
+        W = np.matmul(_sym_mat_pow(inner, -0.5), use)
     return W, max_power_ori
 
 
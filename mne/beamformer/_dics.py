@@ -10,6 +10,7 @@ from .._fiff.pick import pick_channels, pick_info
 from ..channels import equalize_channels
 from ..forward import _subject_from_forward
 from ..minimum_norm.inverse import _check_depth, _check_reference, combine_xyz
+from ..parallel import parallel_func
 from ..rank import compute_rank
 from ..source_estimate import _get_src_type, _make_stc
 from ..time_frequency import EpochsTFR
@@ -49,6 +50,7 @@ def make_dics(
     depth=1.0,
     real_filter=True,
     inversion="matrix",
+    n_jobs=None,
     verbose=None,
 ):
     """Compute a Dynamic Imaging of Coherent Sources (DICS) spatial filter.
@@ -104,6 +106,11 @@ def make_dics(
 
         .. versionchanged:: 0.21
            Default changed to ``'matrix'``.
+    %(n_jobs)s
+        The filters of the different frequencies are computed in parallel
+        using threads.
+
+        .. versionadded:: 1.11
     %(verbose)s
 
     Returns
@@ -246,27 +253,15 @@ def make_dics(
     ch_names = list(info["ch_names"])
 
     logger.info("Computing DICS spatial filters...")
-    Ws = []
-    max_oris = []
-    for i, freq in enumerate(frequencies):
-        if n_freqs > 1:
-            logger.info(
-                "    computing DICS spatial filter at "
-                f"{round(freq, 2)} Hz ({i + 1}/{n_freqs})"
-            )
-
-        Cm = csd.get_data(index=i)
-
-        # XXX: Weird that real_filter happens *before* whitening, which could
-        # make things complex again...?
-        if real_filter:
-            Cm = Cm.real
-
-        # compute spatial filter
-        n_orient = 3 if is_free_ori else 1
-        W, max_power_ori = _compute_beamformer(
+    n_orient = 3 if is_free_ori else 1
+    parallel, p_fun, n_jobs = parallel_func(
+        _compute_dics_filter, n_jobs, max_jobs=n_freqs, prefer="threads"
+    )
+    out = parallel(
+        p_fun(
+            csd,
+            i,
             G,
-            Cm,
             reg,
             n_orient,
             weight_norm,
@@ -277,9 +272,11 @@ def make_dics(
             nn=nn,
             orient_std=orient_std,
             whitener=whitener,
+            real_filter=real_filter,
         )
-        Ws.append(W)
-        max_oris.append(max_power_ori)
+        for i in range(n_freqs)
+    )
+    Ws, max_oris = zip(*out)
 
     Ws = np.array(Ws)
     if pick_ori == "max-power":
@@ -314,6 +311,54 @@ def make_dics(
     return filters
 
 
+def _compute_dics_filter(
+    csd,
+    i,
+    G,
+    reg,
+    n_orient,
+    weight_norm,
+    pick_ori,
+    reduce_rank,
+    rank,
+    inversion,
+    nn,
+    orient_std,
+    whitener,
+    real_filter,
+):
+    n_freqs = len(csd.frequencies)
+    if n_freqs > 1:
+        freq = np.mean(csd.frequencies[i])
+        logger.info(
+            "    computing DICS spatial filter at "
+            f"{round(freq, 2)} Hz ({i + 1}/{n_freqs})"
+        )
+
+    Cm = csd.get_data(index=i)
+
+    # XXX: Weird that real_filter happens *before* whitening, which could
+    # make things complex again...?
+    if real_filter:
+        Cm = Cm.real
+
+    # compute spatial filter
+    return _compute_beamformer(
+        G,
+        Cm,
+        reg,
+        n_orient,
+        weight_norm,
+        pick_ori,
+        reduce_rank,
+        rank=rank,
+        inversion=inversion,
+        nn=nn,
+        orient_std=orient_std,
+        whitener=whitener,
+    )
+
+
 def _prepare_noise_csd(csd, noise_csd, real_filter):
     if noise_csd is not None:
         csd, noise_csd = equalize_channels([csd, noise_csd])
@@ -586,6 +586,21 @@ def test_real(_load_forward, idx):
     assert dist == 0
     assert power.data[source_ind, 1] > power.data[source_ind, 0]
 
+    # the filters of the two frequencies can be computed in parallel
+    filters_par = make_dics(
+        epochs.info,
+        fwd_surf,
+        csd,
+        label=label,
+        reg=5,
+        pick_ori="max-power",
+        inversion="matrix",
+        reduce_rank=True,
+        n_jobs=2,
+    )
+    assert_allclose(filters_par["weights"], filters_real["weights"])
+    assert_allclose(filters_par["max_power_ori"], filters_real["max_power_ori"])
+
     # Test computing source power on a volume source space
     filters_vol = make_dics(epochs.info, fwd_vol, csd, reg=reg, inversion="single")
     power, f = apply_dics_csd(csd, filters_vol)
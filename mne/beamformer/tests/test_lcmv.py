@@ -40,7 +40,10 @@ from mne.beamformer import (
     make_lcmv,
     read_beamformer,
 )
-from mne.beamformer._compute_beamformer import _prepare_beamformer_input
+from mne.beamformer._compute_beamformer import (
+    _compute_beamformer,
+    _prepare_beamformer_input,
+)
 from mne.datasets import testing
 from mne.minimum_norm import apply_inverse, make_inverse_operator
 from mne.minimum_norm.tests.test_inverse import _assert_free_ori_match
@@ -1261,4 +1264,49 @@ def test_api():
     dics_names[dics_names.index("csd")] = "data_cov"
     dics_names[dics_names.index("noise_csd")] = "noise_cov"
     dics_names.pop(dics_names.index("real_filter"))  # not a thing for LCMV
+    dics_names.pop(dics_names.index("n_jobs"))  # LCMV has a single covariance
     assert lcmv_names == dics_names
+
+
+@pytest.mark.parametrize("inversion", ("matrix", "single"))
+@pytest.mark.parametrize("pick_ori", (None, "max-power", "normal"))
+def test_compute_beamformer_blocks(monkeypatch, pick_ori, inversion):
+    """Test computing beamformer filters in blocks of sources."""
+    rng = np.random.default_rng(0)
+    n_channels, n_sources = 20, 50
+    G = rng.standard_normal((n_channels, 3 * n_sources))
+    Cm = rng.standard_normal((n_channels, 2 * n_channels))
+    Cm = Cm @ Cm.T
+    nn = np.tile([0.0, 0.0, 1.0], (n_sources, 1))
+    args = (G, Cm, 0.05, 3, "nai", pick_ori, False)
+    kwargs = dict(
+        rank=n_channels - 1,
+        inversion=inversion,
+        nn=nn,
+        orient_std=np.ones(3 * n_sources),
+        whitener=np.eye(n_channels),
+    )
+    W, max_power_ori = _compute_beamformer(*args, **kwargs)
+    n_orient = 3 if pick_ori is None else 1
+    assert W.shape == (n_orient * n_sources, n_channels)
+    # the filters are the same when computed in blocks of 8 sources
+    monkeypatch.setattr(
+        mne.beamformer._compute_beamformer,
+        "_BF_BLOCK_BYTES",
+        8 * 16 * 4 * 3 * n_channels,
+    )
+    W_block, max_power_ori_block = _compute_beamformer(*args, **kwargs)
+    assert_allclose(W_block, W, rtol=1e-10)
+    if pick_ori == "max-power":
+        assert_allclose(max_power_ori_block, max_power_ori, rtol=1e-10)
+    else:
+        assert max_power_ori is max_power_ori_block is None
+    # which are those of single sources
+    for si in (0, 17, n_sources - 1):
+        use = slice(3 * si, 3 * si + 3)
+        W_one, _ = _compute_beamformer(
+            G[:, use],
+            *args[1:],
+            **{**kwargs, "nn": nn[[si]], "orient_std": np.ones(3)},
+        )
+        assert_allclose(W_one, W[n_orient * si : n_orient * (si + 1)], rtol=1e-10)
@@ -21,7 +21,23 @@ from ..fixes import bincount, jit
 from ..parallel import parallel_func
 from ..surface import _jit_cross, _project_onto_surface
 from ..transforms import apply_trans, invert_transform
-from ..utils import _check_option, _pl, fill_doc, logger, verbose, warn
+from ..utils import (
+    _ArrayCache,
+    _check_option,
+    _pl,
+    fill_doc,
+    logger,
+    object_hash,
+    verbose,
+    warn,
+)
+
+# Maximum memory (in bytes) used by the BEM solutions at the sensors kept in
+# memory when MNE_CACHE_FORWARD is true
+_FORWARD_CACHE_BYTES = 500e6
+_forward_cache = _ArrayCache(
+    _FORWARD_CACHE_BYTES, "forward", "MNE_CACHE_FORWARD", memory=False
+)
 
 # #############################################################################
 # COIL SPECIFICATION AND FIELD COMPUTATION MATRIX
@@ -266,6 +282,40 @@ def _bem_specify_els(bem, els, mults):
     return sol
 
 
+def _bem_specify_cached(bem, coils, coil_type, mults, n_jobs):
+    """Set up the BEM solution at the sensors, reusing it when cached."""
+    key = None
+    if _forward_cache.enabled:
+        # The BEM solution matrix is determined by the surfaces,
+        # conductivities, method and solver, which are much cheaper to hash
+        # than the matrix itself
+        bem_key = [
+            bem.get("solver", "mne"),
+            bem["bem_method"],
+            bem["head_mri_t"]["trans"],
+            bem["solution"].shape,
+        ]
+        for surf in bem["surfs"]:
+            bem_key.extend([surf["id"], surf["sigma"], surf["rr"], surf["tris"]])
+        coil_key = [
+            [coil[k] for k in ("coord_frame", "rmag", "cosmag", "w") if k in coil]
+            for coil in coils
+        ]
+        key = object_hash([coil_type, bem_key, coil_key, mults])
+        entry = _forward_cache.get(f"{coil_type}_solution", key)
+        if entry is not None:
+            logger.info("Using cached field computation matrix")
+            return entry["solution"].copy()
+    if coil_type == "meg":
+        cf = FIFF.FIFFV_COORD_HEAD
+        solution = _bem_specify_coils(bem, coils, cf, mults, n_jobs)
+    else:
+        solution = _bem_specify_els(bem, coils, mults)
+    if key is not None:
+        _forward_cache.put(f"{coil_type}_solution", key, dict(solution=solution))
+    return solution
+
+
 # #############################################################################
 # BEM COMPUTATION
 
@@ -407,25 +457,25 @@ def _bem_pot_or_field(rr, mri_rr, mri_Q, coils, solution, bem_rr, n_jobs, coil_t
     """
     # Both MEG and EEG have the inifinite-medium potentials
     # This could be just vectorized, but eats too much memory, so instead we
-    # reduce memory by chunking within _do_inf_pots and parallelize, too:
-    parallel, p_fun, n_jobs = parallel_func(_do_inf_pots, n_jobs, max_jobs=len(rr))
+    # reduce memory by chunking within _do_inf_pots and parallelize over
+    # sources, too. The work is done by BLAS and nogil-compiled code, so threads
+    # can share the (large) solution matrix without copying or pickling it:
+    parallel, p_fun, n_jobs = parallel_func(
+        _do_inf_pots, n_jobs, max_jobs=len(rr), prefer="threads"
+    )
     nas = np.array_split
-    B = np.sum(
-        parallel(
-            p_fun(
-                mri_rr, sr.copy(), np.ascontiguousarray(mri_Q), np.array(sol)
-            )  # copy and contig
-            for sr, sol in zip(nas(bem_rr, n_jobs), nas(solution.T, n_jobs))
-        ),
+    mri_Q = np.ascontiguousarray(mri_Q)
+    B = np.concatenate(
+        parallel(p_fun(r, bem_rr, mri_Q, solution.T) for r in nas(mri_rr, n_jobs)),
         axis=0,
     )
-    # The copy()s above should make it so the whole objects don't need to be
-    # pickled...
 
     # Only MEG coils are sensitive to the primary current distribution.
     if coil_type == "meg":
         # Primary current contribution (can be calc. in coil/dipole coords)
-        parallel, p_fun, n_jobs = parallel_func(_do_prim_curr, n_jobs)
+        parallel, p_fun, n_jobs = parallel_func(
+            _do_prim_curr, n_jobs, max_jobs=len(rr), prefer="threads"
+        )
         pcc = np.concatenate(parallel(p_fun(r, coils) for r in nas(rr, n_jobs)), axis=0)
         B += pcc
         B *= _MAG_FACTOR
@@ -481,8 +531,8 @@ def _do_inf_pots(mri_rr, bem_rr, mri_Q, sol):
         3D vertex positions for all surfaces in the BEM
     mri_Q :
         3x3 head -> MRI transform. I.e., head_mri_t.dot(np.eye(3))
-    sol : ndarray, shape (n_sensors_subset, n_BEM_vertices_subset)
-        Comes from _bem_specify_coils
+    sol : ndarray, shape (n_BEM_vertices, n_sensors)
+        Comes from _bem_specify_coils (transposed)
 
     Returns
     -------
@@ -512,7 +562,9 @@ def _do_inf_pots(mri_rr, bem_rr, mri_Q, sol):
 def _sphere_pot_or_field(rr, mri_rr, mri_Q, coils, solution, bem_rr, n_jobs, coil_type):
     """Do potential or field for spherical model."""
     fun = _eeg_spherepot_coil if coil_type == "eeg" else _sphere_field
-    parallel, p_fun, n_jobs = parallel_func(fun, n_jobs, max_jobs=len(rr))
+    parallel, p_fun, n_jobs = parallel_func(
+        fun, n_jobs, max_jobs=len(rr), prefer="threads"
+    )
     B = np.concatenate(
         parallel(p_fun(r, coils, sphere=solution) for r in np.array_split(rr, n_jobs))
     )
@@ -751,13 +803,11 @@ def _prep_field_computation(rr, *, sensors, bem, n_jobs, verbose=None):
                 # MEG field computation matrices for BEM
                 start = "Composing the field computation matrix"
                 logger.info("\n" + start + "...")
-                cf = FIFF.FIFFV_COORD_HEAD
-                # multiply solution by "mults" here for simplicity
-                solution = _bem_specify_coils(bem, coils, cf, mults, n_jobs)
             else:
                 # Compute solution for EEG sensor
                 logger.info("Setting up for EEG...")
-                solution = _bem_specify_els(bem, coils, mults)
+            # multiply solution by "mults" here for simplicity
+            solution = _bem_specify_cached(bem, coils, coil_type, mults, n_jobs)
         else:
             solution = bem
             if coil_type == "eeg":
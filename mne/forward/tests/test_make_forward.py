@@ -27,13 +27,21 @@ from mne import (
     write_forward_solution,
 )
 from mne._fiff.constants import FIFF
-from mne.bem import make_bem_solution, read_bem_surfaces
+from mne.bem import _surfaces_to_bem, make_bem_solution, read_bem_surfaces
 from mne.channels import make_standard_montage
 from mne.datasets import testing
 from mne.dipole import Dipole, fit_dipole
 from mne.forward import Forward, _do_forward_solution, use_coil_def
-from mne.forward._compute_forward import _magnetic_dipole_field_vec
-from mne.forward._make_forward import _create_meg_coils, make_forward_dipole
+from mne.forward._compute_forward import (
+    _bem_specify_cached,
+    _forward_cache,
+    _magnetic_dipole_field_vec,
+)
+from mne.forward._make_forward import (
+    _create_eeg_els,
+    _create_meg_coils,
+    make_forward_dipole,
+)
 from mne.forward.tests.test_forward import assert_forward_allclose
 from mne.io import read_info, read_raw_bti, read_raw_fif, read_raw_kit
 from mne.simulation import simulate_evoked
@@ -431,6 +439,73 @@ def test_make_forward_solution_basic():
         make_forward_solution(fname_raw, fname_trans, fname_src, fname_bem_meg)
 
 
+@testing.requires_testing_data
+def test_make_forward_solution_cache(small_surf_src, tmp_path, monkeypatch):
+    """Test reusing the BEM solution at the sensors and threaded computation."""
+    # only cached when enabled
+    monkeypatch.setenv("MNE_CACHE_FORWARD", "false")
+    _forward_cache.clear()
+    make_forward_solution(fname_raw, fname_trans, small_surf_src, fname_bem)
+    with catch_logging() as log:
+        make_forward_solution(
+            fname_raw, fname_trans, small_surf_src, fname_bem, verbose=True
+        )
+    assert "Using cached" not in log.getvalue()
+    monkeypatch.setenv("MNE_CACHE_FORWARD", "true")
+    fwd = make_forward_solution(fname_raw, fname_trans, small_surf_src, fname_bem)
+    with catch_logging() as log:
+        fwd_cached = make_forward_solution(
+            fname_raw, fname_trans, small_surf_src, fname_bem, n_jobs=2, verbose=True
+        )
+    assert log.getvalue().count("Using cached field computation matrix") == 2
+    assert_allclose(fwd_cached["sol"]["data"], fwd["sol"]["data"], rtol=1e-10)
+    # the sensor geometry is part of the key
+    info = read_info(fname_raw)
+    info["dev_head_t"]["trans"][:3, 3] += [0.0, 0.0, 0.01]
+    with catch_logging() as log:
+        make_forward_solution(
+            info, fname_trans, small_surf_src, fname_bem, eeg=False, verbose=True
+        )
+    assert "Using cached" not in log.getvalue()
+    # store on disk
+    monkeypatch.setenv("MNE_CACHE_DIR", str(tmp_path))
+    _forward_cache.clear()
+    make_forward_solution(fname_raw, fname_trans, small_surf_src, fname_bem)
+    assert len(list((tmp_path / "forward").glob("*.npz"))) == 2
+    _forward_cache.clear()
+    with catch_logging() as log:
+        fwd_cached = make_forward_solution(
+            fname_raw, fname_trans, small_surf_src, fname_bem, verbose=True
+        )
+    assert "Loaded cached meg_solution" in log.getvalue()
+    assert_allclose(fwd_cached["sol"]["data"], fwd["sol"]["data"], rtol=1e-10)
+
+
+def test_bem_specify_cached_solver(monkeypatch):
+    """Test that the BEM solver is part of the key of the cached solutions."""
+    monkeypatch.setenv("MNE_CACHE_FORWARD", "true")
+    surf = _get_ico_surface(2)
+    surf["rr"] *= 80  # mm
+    model = _surfaces_to_bem([surf], [FIFF.FIFFV_BEM_SURF_ID_BRAIN], [0.3])
+    bem = make_bem_solution(model)
+    bem["head_mri_t"] = Transform("head", "mri")
+    mults = np.full((1, len(surf["rr"])), bem["source_mult"][0] / (4.0 * np.pi))
+    info = create_info(["Fz", "Cz", "Pz"], 1000.0, "eeg")
+    info.set_montage("standard_1020")
+    els = _create_eeg_els(info["chs"])
+    _forward_cache.clear()
+    solution = _bem_specify_cached(bem, els, "eeg", mults, 1)
+    with catch_logging(True) as log:
+        cached = _bem_specify_cached(bem, els, "eeg", mults, 1)
+    assert "Using cached" in log.getvalue()
+    assert_array_equal(cached, solution)
+    bem["solver"] = "openmeeg"
+    with catch_logging(True) as log:
+        _bem_specify_cached(bem, els, "eeg", mults, 1)
+    assert "Using cached" not in log.getvalue()
+    _forward_cache.clear()
+
+
 @requires_openmeeg_mark()
 @pytest.mark.parametrize(
     "n_layers",
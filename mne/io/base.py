@@ -2319,6 +2319,15 @@ class BaseRaw(
         -----
         .. versionadded:: 1.2
 
+        If the data are not preloaded and ``method="welch"`` is used with
+        ``average="mean"`` or ``average="median"``, the data are read from disk
+        (and transformed) in blocks of segments, so that memory usage does not grow
+        with the duration of the recording. In this case, the median across segments
+        is approximated using the remedian :footcite:`RousseeuwBassett1990`.
+
+        .. versionchanged:: 1.11
+           Welch spectra of non-preloaded data are computed block by block.
+
         References
         ----------
         .. footbibliography::
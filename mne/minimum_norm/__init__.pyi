@@ -4,7 +4,10 @@ __all__ = [
     "apply_inverse",
     "apply_inverse_cov",
     "apply_inverse_epochs",
+    "apply_inverse_epochs_labels",
     "apply_inverse_raw",
+    "apply_inverse_raw_labels",
+    "apply_inverse_raw_to_file",
     "apply_inverse_tfr_epochs",
     "compute_rank_inverse",
     "compute_source_psd",
@@ -27,7 +30,10 @@ from .inverse import (
     apply_inverse,
     apply_inverse_cov,
     apply_inverse_epochs,
+    apply_inverse_epochs_labels,
     apply_inverse_raw,
+    apply_inverse_raw_labels,
+    apply_inverse_raw_to_file,
     apply_inverse_tfr_epochs,
     compute_rank_inverse,
     estimate_snr,
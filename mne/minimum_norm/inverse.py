@@ -2,11 +2,12 @@
 # License: BSD-3-Clause
 # Copyright the MNE-Python contributors.
 
+from contextlib import ExitStack
 from copy import deepcopy
 from math import sqrt
 
 import numpy as np
-from scipy import linalg
+from scipy import linalg, sparse
 from scipy.stats import chi2
 
 from .._fiff.constants import FIFF
@@ -51,7 +52,19 @@ from ..forward import (
 from ..forward.forward import _triage_loose, write_forward_meas_info
 from ..html_templates import _get_html_template
 from ..io import BaseRaw
-from ..source_estimate import _get_src_type, _make_stc
+from ..source_estimate import (
+    _add_mixed_label_means,
+    _check_label_mode,
+    _check_label_src,
+    _get_src_type,
+    _label_funcs,
+    _label_weights,
+    _make_stc,
+    _pca_flip,
+    _prepare_label_extraction,
+    _restrict_label_vertidx,
+    _write_stc_header,
+)
 from ..source_space._source_space import (
     _get_src_nn,
     _get_vertno,
@@ -64,6 +77,7 @@ from ..surface import _normal_orth
 from ..time_frequency.tfr import _check_tfr_complex
 from ..transforms import _ensure_trans, transform_surface_to
 from ..utils import (
+    _ArrayCache,
     _check_compensation_grade,
     _check_depth,
     _check_fname,
@@ -73,14 +87,44 @@ from ..utils import (
     _verbose_safe_false,
     check_fname,
     logger,
+    object_hash,
     repr_html,
     verbose,
     warn,
 )
 from ._eloreta import _compute_eloreta
 
+# Memory (in bytes) used by the source time courses of each block of epochs or
+# raw samples
+_SOURCE_BLOCK_BYTES = 10e6
+
 INVERSE_METHODS = ("MNE", "dSPM", "sLORETA", "eLORETA")
 
+# Maximum memory (in bytes) used by the prepared inverse operators and kernels
+# kept in memory when MNE_CACHE_INVERSE is true
+_INVERSE_CACHE_BYTES = 500e6
+_inverse_cache = _ArrayCache(
+    _INVERSE_CACHE_BYTES, "inverse", "MNE_CACHE_INVERSE", memory=False
+)
+
+# Entries of the inverse operator that are modified by prepare_inverse_operator
+_PREPARED_FIELDS = (
+    ("noise_cov", "data"),
+    ("noise_cov", "eig"),
+    ("noise_cov", "eigvec"),
+    ("source_cov", "data"),
+    ("eigen_leads", "data"),
+    ("eigen_fields", "data"),
+    ("sing",),
+    ("reginv",),
+    ("proj",),
+    ("whitener",),
+    ("colorer",),
+    ("noisenorm",),
+    ("nave",),
+    ("eigen_leads_weighted",),
+)
+
 
 class InverseOperator(dict):
     """InverseOperator class to represent info from inverse operator."""
@@ -589,10 +633,33 @@ def _check_ch_names(inv, info):
 
 def _check_or_prepare(inv, nave, lambda2, method, method_params, prepared, copy=True):
     """Check if inverse was prepared, or prepare it."""
-    if not prepared:
+    if not prepared and not _inverse_cache.enabled:
+        # hashing the operator is not worth it when it is not cached
         inv = prepare_inverse_operator(
             inv, nave, lambda2, method, method_params, copy=copy
         )
+    elif not prepared:
+        key = object_hash(
+            [_inverse_hash(inv), nave, float(lambda2), method, method_params]
+        )
+        entry = _inverse_cache.get("prepared", key)
+        if entry is None:
+            inv = prepare_inverse_operator(
+                inv, nave, lambda2, method, method_params, copy=copy
+            )
+            entry = dict()
+            for field in _PREPARED_FIELDS:
+                value = inv[field[0]]
+                if len(field) == 2:
+                    value = value.get(field[1])
+                if value is not None:
+                    entry["/".join(field)] = _read_only(np.asarray(value))
+            _inverse_cache.put("prepared", key, entry)
+        else:
+            logger.info("Using cached prepared inverse operator")
+            inv = _prepared_from_cache(inv, entry)
+        # allows _assemble_kernel to cache the kernel of this inverse
+        inv._prepared_hash = key
     elif "colorer" not in inv:
         raise ValueError(
             "inverse operator has not been prepared, but got "
@@ -602,6 +669,60 @@ def _check_or_prepare(inv, nave, lambda2, method, method_params, prepared, copy=
     return inv
 
 
+def _inverse_hash(inv):
+    """Hash the content of an inverse operator that its application uses."""
+    keys = (
+        "eigen_leads",
+        "eigen_fields",
+        "sing",
+        "noise_cov",
+        "source_cov",
+        "orient_prior",
+        "source_nn",
+        "projs",
+        "nave",
+        "eigen_leads_weighted",
+        "source_ori",
+        "nsource",
+    )
+    src = [
+        (s["type"], s["vertno"], s["nn"], s.get("patch_inds"), s.get("pinfo"))
+        for s in inv["src"]
+    ]
+    return object_hash([{key: inv[key] for key in keys}, src])
+
+
+def _read_only(x):
+    x.flags.writeable = False
+    return x
+
+
+def _prepared_from_cache(orig, entry):
+    """Build a prepared inverse operator from cached arrays."""
+    inv = InverseOperator(orig)
+    for key in ("noise_cov", "source_cov", "eigen_leads", "eigen_fields"):
+        inv[key] = orig[key].copy()
+    for name, value in entry.items():
+        field = name.split("/")
+        value = _read_only(value)
+        if value.ndim == 0:
+            value = value.item()
+        elif name == "noisenorm" and value.size == 0:
+            value = []
+        if len(field) == 2:
+            inv[field[0]][field[1]] = value
+        else:
+            inv[field[0]] = value
+    return inv
+
+
+def _label_hash(label):
+    if label is None:
+        return None
+    labels = [label.lh, label.rh] if label.hemi == "both" else [label]
+    return [(this_label.hemi, this_label.vertices) for this_label in labels]
+
+
 @verbose
 def prepare_inverse_operator(
     orig, nave, lambda2, method="dSPM", method_params=None, copy=True, verbose=None
@@ -634,6 +755,19 @@ def prepare_inverse_operator(
     -------
     inv : instance of InverseOperator
         Prepared inverse operator.
+
+    Notes
+    -----
+    If the ``MNE_CACHE_INVERSE`` config is ``"true"`` (see
+    :func:`mne.set_config`), functions like :func:`apply_inverse` called with
+    ``prepared=False`` cache the prepared inverse operator and its imaging
+    kernel in memory, based on the content of the inverse operator and the
+    parameters, so that applying the same inverse operator again skips these
+    computations. If ``MNE_CACHE_DIR`` is set, they are also stored in this
+    directory to be reused by other processes.
+
+    .. versionchanged:: 1.11
+       Prepared inverse operators can be cached.
     """
     if nave <= 0:
         raise ValueError("The number of averages should be positive")
@@ -769,6 +903,8 @@ def _assemble_kernel(inv, label, method, pick_ori, use_cps=True, verbose=None):
     components. This does all the data transformations to compute the weights
     for the eigenleads.
 
+    The kernel is cached when ``inv`` was prepared by ``_check_or_prepare``.
+
     Parameters
     ----------
     inv : instance of InverseOperator
@@ -800,6 +936,32 @@ def _assemble_kernel(inv, label, method, pick_ori, use_cps=True, verbose=None):
         The direction in cartesian coordicates of the direction of the source
         dipoles.
     """  # noqa: E501
+    key = getattr(inv, "_prepared_hash", None)
+    if key is not None:
+        key = object_hash([key, _label_hash(label), method, pick_ori, use_cps])
+        entry = _inverse_cache.get("kernel", key)
+        if entry is not None:
+            logger.info("    Using cached kernel")
+            n_vertno = sum(name.startswith("vertno_") for name in entry)
+            vertno = [entry[f"vertno_{ii}"].copy() for ii in range(n_vertno)]
+            noise_norm = entry.get("noise_norm")
+            return entry["K"].copy(), noise_norm, vertno, entry["source_nn"]
+        K, noise_norm, vertno, source_nn = _compute_kernel(
+            inv, label, method, pick_ori, use_cps
+        )
+        entry = dict(K=K.copy(), source_nn=source_nn)
+        if noise_norm is not None:
+            entry["noise_norm"] = noise_norm
+        for ii, v in enumerate(vertno):
+            entry[f"vertno_{ii}"] = v.copy()
+        for value in entry.values():
+            _read_only(value)
+        _inverse_cache.put("kernel", key, entry)
+        return K, noise_norm, vertno, source_nn
+    return _compute_kernel(inv, label, method, pick_ori, use_cps)
+
+
+def _compute_kernel(inv, label, method, pick_ori, use_cps):
     eigen_leads = inv["eigen_leads"]["data"]
     source_cov = inv["source_cov"]["data"]
     if method in ("dSPM", "sLORETA"):
@@ -1289,6 +1451,297 @@ def apply_inverse_raw(
     return stc
 
 
+def _iter_raw_blocks(raw, sel, start, stop, n_block):
+    """Iterate over blocks of n_block samples restricted to the channels in sel."""
+    for this_start in range(start, stop, n_block):
+        this_stop = min(this_start + n_block, stop)
+        logger.info(
+            "Processing samples : %d-%d / %d", this_start, this_stop - 1, stop - start
+        )
+        yield raw.get_data(sel, this_start, this_stop)
+
+
+def _check_raw_start_stop(raw, start, stop):
+    start, stop, _ = slice(start, stop).indices(raw.n_times)
+    if stop <= start:
+        raise ValueError(f"No samples to process between {start} and {stop}.")
+    return start, stop
+
+
+@verbose
+def apply_inverse_raw_to_file(
+    fname,
+    raw,
+    inverse_operator,
+    lambda2,
+    method="dSPM",
+    label=None,
+    start=None,
+    stop=None,
+    nave=1,
+    pick_ori=None,
+    *,
+    prepared=False,
+    method_params=None,
+    use_cps=True,
+    overwrite=False,
+    verbose=None,
+):
+    """Apply inverse operator to Raw data and write the source estimate to disk.
+
+    The data are read, projected to the sources and written to an STC file
+    block by block, such that neither the sensor data nor the source estimate
+    of the whole recording are held in memory.
+
+    Parameters
+    ----------
+    fname : path-like
+        The stem of the file name, as in :meth:`mne.SourceEstimate.save`. For
+        surface source spaces, ``"-lh.stc"`` and ``"-rh.stc"`` are added to
+        the stem, otherwise ``"-vl.stc"`` is added (unless the name already
+        ends with ``"-vl.stc"`` or ``"-vol.stc"``).
+    raw : Raw object
+        Raw data. They do not need to be preloaded.
+    inverse_operator : dict
+        Inverse operator.
+    lambda2 : float
+        The regularization parameter.
+    method : "MNE" | "dSPM" | "sLORETA" | "eLORETA"
+        Use minimum norm, dSPM (default), sLORETA, or eLORETA.
+    label : Label | None
+        Restricts the source estimates to a given label. If None,
+        source estimates will be computed for the entire source space.
+    start : int
+        Index of first time sample (index not time is seconds).
+    stop : int
+        Index of first time sample not to include (index not time is seconds).
+    nave : int
+        Number of averages used to regularize the solution.
+        Set to 1 on raw data.
+    pick_ori : None | "normal"
+        Options:
+
+        - ``None``
+            Pooling is performed by taking the norm of loose/free
+            orientations. In case of a fixed source space no norm is computed
+            leading to signed source activity.
+        - ``"normal"``
+            Only the normal to the cortical surface is kept. This is only
+            implemented when working with loose orientations.
+    prepared : bool
+        If True, do not call :func:`prepare_inverse_operator`.
+    method_params : dict | None
+        Additional options for eLORETA. See Notes of :func:`apply_inverse`.
+    %(use_cps_restricted)s
+    %(overwrite)s
+    %(verbose)s
+
+    Returns
+    -------
+    fnames : list of Path
+        The names of the written files, which can be read with
+        :func:`mne.read_source_estimate`.
+
+    See Also
+    --------
+    apply_inverse_raw : Apply inverse operator to Raw data.
+    apply_inverse_raw_labels : Apply inverse operator to Raw data and extract label time courses.
+
+    Notes
+    -----
+    Only surface source spaces and single volume or discrete source spaces can
+    be written to STC files. The data are stored as single precision floating
+    point numbers.
+
+    .. versionadded:: 1.11
+    """  # noqa: E501
+    _validate_type(raw, BaseRaw, "raw")
+    _check_reference(raw, inverse_operator["info"]["ch_names"])
+    _check_option("method", method, INVERSE_METHODS)
+    _check_option("pick_ori", pick_ori, [None, "normal"])
+    _check_ori(pick_ori, inverse_operator["source_ori"], inverse_operator["src"])
+    _check_ch_names(inverse_operator, raw.info)
+    start, stop = _check_raw_start_stop(raw, start, stop)
+
+    inv = _check_or_prepare(
+        inverse_operator, nave, lambda2, method, method_params, prepared
+    )
+    sel = _pick_channels_inverse_operator(raw.ch_names, inv)
+    logger.info("Applying inverse to raw...")
+    logger.info("    Picked %d channels from the data", len(sel))
+    K, noise_norm, vertno, _ = _assemble_kernel(inv, label, method, pick_ori, use_cps)
+    src_type = _get_src_type(inverse_operator["src"], vertno)
+    if src_type == "mixed" or (src_type != "surface" and len(vertno) != 1):
+        # like VolSourceEstimate.save, as the vertices of several volumes
+        # cannot be told apart in a single file
+        raise ValueError(
+            "Only source estimates of surface source spaces or of a single volume "
+            "or discrete source space can be written to STC files, use "
+            "apply_inverse_raw and save them in HDF5 format instead."
+        )
+    is_free_ori = not (is_fixed_orient(inverse_operator) or pick_ori == "normal")
+    if not is_free_ori and noise_norm is not None:
+        # premultiply kernel with noise normalization
+        K *= noise_norm
+
+    fname = str(_check_fname(fname, overwrite=True))  # checked below
+    if src_type == "surface":
+        fnames = [fname + "-lh.stc", fname + "-rh.stc"]
+    elif fname.endswith(("-vl.stc", "-vol.stc")):
+        fnames = [fname]
+    else:
+        fnames = [fname + "-vl.stc"]
+    fnames = [_check_fname(f, overwrite=overwrite) for f in fnames]
+    splits = np.cumsum([len(v) for v in vertno])[:-1]
+
+    tmin = float(raw.times[start])
+    tstep = 1.0 / raw.info["sfreq"]
+    n_block = max(int(_SOURCE_BLOCK_BYTES // (8 * K.shape[0])), 1)
+    with ExitStack() as stack:
+        fids = [stack.enter_context(open(f, "wb")) for f in fnames]
+        for fid, this_vertno in zip(fids, vertno):
+            _write_stc_header(fid, tmin, tstep, this_vertno, stop - start)
+        for data in _iter_raw_blocks(raw, sel, start, stop, n_block):
+            sol = np.dot(K, data)
+            if is_free_ori:
+                sol = combine_xyz(sol)
+                if noise_norm is not None:
+                    sol *= noise_norm
+            for fid, this_sol in zip(fids, np.split(sol, splits)):
+                fid.write(np.array(this_sol.T, dtype=">f4").tobytes())
+    logger.info("[done]")
+    return fnames
+
+
+@verbose
+def apply_inverse_raw_labels(
+    raw,
+    inverse_operator,
+    lambda2,
+    labels,
+    method="dSPM",
+    mode="auto",
+    start=None,
+    stop=None,
+    nave=1,
+    pick_ori=None,
+    *,
+    allow_empty=False,
+    mri_resolution=True,
+    prepared=False,
+    method_params=None,
+    use_cps=True,
+    verbose=None,
+):
+    """Apply inverse operator to Raw data and extract label time courses.
+
+    This gives the same result as :func:`apply_inverse_raw` followed by
+    :func:`mne.extract_label_time_course`, without computing the time courses
+    of all source space vertices nor holding them in memory.
+
+    Parameters
+    ----------
+    raw : Raw object
+        Raw data. They do not need to be preloaded.
+    inverse_operator : dict
+        Inverse operator.
+    lambda2 : float
+        The regularization parameter.
+    %(labels_eltc)s
+    method : "MNE" | "dSPM" | "sLORETA" | "eLORETA"
+        Use minimum norm, dSPM (default), sLORETA, or eLORETA.
+    mode : str
+        Extraction method, as in :func:`mne.extract_label_time_course`, except
+        for ``"pca_flip"`` which is not supported because it depends on the
+        data of the whole recording.
+    start : int
+        Index of first time sample (index not time is seconds).
+    stop : int
+        Index of first time sample not to include (index not time is seconds).
+    nave : int
+        Number of averages used to regularize the solution.
+        Set to 1 on raw data.
+    pick_ori : None | "normal"
+        Options:
+
+        - ``None``
+            Pooling is performed by taking the norm of loose/free
+            orientations. In case of a fixed source space no norm is computed
+            leading to signed source activity.
+        - ``"normal"``
+            Only the normal to the cortical surface is kept. This is only
+            implemented when working with loose orientations.
+    %(allow_empty_eltc)s
+    %(mri_resolution_eltc)s
+    prepared : bool
+        If True, do not call :func:`prepare_inverse_operator`.
+    method_params : dict | None
+        Additional options for eLORETA. See Notes of :func:`apply_inverse`.
+    %(use_cps_restricted)s
+    %(verbose)s
+
+    Returns
+    -------
+    label_tc : array, shape (n_labels, n_times)
+        The extracted time courses of each label.
+
+    See Also
+    --------
+    apply_inverse_raw : Apply inverse operator to Raw data.
+    apply_inverse_epochs_labels : Apply inverse operator to Epochs and extract label time courses.
+    mne.extract_label_time_course : Extract label time courses from source estimates.
+
+    Notes
+    -----
+    The data are read and processed in blocks of samples, using the label
+    kernel described in the Notes of :func:`apply_inverse_epochs_labels`.
+
+    .. versionadded:: 1.11
+    """  # noqa: E501
+    _validate_type(raw, BaseRaw, "raw")
+    _check_reference(raw, inverse_operator["info"]["ch_names"])
+    _check_option("method", method, INVERSE_METHODS)
+    _check_option("pick_ori", pick_ori, [None, "normal"])
+    _check_ori(pick_ori, inverse_operator["source_ori"], inverse_operator["src"])
+    _check_ch_names(inverse_operator, raw.info)
+    if mode == "pca_flip":
+        raise ValueError(
+            'mode="pca_flip" is not supported for continuous data, use '
+            "apply_inverse_raw and extract_label_time_course instead."
+        )
+    start, stop = _check_raw_start_stop(raw, start, stop)
+
+    inv = _check_or_prepare(
+        inverse_operator, nave, lambda2, method, method_params, prepared
+    )
+    sel = _pick_channels_inverse_operator(raw.ch_names, inv)
+    logger.info("Applying inverse to raw...")
+    logger.info("    Picked %d channels from the data", len(sel))
+    K, noise_norm, vertno, _ = _assemble_kernel(inv, None, method, pick_ori, use_cps)
+    is_free_ori = not (is_fixed_orient(inverse_operator) or pick_ori == "normal")
+    if not is_free_ori and noise_norm is not None:
+        K *= noise_norm
+
+    label_kernel = _prepare_label_kernel(
+        inverse_operator,
+        K,
+        noise_norm,
+        vertno,
+        is_free_ori,
+        labels,
+        mode,
+        allow_empty,
+        mri_resolution,
+    )
+    n_block = max(int(_SOURCE_BLOCK_BYTES // (8 * label_kernel[0].shape[0])), 1)
+    label_tc = [
+        _apply_label_kernel(data[np.newaxis], *label_kernel)[0]
+        for data in _iter_raw_blocks(raw, sel, start, stop, n_block)
+    ]
+    logger.info("[done]")
+    return np.concatenate(label_tc, axis=-1)
+
+
 def _apply_inverse_epochs_gen(
     epochs,
     inverse_operator,
@@ -1300,6 +1753,7 @@ def _apply_inverse_epochs_gen(
     prepared=False,
     method_params=None,
     use_cps=True,
+    delayed=False,
     verbose=None,
 ):
     """Generate inverse solutions for epochs. Used in apply_inverse_epochs."""
@@ -1339,46 +1793,57 @@ def _apply_inverse_epochs_gen(
         K *= noise_norm
 
     subject = _subject_from_inverse(inverse_operator)
-    try:
-        total = f" / {len(epochs)}"  # len not always defined
-    except RuntimeError:
-        total = f" / {len(epochs.events)} (at most)"
-    for k, e in enumerate(epochs):
-        logger.info("Processing epoch : %d%s", k + 1, total)
-        if is_free_ori:
-            # Compute solution and combine current components (non-linear)
-            sol = np.dot(K, e[sel])  # apply imaging kernel
-
-            if pick_ori != "vector":
+    src_type = _get_src_type(inverse_operator["src"], vertno)
+    n_block = max(int(_SOURCE_BLOCK_BYTES // (8 * K.shape[0] * len(epochs.times))), 1)
+    for data in _iter_epochs_blocks(epochs, sel, n_block):
+        if not is_free_ori and (delayed or len(sel) < K.shape[1]):
+            # Linear inverse: delay the computation until the data are needed
+            sol = [(K, e) for e in data]
+        else:
+            # Apply the imaging kernel to all epochs of the block at once
+            sol = np.dot(K, np.concatenate(data, axis=-1))
+            if is_free_ori and pick_ori != "vector":
+                # Combine current components (non-linear)
                 logger.info("combining the current components...")
                 sol = combine_xyz(sol)
-
-            if noise_norm is not None:
+            if is_free_ori and noise_norm is not None:
                 sol *= noise_norm
-        else:
-            # Linear inverse: do computation here or delayed
-            if len(sel) < K.shape[1]:
-                sol = (K, e[sel])
-            else:
-                sol = np.dot(K, e[sel])
-
-        src_type = _get_src_type(inverse_operator["src"], vertno)
-        stc = _make_stc(
-            sol,
-            vertno,
-            tmin=tmin,
-            tstep=tstep,
-            subject=subject,
-            vector=(pick_ori == "vector"),
-            source_nn=source_nn,
-            src_type=src_type,
-        )
-
-        yield stc
+            sol = [np.ascontiguousarray(s) for s in np.split(sol, len(data), axis=-1)]
+
+        for this_sol in sol:
+            stc = _make_stc(
+                this_sol,
+                vertno,
+                tmin=tmin,
+                tstep=tstep,
+                subject=subject,
+                vector=(pick_ori == "vector"),
+                source_nn=source_nn,
+                src_type=src_type,
+            )
+            yield stc
 
     logger.info("[done]")
 
 
+def _iter_epochs_blocks(epochs, sel, n_block):
+    """Iterate over blocks of n_block epochs restricted to the channels in sel."""
+    try:
+        total = f" / {len(epochs)}"  # len not always defined
+    except RuntimeError:
+        total = f" / {len(epochs.events)} (at most)"
+    block = list()
+    for k, e in enumerate(epochs, 1):
+        block.append(e[sel])
+        if len(block) == n_block:
+            logger.info("Processing epochs : %d-%d%s", k + 1 - len(block), k, total)
+            yield np.array(block)
+            block = list()
+    if len(block):
+        logger.info("Processing epochs : %d-%d%s", k + 1 - len(block), k, total)
+        yield np.array(block)
+
+
 @verbose
 def apply_inverse_epochs(
     epochs,
@@ -1392,6 +1857,8 @@ def apply_inverse_epochs(
     prepared=False,
     method_params=None,
     use_cps=True,
+    *,
+    delayed=False,
     verbose=None,
 ):
     """Apply inverse operator to Epochs.
@@ -1425,6 +1892,15 @@ def apply_inverse_epochs(
     %(use_cps_restricted)s
 
         .. versionadded:: 0.20
+    delayed : bool
+        If True and the inverse is linear (i.e., with a fixed orientation
+        inverse operator or ``pick_ori="normal"``), the source estimates keep
+        the imaging kernel and the sensor data, and their product is only
+        computed when the data are accessed. This saves memory, e.g. when
+        restricting the source estimates to labels with
+        :meth:`~mne.SourceEstimate.in_label`.
+
+        .. versionadded:: 1.11
     %(verbose)s
 
     Returns
@@ -1436,8 +1912,15 @@ def apply_inverse_epochs(
     --------
     apply_inverse_raw : Apply inverse operator to raw object.
     apply_inverse : Apply inverse operator to evoked object.
+    apply_inverse_epochs_labels : Extract label time courses from epochs.
     apply_inverse_tfr_epochs : Apply inverse operator to epochs tfr object.
     apply_inverse_cov : Apply inverse operator to a covariance object.
+
+    Notes
+    -----
+    The imaging kernel is applied to blocks of epochs at once, such that the
+    memory used by the intermediate source time courses remains bounded when
+    ``return_generator=True``.
     """
     stcs = _apply_inverse_epochs_gen(
         epochs,
@@ -1451,6 +1934,7 @@ def apply_inverse_epochs(
         prepared=prepared,
         method_params=method_params,
         use_cps=use_cps,
+        delayed=delayed,
     )
 
     if not return_generator:
@@ -1460,6 +1944,213 @@ def apply_inverse_epochs(
     return stcs
 
 
+@verbose
+def apply_inverse_epochs_labels(
+    epochs,
+    inverse_operator,
+    lambda2,
+    labels,
+    method="dSPM",
+    mode="auto",
+    nave=1,
+    pick_ori=None,
+    *,
+    allow_empty=False,
+    mri_resolution=True,
+    prepared=False,
+    method_params=None,
+    use_cps=True,
+    verbose=None,
+):
+    """Apply inverse operator to Epochs and extract label time courses.
+
+    This gives the same result as :func:`apply_inverse_epochs` followed by
+    :func:`mne.extract_label_time_course`, without computing the time courses
+    of all source space vertices.
+
+    Parameters
+    ----------
+    epochs : Epochs object
+        Single trial epochs.
+    inverse_operator : dict
+        Inverse operator.
+    lambda2 : float
+        The regularization parameter.
+    %(labels_eltc)s
+    method : "MNE" | "dSPM" | "sLORETA" | "eLORETA"
+        Use minimum norm, dSPM (default), sLORETA, or eLORETA.
+    %(mode_eltc)s
+    nave : int
+        Number of averages used to regularize the solution.
+        Set to 1 on single Epoch by default.
+    pick_ori : None | "normal"
+        Options:
+
+        - ``None``
+            Pooling is performed by taking the norm of loose/free
+            orientations. In case of a fixed source space no norm is computed
+            leading to signed source activity.
+        - ``"normal"``
+            Only the normal to the cortical surface is kept. This is only
+            implemented when working with loose orientations.
+    %(allow_empty_eltc)s
+    %(mri_resolution_eltc)s
+    prepared : bool
+        If True, do not call :func:`prepare_inverse_operator`.
+    method_params : dict | None
+        Additional options for eLORETA. See Notes of :func:`apply_inverse`.
+    %(use_cps_restricted)s
+    %(verbose)s
+
+    Returns
+    -------
+    label_tc : array, shape (n_epochs, n_labels, n_times)
+        The extracted time courses of each label for all epochs.
+
+    See Also
+    --------
+    apply_inverse_epochs : Apply inverse operator to Epochs.
+    mne.extract_label_time_course : Extract label time courses from source estimates.
+
+    Notes
+    -----
+    %(eltc_mode_notes)s
+
+    For the linear modes ``"mean"`` and ``"mean_flip"`` with a fixed
+    orientation inverse operator or ``pick_ori="normal"``, the label weights
+    are applied once to the imaging kernel, such that each epoch is only
+    multiplied by one kernel row per label. Otherwise, only the kernel rows of
+    the vertices within the labels are used. In both cases, blocks of epochs
+    are processed with a single matrix product.
+
+    .. versionadded:: 1.11
+    """
+    _validate_type(epochs, BaseEpochs, "epochs")
+    _check_reference(epochs, inverse_operator["info"]["ch_names"])
+    _check_option("method", method, INVERSE_METHODS)
+    _check_option("pick_ori", pick_ori, [None, "normal"])
+    _check_ori(pick_ori, inverse_operator["source_ori"], inverse_operator["src"])
+    _check_ch_names(inverse_operator, epochs.info)
+
+    inv = _check_or_prepare(
+        inverse_operator, nave, lambda2, method, method_params, prepared
+    )
+    sel = _pick_channels_inverse_operator(epochs.ch_names, inv)
+    logger.info("Picked %d channels from the data", len(sel))
+    logger.info("Computing inverse...")
+    K, noise_norm, vertno, _ = _assemble_kernel(inv, None, method, pick_ori, use_cps)
+    is_free_ori = not (is_fixed_orient(inverse_operator) or pick_ori == "normal")
+    if not is_free_ori and noise_norm is not None:
+        K *= noise_norm
+
+    label_kernel = _prepare_label_kernel(
+        inverse_operator,
+        K,
+        noise_norm,
+        vertno,
+        is_free_ori,
+        labels,
+        mode,
+        allow_empty,
+        mri_resolution,
+    )
+    n_labels = len(label_kernel[4])
+    n_times = len(epochs.times)
+    n_rows = label_kernel[0].shape[0]
+    n_block = max(int(_SOURCE_BLOCK_BYTES // (8 * n_rows * n_times)), 1)
+    label_tc = [
+        _apply_label_kernel(data, *label_kernel)
+        for data in _iter_epochs_blocks(epochs, sel, n_block)
+    ]
+    logger.info("[done]")
+    return np.concatenate(label_tc or [np.zeros((0, n_labels, n_times))])
+
+
+def _prepare_label_kernel(
+    inverse_operator,
+    K,
+    noise_norm,
+    vertno,
+    is_free_ori,
+    labels,
+    mode,
+    allow_empty,
+    mri_resolution,
+):
+    """Restrict or combine the kernel rows to extract label time courses."""
+    src = inverse_operator["src"]
+    labels, use_sparse, n_mean = _check_label_src(labels, src, mode, mri_resolution)
+    nvert = [len(v) for v in vertno]
+    n_src = sum(nvert)
+    stc = _make_stc(
+        np.zeros((n_src, 1)),
+        vertno,
+        src_type=_get_src_type(src, vertno),
+        tmin=0.0,
+        tstep=1.0,
+        subject=_subject_from_inverse(inverse_operator),
+    )
+    mode = _check_label_mode(stc, mode)
+    label_vertidx, label_flip = _prepare_label_extraction(
+        stc, labels, src, mode, allow_empty, use_sparse
+    )
+    label_modes = [mode] * len(label_vertidx)
+    # the volume source spaces of a mixed source space are averaged
+    _add_mixed_label_means(label_vertidx, label_flip, nvert, n_mean)
+    label_modes += ["mean"] * n_mean
+    n_labels = len(label_vertidx)
+    logger.info("Extracting time courses for %d labels (mode: %s)", n_labels, mode)
+
+    linear = mode in ("mean", "mean_flip") and not is_free_ori
+    if linear:
+        # Use linearity to combine the kernel rows of each label
+        K = _label_weights(label_vertidx, label_flip, n_src) @ K
+    else:
+        # Only keep the kernel rows of the vertices within labels
+        use, label_vertidx = _restrict_label_vertidx(label_vertidx)
+        if is_free_ori:
+            K = K[(3 * use[:, np.newaxis] + np.arange(3)).ravel()]
+            if noise_norm is not None:
+                noise_norm = noise_norm[use]
+        else:
+            K = K[use]
+
+    return K, noise_norm, is_free_ori, linear, label_vertidx, label_flip, label_modes
+
+
+def _apply_label_kernel(
+    data, K, noise_norm, is_free_ori, linear, label_vertidx, label_flip, label_modes
+):
+    """Compute the label time courses of a block of epochs."""
+    sol = np.matmul(K, data)
+    if linear:
+        return sol
+    n_epochs, _, n_times = sol.shape
+    if is_free_ori:
+        sol = np.linalg.norm(sol.reshape(n_epochs, -1, 3, n_times), axis=2)
+        if noise_norm is not None:
+            sol *= noise_norm
+    label_tc = np.zeros((n_epochs, len(label_vertidx), n_times))
+    for li, (vertidx, flip, mode) in enumerate(
+        zip(label_vertidx, label_flip, label_modes)
+    ):
+        if vertidx is None:
+            continue
+        if isinstance(vertidx, sparse.csr_array):
+            this_data = vertidx @ sol.transpose(1, 0, 2).reshape(sol.shape[1], -1)
+            this_data = this_data.reshape(-1, n_epochs, n_times)
+        else:
+            this_data = sol[:, vertidx].transpose(1, 0, 2)
+        if mode == "pca_flip":
+            for ei in range(n_epochs):
+                label_tc[ei, li] = _pca_flip(flip, this_data[:, ei])
+        else:
+            if flip is not None:
+                flip = flip[:, np.newaxis]
+            label_tc[:, li] = _label_funcs[mode](flip, this_data)
+    return label_tc
+
+
 def _apply_inverse_tfr_epochs_gen(
     epochs_tfr,
     inverse_operator,
@@ -46,7 +46,10 @@ from mne.minimum_norm import (
     apply_inverse,
     apply_inverse_cov,
     apply_inverse_epochs,
+    apply_inverse_epochs_labels,
     apply_inverse_raw,
+    apply_inverse_raw_labels,
+    apply_inverse_raw_to_file,
     apply_inverse_tfr_epochs,
     compute_rank_inverse,
     make_inverse_operator,
@@ -54,6 +57,7 @@ from mne.minimum_norm import (
     read_inverse_operator,
     write_inverse_operator,
 )
+from mne.minimum_norm.inverse import _inverse_cache
 from mne.source_estimate import VolSourceEstimate, read_source_estimate
 from mne.source_space._source_space import _get_src_nn
 from mne.surface import _normal_orth
@@ -687,6 +691,51 @@ def test_apply_inverse_operator(evoked, inv, min_, max_):
     apply_inverse(evoked, inv_op_meg, 1.0 / 9.0)
 
 
+@pytest.mark.parametrize("method", ("dSPM", "eLORETA"))
+def test_apply_inverse_cache(evoked, method, tmp_path, monkeypatch):
+    """Test caching of prepared inverse operators and kernels."""
+    inverse_operator = read_inverse_operator(fname_inv)
+    _inverse_cache.clear()
+    # nothing is cached by default
+    monkeypatch.setenv("MNE_CACHE_INVERSE", "false")
+    assert not _inverse_cache.enabled
+    stc = apply_inverse(evoked, inverse_operator, lambda2, method)
+    with catch_logging() as log:
+        apply_inverse(evoked, inverse_operator, lambda2, method, verbose=True)
+    assert "Using cached" not in log.getvalue()
+    monkeypatch.setenv("MNE_CACHE_INVERSE", "true")
+    apply_inverse(evoked, inverse_operator, lambda2, method)
+    with catch_logging() as log:
+        stc_cached = apply_inverse(
+            evoked, inverse_operator, lambda2, method, verbose=True
+        )
+    log = log.getvalue()
+    assert "Using cached prepared inverse operator" in log
+    assert "Using cached kernel" in log
+    assert_allclose(stc_cached.data, stc.data)
+    # the cache depends on the parameters and the content of the operator
+    with catch_logging() as log:
+        apply_inverse(evoked, inverse_operator, lambda2 / 2, method, verbose=True)
+    assert "Using cached" not in log.getvalue()
+    inverse_operator["sing"] = inverse_operator["sing"] * 2
+    with catch_logging() as log:
+        apply_inverse(evoked, inverse_operator, lambda2, method, verbose=True)
+    assert "Using cached" not in log.getvalue()
+    # store on disk
+    inverse_operator = read_inverse_operator(fname_inv)
+    monkeypatch.setenv("MNE_CACHE_DIR", str(tmp_path))
+    _inverse_cache.clear()
+    apply_inverse(evoked, inverse_operator, lambda2, method)
+    assert len(list((tmp_path / "inverse").glob("*.npz"))) == 2
+    _inverse_cache.clear()
+    with catch_logging() as log:
+        stc_cached = apply_inverse(
+            evoked, inverse_operator, lambda2, method, verbose=True
+        )
+    assert "Loaded cached kernel" in log.getvalue()
+    assert_allclose(stc_cached.data, stc.data)
+
+
 @pytest.mark.slowtest  # lots of params here, adds up
 @pytest.mark.parametrize("method", INVERSE_METHODS)
 @pytest.mark.parametrize(
@@ -1359,6 +1408,19 @@ def test_apply_mne_inverse_epochs():
     label_stc = stcs[0].in_label(label_rh)
     assert label_stc.subject == "sample"
     assert_array_almost_equal(stcs_rh[0].data, label_stc.data)
+    stcs_delayed = apply_inverse_epochs(
+        epochs,
+        inverse_operator,
+        lambda2,
+        "dSPM",
+        pick_ori="normal",
+        prepared=True,
+        delayed=True,
+    )
+    assert len(stcs_delayed) == len(stcs)
+    assert stcs_delayed[0]._kernel is not None
+    assert_allclose(stcs_delayed[0].in_label(label_rh).data, label_stc.data)
+    assert_allclose(stcs_delayed[1].data, stcs[1].data)
 
     with pytest.raises(TypeError, match="must be an instance of BaseEpochs"):
         apply_inverse_epochs(
@@ -1366,6 +1428,138 @@ def test_apply_mne_inverse_epochs():
         )
 
 
+@testing.requires_testing_data
+@pytest.mark.parametrize("pick_ori", (None, "normal"))
+@pytest.mark.parametrize("mode", ("mean", "mean_flip", "max", "pca_flip"))
+def test_apply_inverse_epochs_labels(pick_ori, mode):
+    """Test fused inverse application and label time course extraction."""
+    inverse_operator = read_inverse_operator(fname_full)
+    labels = [read_label(str(fname_label) % f"Aud-{hemi}") for hemi in ("lh", "rh")]
+    labels.append(labels[0] + labels[1])
+    raw = read_raw_fif(fname_raw)
+    events = read_events(fname_event)[:15]
+    epochs = Epochs(raw, events, 1, -0.2, 0.5, picks="meg", baseline=(None, 0))
+    stcs = apply_inverse_epochs(
+        epochs, inverse_operator, lambda2, "dSPM", pick_ori=pick_ori
+    )
+    want = mne.extract_label_time_course(
+        stcs, labels, inverse_operator["src"], mode=mode
+    )
+    label_tc = apply_inverse_epochs_labels(
+        epochs, inverse_operator, lambda2, labels, "dSPM", mode=mode, pick_ori=pick_ori
+    )
+    assert label_tc.shape == (len(stcs), len(labels), len(epochs.times))
+    assert_allclose(label_tc, want, rtol=1e-7, atol=1e-10)
+    # a reusable extractor, applied to kernel-backed estimates
+    extractor = mne.LabelExtractor(labels, inverse_operator["src"], mode)
+    stcs = apply_inverse_epochs(
+        epochs,
+        inverse_operator,
+        lambda2,
+        "dSPM",
+        pick_ori=pick_ori,
+        return_generator=True,
+    )
+    label_tc = extractor.apply(stcs)
+    assert_allclose(label_tc, want, rtol=1e-7, atol=1e-10)
+    with pytest.raises(ValueError, match="Invalid value for the 'pick_ori'"):
+        apply_inverse_epochs_labels(
+            epochs, inverse_operator, lambda2, labels, pick_ori="vector"
+        )
+
+
+@testing.requires_testing_data
+@pytest.mark.parametrize("pick_ori", (None, "normal"))
+def test_apply_inverse_raw_blocks(pick_ori, tmp_path, monkeypatch):
+    """Test applying the inverse to blocks of raw samples."""
+    monkeypatch.setattr(mne.minimum_norm.inverse, "_SOURCE_BLOCK_BYTES", 1e6)
+    inverse_operator = read_inverse_operator(fname_full)
+    labels = [read_label(str(fname_label) % f"Aud-{hemi}") for hemi in ("lh", "rh")]
+    raw = read_raw_fif(fname_raw).pick("meg")
+    start, stop = 100, 700
+    stc = apply_inverse_raw(
+        raw,
+        inverse_operator,
+        lambda2,
+        "dSPM",
+        start=start,
+        stop=stop,
+        pick_ori=pick_ori,
+    )
+    for mode in ("mean_flip", "max"):
+        want = mne.extract_label_time_course(
+            stc, labels, inverse_operator["src"], mode=mode
+        )
+        label_tc = apply_inverse_raw_labels(
+            raw,
+            inverse_operator,
+            lambda2,
+            labels,
+            "dSPM",
+            mode=mode,
+            start=start,
+            stop=stop,
+            pick_ori=pick_ori,
+        )
+        assert label_tc.shape == (len(labels), stop - start)
+        assert_allclose(label_tc, want, rtol=1e-7, atol=1e-10)
+    with pytest.raises(ValueError, match="not supported for continuous data"):
+        apply_inverse_raw_labels(
+            raw, inverse_operator, lambda2, labels, mode="pca_flip"
+        )
+
+    fnames = apply_inverse_raw_to_file(
+        tmp_path / "raw",
+        raw,
+        inverse_operator,
+        lambda2,
+        "dSPM",
+        start=start,
+        stop=stop,
+        pick_ori=pick_ori,
+    )
+    assert [f.name for f in fnames] == ["raw-lh.stc", "raw-rh.stc"]
+    stc_read = read_source_estimate(tmp_path / "raw")
+    assert_allclose(stc_read.times, stc.times, atol=1e-6)
+    assert_allclose(
+        stc_read.data, stc.data, rtol=1e-6, atol=1e-6 * np.abs(stc.data).max()
+    )
+    with pytest.raises(FileExistsError, match="overwrite"):
+        apply_inverse_raw_to_file(tmp_path / "raw", raw, inverse_operator, lambda2)
+
+
+def test_apply_inverse_raw_to_file_volume(tmp_path):
+    """Test writing the inverse of raw data with volume source spaces."""
+    info = mne.create_info(
+        mne.channels.make_standard_montage("standard_1020").ch_names[:40],
+        100.0,
+        "eeg",
+    )
+    info.set_montage("standard_1020")
+    sphere = make_sphere_model((0.0, 0.0, 0.04), 0.09)
+    src = mne.setup_volume_source_space(sphere=sphere, pos=30.0)
+    data = np.random.default_rng(0).standard_normal((40, 500)) * 1e-6
+    raw = mne.io.RawArray(data, info)
+    raw.set_eeg_reference(projection=True)
+    cov = make_ad_hoc_cov(raw.info)
+    fwd = make_forward_solution(raw.info, None, src, sphere)
+    inv = make_inverse_operator(raw.info, fwd, cov, loose=1.0, depth=None)
+    stc = apply_inverse_raw(raw, inv, lambda2, "dSPM", start=100, stop=400)
+    fnames = apply_inverse_raw_to_file(
+        tmp_path / "raw", raw, inv, lambda2, "dSPM", start=100, stop=400
+    )
+    assert [f.name for f in fnames] == ["raw-vl.stc"]
+    stc_read = read_source_estimate(fnames[0])
+    assert_array_equal(stc_read.vertices[0], stc.vertices[0])
+    assert_allclose(stc_read.data, stc.data, rtol=1e-6)
+    # the vertices of several volumes cannot be written to a single file
+    fwd = make_forward_solution(raw.info, None, src + src.copy(), sphere)
+    inv = make_inverse_operator(raw.info, fwd, cov, loose=1.0, depth=None)
+    with pytest.raises(ValueError, match="single volume"):
+        apply_inverse_raw_to_file(tmp_path / "two", raw, inv, lambda2)
+    assert not list(tmp_path.glob("two*"))
+
+
 @pytest.mark.slowtest
 @testing.requires_testing_data
 @pytest.mark.parametrize("return_generator", (True, False))
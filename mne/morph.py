@@ -23,17 +23,20 @@ from .surface import _compute_nearest, mesh_edges, read_surface
 from .utils import (
     BunchConst,
     ProgressBar,
+    _ArrayCache,
     _check_fname,
     _check_option,
     _custom_lru_cache,
     _ensure_int,
     _import_h5io_funcs,
     _import_nibabel,
+    _pl,
     _validate_type,
     check_version,
     fill_doc,
     get_subjects_dir,
     logger,
+    object_hash,
     use_log_level,
     verbose,
     warn,
@@ -42,6 +45,11 @@ from .utils import (
     warn as warn_,
 )
 
+# Maximum memory (in bytes) used by the surface morph matrices kept in memory
+_MORPH_CACHE_BYTES = 200e6
+
+_morph_cache = _ArrayCache(_MORPH_CACHE_BYTES, "morph", "MNE_CACHE_MORPH")
+
 
 @verbose
 def compute_source_morph(
@@ -566,6 +574,54 @@ class SourceMorph:
             )
         return out
 
+    @verbose
+    def apply_many(self, stcs, *, n_jobs=None, verbose=None):
+        """Morph many source estimates at once.
+
+        Parameters
+        ----------
+        stcs : iterable of VolSourceEstimate | VolVectorSourceEstimate | SourceEstimate | VectorSourceEstimate
+            The source estimates to morph. They can differ in their number of
+            time points.
+        %(n_jobs)s
+            Blocks of source estimates are morphed in parallel threads.
+        %(verbose)s
+
+        Returns
+        -------
+        stcs_to : list of VolSourceEstimate | VolVectorSourceEstimate | SourceEstimate | VectorSourceEstimate
+            The morphed source estimates.
+
+        See Also
+        --------
+        mne.SourceMorph.apply
+
+        Notes
+        -----
+        The data of successive source estimates are stacked in blocks, and
+        each block is morphed with a single sparse matrix product. For a
+        volumetric morph, this requires the sparse morph matrix, which is
+        computed with :meth:`compute_vol_morph_mat` if needed (and stored in
+        the instance, so consider (re-)saving it to disk to avoid recomputing
+        it).
+
+        .. versionadded:: 1.11
+        """  # noqa: E501
+        stcs = list(stcs)
+        for stc_from in stcs:
+            _validate_type(stc_from, _BaseSourceEstimate, "stc_from", "source estimate")
+            subject = stc_from.subject
+            if subject is None:
+                subject = self.subject_from
+            if self.subject_from is None:
+                self.subject_from = subject
+            if subject != self.subject_from:
+                raise ValueError(
+                    "stc_from.subject and morph.subject_from must match. "
+                    f"({subject} != {self.subject_from})"
+                )
+        return _apply_morph_data_many(self, stcs, n_jobs)
+
     @verbose
     def compute_vol_morph_mat(self, *, verbose=None):
         """Compute the sparse matrix representation of the volumetric morph.
@@ -1182,25 +1238,83 @@ def _compute_morph_matrix(
     """Compute morph matrix."""
     logger.info("Computing morph matrix...")
     subjects_dir = get_subjects_dir(subjects_dir, raise_error=True)
+    _validate_type(smooth, (str, None, "int-like"), "smoothing steps")
+    # the surfaces the morph maps (and the smoothing) are computed from
+    surfs = ("sphere.reg", "sphere.left_right") if xhemi else ("sphere.reg",)
+    fnames = [
+        subjects_dir / subject / "surf" / f"{hemi}.{surf}"
+        for subject in (subject_from, subject_to)
+        for hemi in ("lh", "rh")
+        for surf in surfs
+    ]
+    stats = [
+        (
+            str(fname.relative_to(subjects_dir)),
+            fname.stat().st_size,
+            fname.stat().st_mtime_ns,
+        )
+        for fname in fnames
+        if fname.is_file()
+    ]
+    kind = f"{subject_from}-{subject_to}{'-xhemi' if xhemi else ''}-morph-mat"
+    key = object_hash(
+        [
+            subject_from,
+            subject_to,
+            [np.asarray(v, int) for v in vertices_from],
+            [np.asarray(v, int) for v in vertices_to],
+            smooth,
+            xhemi,
+            stats,
+        ]
+    )
+    mmap_dir = subjects_dir / "morph-maps"
+    entry = _morph_cache.get(kind, key, cache_dir=mmap_dir)
+    if entry is None:
+        entry = _compute_morph_matrix_entry(
+            subject_from,
+            subject_to,
+            vertices_from,
+            vertices_to,
+            smooth,
+            subjects_dir,
+            xhemi,
+        )
+        _morph_cache.put(kind, key, entry, cache_dir=mmap_dir)
+    else:
+        logger.info("    Using cached morph matrix")
+    for n_missing, n_vertices in zip(entry["n_missing"], entry["n_vertices"]):
+        _warn_missing(n_missing, n_vertices, warn)
+    morpher = sparse.csr_array(
+        (entry["data"], entry["indices"], entry["indptr"]),
+        shape=tuple(entry["shape"]),
+        copy=True,
+    )
+    logger.info("[done]")
+    return morpher
+
 
+def _compute_morph_matrix_entry(
+    subject_from, subject_to, vertices_from, vertices_to, smooth, subjects_dir, xhemi
+):
     tris = _get_subject_sphere_tris(subject_from, subjects_dir)
     maps = read_morph_map(subject_from, subject_to, subjects_dir, xhemi)
 
     # morph the data
 
     morpher = []
+    n_missing = np.zeros(2, int)
+    n_vertices = np.zeros(2, int)
     for hemi_to in range(2):  # iterate over to / block-rows of CSR matrix
         hemi_from = (1 - hemi_to) if xhemi else hemi_to
-        morpher.append(
-            _hemi_morph(
-                tris[hemi_from],
-                vertices_to[hemi_to],
-                vertices_from[hemi_from],
-                smooth,
-                maps[hemi_from],
-                warn,
-            )
+        mm, n_missing[hemi_to], n_vertices[hemi_to] = _hemi_morph_mat(
+            tris[hemi_from],
+            vertices_to[hemi_to],
+            vertices_from[hemi_from],
+            smooth,
+            maps[hemi_from],
         )
+        morpher.append(mm)
 
     shape = (sum(len(v) for v in vertices_to), sum(len(v) for v in vertices_from))
     data = [m.data for m in morpher]
@@ -1216,15 +1330,38 @@ def _compute_morph_matrix(
     data = np.concatenate(data)
     # this is equivalent to morpher = sparse_block_diag(morpher).tocsr(),
     # but works for xhemi mode
-    morpher = sparse.csr_array((data, indices, indptr), shape=shape)
-    logger.info("[done]")
-    return morpher
+    return dict(
+        data=data,
+        indices=indices,
+        indptr=indptr,
+        shape=np.array(shape),
+        n_missing=n_missing,
+        n_vertices=n_vertices,
+    )
 
 
 def _hemi_morph(tris, vertices_to, vertices_from, smooth, maps, warn):
     _validate_type(smooth, (str, None, "int-like"), "smoothing steps")
+    mm, n_missing, n_vertices = _hemi_morph_mat(
+        tris, vertices_to, vertices_from, smooth, maps
+    )
+    _warn_missing(n_missing, n_vertices, warn)
+    return mm
+
+
+def _warn_missing(n_missing, n_vertices, warn):
+    if n_missing and warn:
+        warn_(
+            f"{n_missing}/{n_vertices} vertices not included in "
+            "smoothing, consider increasing the number of steps"
+        )
+
+
+def _hemi_morph_mat(tris, vertices_to, vertices_from, smooth, maps):
+    """Compute the morph matrix of a hemisphere and the unsmoothed vertices."""
+    n_missing = 0
     if len(vertices_from) == 0:
-        return sparse.csr_array((len(vertices_to), 0))
+        return sparse.csr_array((len(vertices_to), 0)), n_missing, 0
     e = mesh_edges(tris)
     e.data[e.data == 2] = 1
     n_vertices = e.shape[0]
@@ -1243,11 +1380,6 @@ def _hemi_morph(tris, vertices_to, vertices_from, smooth, maps, warn):
         ).tocsr()
     else:
         mm, n_missing, n_iter = _surf_upsampling_mat(vertices_from, e, smooth)
-        if n_missing and warn:
-            warn_(
-                f"{n_missing}/{e.shape[0]} vertices not included in "
-                "smoothing, consider increasing the number of steps"
-            )
         logger.info(f"    {n_iter} smooth iterations done.")
     assert mm.shape == (n_vertices, len(vertices_from))
     if maps is not None:
@@ -1255,7 +1387,7 @@ def _hemi_morph(tris, vertices_to, vertices_from, smooth, maps, warn):
     else:  # to == from
         mm = mm[vertices_to]
     assert mm.shape == (len(vertices_to), len(vertices_from))
-    return mm
+    return mm, n_missing, n_vertices
 
 
 @verbose
@@ -1463,9 +1595,13 @@ def _check_vertices_match(v1, v2, name):
 
 _VOL_MAT_CHECK_RATIO = 1.0
 
+# Memory (in bytes) allowed for the stacked data of each block of source
+# estimates morphed by SourceMorph.apply_many
+_MORPH_BLOCK_BYTES = 100e6
 
-def _apply_morph_data(morph, stc_from):
-    """Morph a source estimate from one subject to another."""
+
+def _check_morph_stc(morph, stc_from):
+    """Check that a source estimate can be morphed and get what to morph."""
     if stc_from.subject is not None and stc_from.subject != morph.subject_from:
         raise ValueError(
             f"stc.subject ({stc_from.subject}) != morph.subject_from "
@@ -1498,14 +1634,30 @@ def _apply_morph_data(morph, stc_from):
     # figure out what to actually morph
     do_vol = not isinstance(stc_from, _BaseSurfaceSourceEstimate)
     do_surf = not isinstance(stc_from, _BaseVolSourceEstimate)
+    vol_src_offset = 2 if do_surf else 0
+    if do_vol:
+        stc_from_vertices = stc_from.vertices[vol_src_offset:]
+        vertices_from = morph._vol_vertices_from
+        for ii, (v1, v2) in enumerate(zip(vertices_from, stc_from_vertices)):
+            _check_vertices_match(v1, v2, f"volume[{ii}]")
+    if do_surf:
+        for hemi, v1, v2 in zip(
+            ("left", "right"), morph.src_data["vertices_from"], stc_from.vertices[:2]
+        ):
+            _check_vertices_match(v1, v2, f"{hemi} hemisphere")
+    vertices_to = morph.vertices_to
+    if morph.kind == "mixed":
+        vertices_to = vertices_to[0 if do_surf else 2 : None if do_vol else 2]
+    return do_surf, do_vol, vertices_to
 
+
+def _apply_morph_data(morph, stc_from):
+    """Morph a source estimate from one subject to another."""
+    do_surf, do_vol, vertices_to = _check_morph_stc(morph, stc_from)
     vol_src_offset = 2 if do_surf else 0
     from_surf_stop = sum(len(v) for v in stc_from.vertices[:vol_src_offset])
     to_surf_stop = sum(len(v) for v in morph.vertices_to[:vol_src_offset])
     from_vol_stop = stc_from.data.shape[0]
-    vertices_to = morph.vertices_to
-    if morph.kind == "mixed":
-        vertices_to = vertices_to[0 if do_surf else 2 : None if do_vol else 2]
     to_vol_stop = sum(len(v) for v in vertices_to)
 
     mesg = "Ori × Time" if stc_from.data.ndim == 3 else "Time"
@@ -1515,10 +1667,6 @@ def _apply_morph_data(morph, stc_from):
     to_used = np.zeros(data.shape[0], bool)
     from_used = np.zeros(data_from.shape[0], bool)
     if do_vol:
-        stc_from_vertices = stc_from.vertices[vol_src_offset:]
-        vertices_from = morph._vol_vertices_from
-        for ii, (v1, v2) in enumerate(zip(vertices_from, stc_from_vertices)):
-            _check_vertices_match(v1, v2, f"volume[{ii}]")
         from_sl = slice(from_surf_stop, from_vol_stop)
         assert not from_used[from_sl].any()
         from_used[from_sl] = True
@@ -1543,10 +1691,6 @@ def _apply_morph_data(morph, stc_from):
             logger.debug("Using sparse volume morph matrix")
             data[to_sl, :] = morph.vol_morph_mat @ data_from[from_sl]
     if do_surf:
-        for hemi, v1, v2 in zip(
-            ("left", "right"), morph.src_data["vertices_from"], stc_from.vertices[:2]
-        ):
-            _check_vertices_match(v1, v2, f"{hemi} hemisphere")
         from_sl = slice(0, from_surf_stop)
         assert not from_used[from_sl].any()
         from_used[from_sl] = True
@@ -1560,3 +1704,78 @@ def _apply_morph_data(morph, stc_from):
     klass = stc_from.__class__
     stc_to = klass(data, vertices_to, stc_from.tmin, stc_from.tstep, morph.subject_to)
     return stc_to
+
+
+def _get_morph_op(morph, do_surf, do_vol):
+    """Get the sparse operator morphing stacked surface and volume data."""
+    mats = list()
+    if do_surf:
+        mats.append(morph.morph_mat)
+    if do_vol:
+        morph.compute_vol_morph_mat()
+        assert morph.vol_morph_mat is not None
+        mats.append(morph.vol_morph_mat)
+    return sparse.block_diag(mats, format="csr")
+
+
+def _morph_block(op, data):
+    return op @ np.concatenate(data, axis=1)
+
+
+def _apply_morph_data_many(morph, stcs, n_jobs):
+    """Morph many source estimates with one sparse product per block."""
+    ops, blocks = dict(), list()
+    for si, stc_from in enumerate(stcs):
+        do_surf, do_vol, vertices_to = _check_morph_stc(morph, stc_from)
+        key = (do_surf, do_vol)
+        if key not in ops:
+            ops[key] = _get_morph_op(morph, do_surf, do_vol)
+        # input and output data of this STC
+        n_bytes = sum(ops[key].shape) * stc_from.data[0].size
+        n_bytes *= stc_from.data.itemsize
+        if (
+            len(blocks)
+            and blocks[-1]["key"] == key
+            and blocks[-1]["n_bytes"] + n_bytes <= _MORPH_BLOCK_BYTES
+        ):
+            blocks[-1]["idx"].append(si)
+            blocks[-1]["n_bytes"] += n_bytes
+        else:
+            blocks.append(dict(key=key, idx=[si], n_bytes=n_bytes))
+        blocks[-1].setdefault("vertices_to", vertices_to)
+    logger.info(
+        f"Morphing {len(stcs)} source estimate{_pl(stcs)} in "
+        f"{len(blocks)} block{_pl(blocks)}"
+    )
+    parallel, my_morph, n_jobs = parallel_func(
+        _morph_block, n_jobs, max_jobs=max(len(blocks), 1), prefer="threads"
+    )
+    datas = parallel(
+        my_morph(
+            ops[block["key"]],
+            [
+                np.reshape(stcs[si].data, (stcs[si].data.shape[0], -1))
+                for si in block["idx"]
+            ],
+        )
+        for block in blocks
+    )
+    stcs_to = list()
+    for block, data in zip(blocks, datas):
+        start = 0
+        for si in block["idx"]:
+            stc_from = stcs[si]
+            stop = start + stc_from.data[0].size
+            stcs_to.append(
+                stc_from.__class__(
+                    data[:, start:stop].reshape(
+                        (data.shape[0],) + stc_from.data.shape[1:]
+                    ),
+                    block["vertices_to"],
+                    stc_from.tmin,
+                    stc_from.tstep,
+                    morph.subject_to,
+                )
+            )
+            start = stop
+    return stcs_to
@@ -4,6 +4,7 @@
 
 import os
 from collections.abc import Iterable
+from itertools import combinations
 from pathlib import Path
 
 import numpy as np
@@ -41,7 +42,7 @@ from ..source_space._source_space import (
     setup_volume_source_space,
 )
 from ..surface import _CheckInside
-from ..transforms import _get_trans, transform_surface_to
+from ..transforms import _get_trans, quat_to_rot, rot_to_quat, transform_surface_to
 from ..utils import (
     _check_preload,
     _pl,
@@ -52,6 +53,12 @@ from ..utils import (
 )
 from .source import SourceSimulator
 
+# Head position parameters that vary less than this (in units of quaternion
+# components and meters) are not interpolated
+_MIN_HEAD_POS_STEP = 1e-5
+# Number of head positions checked against the exact gain matrix at most
+_N_INTERP_CHECKS = 3
+
 
 def _check_cov(info, cov):
     """Check that the user provided a valid covariance matrix for the noise."""
@@ -163,6 +170,8 @@ def simulate_raw(
     forward=None,
     first_samp=0,
     max_iter=10000,
+    *,
+    fwd_tol=None,
     verbose=None,
 ):
     """Simulate raw data.
@@ -225,6 +234,13 @@ def simulate_raw(
         This is a sanity parameter to prevent accidental blowups.
 
         .. versionadded:: 0.18
+    fwd_tol : float | None
+        If not None, the relative error tolerated when interpolating the MEG
+        forward solutions of the head positions given by ``head_pos``, instead
+        of computing the forward solution of each of them (default). See
+        Notes for details.
+
+        .. versionadded:: 1.11
     %(verbose)s
 
     Returns
@@ -270,6 +286,21 @@ def simulate_raw(
        |         | *time →*                                                      |
        +---------+--------------------------+--------------------------+---------+
 
+    **Forward interpolation**
+
+    With many head positions, computing the MEG forward solution of each of
+    them dominates the simulation time. If ``fwd_tol`` is not None, the gain
+    matrices are instead computed on a stencil of 28 head positions around
+    the mean head position, which spans the range of the six head position
+    parameters (the quaternion and translation of the device-to-head
+    transform). The gain matrix of each head position is then obtained by
+    quadratic interpolation of the parameters. The relative interpolation
+    error (Frobenius norm) is checked against the exact gain matrices of the
+    head positions farthest from the mean, and the head positions farther
+    than the first one with an error below ``fwd_tol`` are computed exactly.
+    For movements within a few millimeters and degrees, the error is
+    typically below 1%%, but the 28 gain matrices are kept in memory.
+
     .. versionadded:: 0.10.0
 
     References
@@ -277,6 +308,7 @@ def simulate_raw(
     .. footbibliography::
     """  # noqa: E501
     _validate_type(info, Info, "info")
+    _validate_type(fwd_tol, ("numeric", None), "fwd_tol")
 
     if len(pick_types(info, meg=False, stim=True)) == 0:
         event_ch = None
@@ -342,6 +374,7 @@ def simulate_raw(
         meeg_picks,
         forward,
         use_cps,
+        fwd_tol,
     )
     interper = _Interp2(offsets, get_fwd, interp)
 
@@ -754,13 +787,23 @@ class _SimForwards:
         meeg_picks,
         forward=None,
         use_cps=True,
+        fwd_tol=None,
     ):
         self.idx = 0
         self.offsets = offsets
         self.use_cps = use_cps
         self.iter = iter(
             _iter_forward_solutions(
-                info, trans, src, bem, dev_head_ts, mindist, n_jobs, forward, meeg_picks
+                info,
+                trans,
+                src,
+                bem,
+                dev_head_ts,
+                mindist,
+                n_jobs,
+                forward,
+                meeg_picks,
+                fwd_tol,
             )
         )
 
@@ -783,7 +826,7 @@ class _SimForwards:
 
 
 def _iter_forward_solutions(
-    info, trans, src, bem, dev_head_ts, mindist, n_jobs, forward, picks
+    info, trans, src, bem, dev_head_ts, mindist, n_jobs, forward, picks, fwd_tol=None
 ):
     """Calculate a forward solution for a subject."""
     logger.info("Setting up forward solutions")
@@ -837,6 +880,15 @@ def _iter_forward_solutions(
     if eegfwd is not None:
         fwds["eeg"] = eegfwd
     del eegfwd
+
+    def _meg_gain(dev_head_t):
+        _transform_orig_meg_coils(megcoils, dev_head_t)
+        return _compute_forwards(
+            rr, sensors=sensors, bem=bem, n_jobs=n_jobs, verbose=False
+        )["meg"]
+
+    if forward is None and fwd_tol is not None:
+        gains = _iter_interp_gains(dev_head_ts, _meg_gain, fwd_tol)
     for ti, dev_head_t in enumerate(dev_head_ts):
         # Could be *slightly* more efficient not to do this N times,
         # but the cost here is tiny compared to actual fwd calculation
@@ -860,9 +912,10 @@ def _iter_forward_solutions(
                     f"{np.sum(~outside)} MEG sensors collided with inner skull "
                     f"surface for transform {ti}"
                 )
-            megfwd = _compute_forwards(
-                rr, sensors=sensors, bem=bem, n_jobs=n_jobs, verbose=False
-            )["meg"]
+            if fwd_tol is None:
+                megfwd = _meg_gain(dev_head_t)
+            else:
+                megfwd = next(gains)
             megfwd = _to_forward_dict(megfwd, megnames)
         else:
             megfwd = pick_channels_forward(forward, megnames, verbose=False)
@@ -873,3 +926,96 @@ def _iter_forward_solutions(
         yield fwd
     # need an extra one to fill last buffer
     yield fwd
+
+
+def _head_pos_params(trans):
+    """Get the quaternion and translation parameters of a dev_head_t."""
+    return np.concatenate([rot_to_quat(trans[:3, :3]), trans[:3, 3]])
+
+
+def _iter_interp_gains(dev_head_ts, get_gain, tol):
+    """Interpolate the MEG gain matrices of many head positions.
+
+    The gain matrix is modeled as a quadratic function of the six head
+    position parameters (the quaternion and translation of ``dev_head_t``),
+    fitted to exact gain matrices at the mean head position, on both sides of
+    it along each parameter and on each pair of parameters. The model error
+    grows with the distance to the mean head position, so positions are
+    checked in decreasing order of distance until the error of one of them is
+    below ``tol``, and the positions farther than the checked one are computed
+    exactly.
+    """
+    params = np.array([_head_pos_params(t["trans"]) for t in dev_head_ts])
+    center = params.mean(axis=0)
+    steps = np.abs(params - center).max(axis=0)
+    use = np.where(steps > _MIN_HEAD_POS_STEP)[0]
+    pairs = list(combinations(range(len(use)), 2))
+    n_gains = 1 + 2 * len(use) + len(pairs)
+    if len(dev_head_ts) <= n_gains + _N_INTERP_CHECKS:
+        logger.info("Too few head positions for interpolation, computing all")
+        for dev_head_t in dev_head_ts:
+            yield get_gain(dev_head_t)
+        return
+
+    def _get_gain(d):
+        param = center.copy()
+        param[use] += d * steps[use]
+        trans = np.eye(4)
+        trans[:3, :3] = quat_to_rot(param[:3])
+        trans[:3, 3] = param[3:]
+        return get_gain(dict(dev_head_ts[0], trans=trans))
+
+    logger.info(
+        f"Computing {n_gains} gain matrices for interpolating "
+        f"{len(dev_head_ts)} head positions"
+    )
+    # model coefficients of 1, d_k, d_k ** 2 and d_k * d_l, with d_k in [-1, 1]
+    eye = np.eye(len(use))
+    gain_0 = _get_gain(np.zeros(len(use)))
+    coefs = np.empty((n_gains,) + gain_0.shape)
+    coefs[0] = gain_0
+    del gain_0
+    gains_p = np.empty((len(use),) + coefs.shape[1:])
+    for ki in range(len(use)):
+        gains_p[ki] = _get_gain(eye[ki])
+        gain_m = _get_gain(-eye[ki])
+        coefs[1 + ki] = (gains_p[ki] - gain_m) / 2.0
+        coefs[1 + len(use) + ki] = (gains_p[ki] + gain_m) / 2.0 - coefs[0]
+        del gain_m
+    for pi, (ki, li) in enumerate(pairs):
+        gain_pp = _get_gain(eye[ki] + eye[li])
+        coefs[1 + 2 * len(use) + pi] = gain_pp - gains_p[ki] - gains_p[li] + coefs[0]
+        del gain_pp
+    del gains_p
+    d = (params[:, use] - center[use]) / steps[use]
+    ki, li = np.array(pairs, int).reshape(-1, 2).T
+    weights = np.concatenate(
+        [np.ones((len(d), 1)), d, d * d, d[:, ki] * d[:, li]], axis=1
+    )
+    dist = np.linalg.norm(d, axis=1)
+
+    # error control, starting from the farthest positions, keeping the exact
+    # gains of the checked positions
+    exact = dict()
+    thresh = -np.inf
+    for ti in np.argsort(dist)[::-1][:_N_INTERP_CHECKS]:
+        exact[ti] = get_gain(dev_head_ts[ti])
+        err = np.linalg.norm(exact[ti] - np.tensordot(weights[ti], coefs, axes=1))
+        err /= np.linalg.norm(exact[ti])
+        logger.info(f"    Interpolation error for transform #{ti + 1}: {err:0.2g}")
+        if err <= tol:
+            thresh = dist[ti]
+            break
+    else:
+        logger.info(f"    Interpolation error above {tol}, computing all")
+    is_exact = dist > thresh
+    is_exact[list(exact)] = True
+    n_interp = len(d) - is_exact.sum()
+    logger.info(f"    Interpolating {n_interp}/{len(d)} head positions")
+    for ti, dev_head_t in enumerate(dev_head_ts):
+        if ti in exact:
+            yield exact.pop(ti)
+        elif is_exact[ti]:
+            yield get_gain(dev_head_t)
+        else:
+            yield np.tensordot(weights[ti], coefs, axes=1)
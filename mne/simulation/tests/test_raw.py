@@ -51,11 +51,12 @@ from mne.simulation import (
     simulate_raw,
     simulate_sparse_stc,
 )
+from mne.simulation.raw import _head_pos_params, _iter_interp_gains
 from mne.simulation.source import SourceSimulator
 from mne.source_space._source_space import _compare_source_spaces
 from mne.surface import _get_ico_surface
 from mne.tests.test_chpi import _assert_quats
-from mne.transforms import _affine_to_quat
+from mne.transforms import _affine_to_quat, rotation
 from mne.utils import catch_logging
 
 raw_fname_short = Path(__file__).parents[2] / "io" / "tests" / "data" / "test_raw.fif"
@@ -269,6 +270,12 @@ def test_simulate_raw_sphere(raw_data, tmp_path):
     raw_meg = raw.copy().pick("meg")
     raw_sim = simulate_raw(raw_meg.info, stc, trans, src, sphere, head_pos=head_pos_sim)
     raw_data = raw_sim[:][0]
+    # too few positions to interpolate the forward solutions
+    raw_sim_interp = simulate_raw(
+        raw_meg.info, stc, trans, src, sphere, head_pos=head_pos_sim, fwd_tol=1e-3
+    )
+    assert_allclose(raw_sim_interp[:][0], raw_data)
+    del raw_sim_interp
     # Test IO on processed data
     test_outname = tmp_path / "sim_test_raw.fif"
     raw_sim.save(test_outname)
@@ -325,6 +332,64 @@ def test_simulate_raw_sphere(raw_data, tmp_path):
     del raw_sim_hann
 
 
+def test_iter_interp_gains():
+    """Test interpolating gain matrices between head positions."""
+    rng = np.random.default_rng(0)
+    dev_head_ts = list()
+    for _ in range(50):
+        trans = rotation(*rng.uniform(-0.02, 0.02, 3))
+        trans[:3, 3] = rng.uniform(-2e-3, 2e-3, 3)
+        dev_head_ts.append(dict(trans=trans))
+    coefs = rng.standard_normal((4, 6, 6))
+    n_calls = [0]
+
+    def get_gain(dev_head_t):  # quadratic in the head position parameters
+        n_calls[0] += 1
+        param = _head_pos_params(dev_head_t["trans"]) * 100
+        return coefs @ param @ param + coefs[:, 0] @ param
+
+    exact = np.array([get_gain(t) for t in dev_head_ts])
+    n_calls[0] = 0
+    with catch_logging(True) as log:
+        gains = np.array(list(_iter_interp_gains(dev_head_ts, get_gain, 1e-6)))
+    assert_allclose(gains, exact, rtol=1e-6)
+    assert n_calls[0] == 28 + 1
+    # the farthest position was checked, and its exact gain is used
+    assert "Interpolating 49/50 head positions" in log.getvalue()
+    assert sum(np.array_equal(gain, want) for gain, want in zip(gains, exact)) == 1
+    # the positions are computed exactly when the interpolation is inaccurate
+    n_calls[0] = 0
+    gains = list(_iter_interp_gains(dev_head_ts, lambda t: np.exp(get_gain(t)), 0.01))
+    assert_allclose(gains, np.exp(exact))
+    assert n_calls[0] == 28 + 50  # the checked gains are not recomputed
+
+
+def test_simulate_raw_fwd_tol():
+    """Test simulating raw data with interpolated forward solutions."""
+    raw = read_raw_fif(raw_fname_short)
+    raw.pick(raw.ch_names[:30])
+    src = setup_volume_source_space(
+        pos=dict(rr=[[-0.05, 0, 0.05], [0.05, 0, 0.05]], nn=[[0, 1.0, 0], [0, 0, 1.0]])
+    )
+    sphere = make_sphere_model(head_radius=None, info=raw.info)
+    rng = np.random.default_rng(0)
+    stc = VolSourceEstimate(
+        rng.standard_normal((2, 1000)), [np.arange(2)], 0, 1.0 / raw.info["sfreq"]
+    )
+    # enough small head movements for the gains to be interpolated
+    head_pos = dict()
+    for ti in range(40):
+        trans = raw.info["dev_head_t"]["trans"] @ rotation(*rng.uniform(-0.01, 0.01, 3))
+        trans[:3, 3] += rng.uniform(-1e-3, 1e-3, 3)
+        head_pos[0.02 * ti] = trans
+    kwargs = dict(head_pos=head_pos, first_samp=raw.first_samp)
+    want = simulate_raw(raw.info, stc, None, src, sphere, **kwargs).get_data()
+    with catch_logging(True) as log:
+        raw_sim = simulate_raw(raw.info, stc, None, src, sphere, fwd_tol=1e-3, **kwargs)
+    assert "Interpolating 39/40 head positions" in log.getvalue()
+    assert_allclose(raw_sim.get_data(), want, rtol=1e-2, atol=1e-3 * np.abs(want).max())
+
+
 def test_degenerate(raw_data):
     """Test degenerate conditions."""
     raw, src, stc, trans, sphere = raw_data
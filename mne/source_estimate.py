@@ -9,6 +9,7 @@ from types import GeneratorType
 
 import numpy as np
 from scipy import sparse
+from scipy.sparse.linalg import svds
 from scipy.spatial.distance import cdist, pdist
 
 from ._fiff.constants import FIFF
@@ -33,6 +34,7 @@ from .source_space._source_space import (
 from .surface import _get_ico_surface, _project_onto_surface, mesh_edges, read_surface
 from .transforms import _get_trans, apply_trans
 from .utils import (
+    _BLOCK_BYTES,
     TimeMixin,
     _build_data_frame,
     _check_fname,
@@ -136,20 +138,25 @@ def _write_stc(filename, tmin, tstep, vertices, data):
         The data matrix (nvert * ntime).
     """
     with open(filename, "wb") as fid:
-        # write start time in ms
-        fid.write(np.array(1000 * tmin, dtype=">f4").tobytes())
-        # write sampling rate in ms
-        fid.write(np.array(1000 * tstep, dtype=">f4").tobytes())
-        # write number of vertices
-        fid.write(np.array(vertices.shape[0], dtype=">u4").tobytes())
-        # write the vertex indices
-        fid.write(np.array(vertices, dtype=">u4").tobytes())
-        # write the number of timepts
-        fid.write(np.array(data.shape[1], dtype=">u4").tobytes())
+        _write_stc_header(fid, tmin, tstep, vertices, data.shape[1])
         # write the data
         fid.write(np.array(data.T, dtype=">f4").tobytes())
 
 
+def _write_stc_header(fid, tmin, tstep, vertices, n_times):
+    """Write the header of an STC file, to be followed by the data."""
+    # write start time in ms
+    fid.write(np.array(1000 * tmin, dtype=">f4").tobytes())
+    # write sampling rate in ms
+    fid.write(np.array(1000 * tstep, dtype=">f4").tobytes())
+    # write number of vertices
+    fid.write(np.array(vertices.shape[0], dtype=">u4").tobytes())
+    # write the vertex indices
+    fid.write(np.array(vertices, dtype=">u4").tobytes())
+    # write the number of timepts
+    fid.write(np.array(n_times, dtype=">u4").tobytes())
+
+
 def _read_3(fid):
     """Read 3 byte integer from file."""
     data = np.fromfile(fid, dtype=np.uint8, count=3).astype(np.int32)
@@ -3384,6 +3391,9 @@ def _pca_flip(flip, data):
     return sign * scale * V[0]
 
 
+# Size above which only the first singular vectors are computed for pca_flip
+_PCA_FLIP_TRUNCATE = 100
+
 _label_funcs = {
     "mean": lambda flip, data: np.mean(data, axis=0),
     "mean_flip": lambda flip, data: np.mean(flip * data, axis=0),
@@ -3650,17 +3660,23 @@ def _get_allowed_label_modes(stc):
         return _get_default_label_modes()
 
 
-def _gen_extract_label_time_course(
-    stcs,
-    labels,
-    src,
-    *,
-    mode="mean",
-    allow_empty=False,
-    mri_resolution=True,
-    verbose=None,
-):
-    # loop through source estimates and extract time series
+def _check_label_mode(stc, mode):
+    """Check the extraction mode for an estimate like stc and resolve "auto"."""
+    _check_option(
+        "mode",
+        mode,
+        _get_allowed_label_modes(stc),
+        "when using a vector and/or volume source estimate",
+    )
+    if isinstance(stc, _BaseVolSourceEstimate | _BaseVectorSourceEstimate):
+        mode = "mean" if mode == "auto" else mode
+    else:
+        mode = "mean_flip" if mode == "auto" else mode
+    return mode
+
+
+def _check_label_src(labels, src, mode, mri_resolution):
+    """Check the labels and source space used to extract label time courses."""
     if src is None and mode in ["mean", "max"]:
         kind = "surface"
     else:
@@ -3675,33 +3691,232 @@ def _gen_extract_label_time_course(
     else:
         labels = _volume_labels(src, labels, mri_resolution)
         use_sparse = bool(mri_resolution)
-    n_mode = len(labels)  # how many processed with the given mode
     n_mean = len(src[2:]) if kind == "mixed" else 0
-    n_labels = n_mode + n_mean
-    vertno = func = None
-    for si, stc in enumerate(stcs):
-        _validate_type(stc, _BaseSourceEstimate, f"stcs[{si}]", "source estimate")
-        _check_option(
-            "mode",
-            mode,
-            _get_allowed_label_modes(stc),
-            "when using a vector and/or volume source estimate",
+    return labels, use_sparse, n_mean
+
+
+def _gen_extract_label_time_course(
+    stcs,
+    labels,
+    src,
+    *,
+    mode="mean",
+    allow_empty=False,
+    mri_resolution=True,
+    verbose=None,
+):
+    extractor = LabelExtractor(
+        labels, src, mode, allow_empty=allow_empty, mri_resolution=mri_resolution
+    )
+    yield from extractor._gen_extract(stcs)
+
+
+def _add_mixed_label_means(label_vertidx, label_flip, nvert, n_mean):
+    """Append the vertices of the volumes of a mixed source space to average."""
+    offset = sum(nvert[: len(nvert) - n_mean])
+    for nv in nvert[len(nvert) - n_mean :]:
+        label_vertidx.append(np.arange(offset, offset + nv) if nv else None)
+        label_flip.append(None)
+        offset += nv
+
+
+def _label_weights(label_vertidx, label_flip, n_src):
+    """Get the sparse matrix averaging (and sign-flipping) the data in labels."""
+    weights = list()
+    for vertidx, flip in zip(label_vertidx, label_flip):
+        if vertidx is None:
+            weights.append(sparse.csr_array((1, n_src)))
+        elif isinstance(vertidx, sparse.csr_array):
+            assert vertidx.shape == (1, n_src)  # already averaged
+            weights.append(vertidx)
+        else:
+            w = np.full(len(vertidx), 1.0 / len(vertidx))
+            if flip is not None:
+                w *= flip[:, 0]
+            rows = np.zeros(len(vertidx), int)
+            weights.append(sparse.csr_array((w, (rows, vertidx)), shape=(1, n_src)))
+    return sparse.vstack(weights, format="csr")
+
+
+def _restrict_label_vertidx(label_vertidx):
+    """Get the vertices within labels and index the labels into them."""
+    use = [
+        v.indices if isinstance(v, sparse.csr_array) else v
+        for v in label_vertidx
+        if v is not None
+    ]
+    use = np.unique(np.concatenate([np.zeros(0, int)] + use))
+    out = list()
+    for vertidx in label_vertidx:
+        if isinstance(vertidx, sparse.csr_array):
+            vertidx = vertidx[:, use]
+        elif vertidx is not None:
+            vertidx = np.searchsorted(use, vertidx)
+        out.append(vertidx)
+    return use, out
+
+
+def _pca_flip_stack(flip, data):
+    """Compute the pca_flip time courses of stacked data of one label."""
+    # data has shape (n_stcs, n_vertices, n_times); the norm of the singular
+    # values is the Frobenius norm of the data
+    scale = np.linalg.norm(data, axis=(1, 2)) / np.sqrt(data.shape[1])
+    if min(data.shape[1:]) > _PCA_FLIP_TRUNCATE and not np.iscomplexobj(data):
+        # only compute the first singular vectors (of real data, for complex
+        # data their phase would not match the one of _pca_flip)
+        U = np.zeros(data.shape[:2])
+        V = np.zeros((data.shape[0], data.shape[2]))
+        for ii, this_data in enumerate(data):
+            if scale[ii] > 0:
+                u, _, v = svds(this_data, k=1, random_state=0)
+                U[ii], V[ii] = u[:, 0], v[0]
+    else:
+        try:
+            U, _, V = np.linalg.svd(data, full_matrices=False)
+        except np.linalg.LinAlgError:  # use the (slower) fallback of _safe_svd
+            return np.array([_pca_flip(flip, this_data) for this_data in data])
+        U, V = U[:, :, 0], V[:, 0]
+    sign = np.sign(U @ flip[:, 0])
+    return (sign * scale)[:, np.newaxis] * V
+
+
+@fill_doc
+class LabelExtractor:
+    """Extract label time courses, reusing the label operator across estimates.
+
+    Parameters
+    ----------
+    %(labels_eltc)s
+    %(src_eltc)s
+    %(mode_eltc)s
+    %(allow_empty_eltc)s
+    %(mri_resolution_eltc)s
+    %(verbose)s
+
+    See Also
+    --------
+    extract_label_time_course
+
+    Notes
+    -----
+    %(eltc_mode_notes)s
+
+    The vertices of each label and their sign flips are computed once, for the
+    first source estimate the instance is applied to, and reused for the
+    following ones (which must have the same vertices). For the ``'mean'`` and
+    ``'mean_flip'`` modes, they are combined into a sparse matrix applied to
+    blocks of source estimates at once. For source estimates that store the
+    imaging kernel and the sensor data separately (e.g., obtained with
+    :func:`mne.minimum_norm.apply_inverse_epochs` and ``return_generator``),
+    the operator is applied to the kernel, so that the source time courses
+    are never computed. For the ``'pca_flip'`` mode, the singular value
+    decompositions of the data of each label are computed for blocks of
+    source estimates at once, and only the first singular vectors are
+    computed for large labels and long source estimates.
+
+    .. versionadded:: 1.11
+    """
+
+    @verbose
+    def __init__(
+        self,
+        labels,
+        src,
+        mode="auto",
+        *,
+        allow_empty=False,
+        mri_resolution=True,
+        verbose=None,
+    ):
+        labels, use_sparse, n_mean = _check_label_src(labels, src, mode, mri_resolution)
+        self._labels = labels
+        self._src = src
+        self._mode = mode
+        self._allow_empty = allow_empty
+        self._use_sparse = use_sparse
+        self._n_mean = n_mean
+        self._vertno = None
+        self._kernel = (None, None)
+
+    def __repr__(self):  # noqa: D105
+        mode = self._mode if self._vertno is None else self._use_mode
+        return f"<LabelExtractor | {self.n_labels} labels, mode: {mode}>"
+
+    @property
+    def n_labels(self):
+        """The number of label time courses extracted from each estimate."""
+        return len(self._labels) + self._n_mean
+
+    @verbose
+    def apply(self, stcs, return_generator=False, *, verbose=None):
+        """Extract the label time courses of source estimates.
+
+        Parameters
+        ----------
+        stcs : SourceEstimate | list (or generator) of SourceEstimate
+            The source estimates from which to extract the time course.
+        return_generator : bool
+            If True, a generator instead of a list is returned.
+        %(verbose)s
+
+        Returns
+        -------
+        %(label_tc_el_returns)s
+        """
+        if not isinstance(stcs, list | tuple | GeneratorType):
+            return next(self._gen_extract([stcs]))
+        label_tc = self._gen_extract(stcs)
+        if not return_generator:
+            label_tc = list(label_tc)
+        return label_tc
+
+    def _gen_extract(self, stcs):
+        block, n_bytes = list(), 0
+        for si, stc in enumerate(stcs):
+            _validate_type(stc, _BaseSourceEstimate, f"stcs[{si}]", "source estimate")
+            if self._vertno is None:
+                self._prepare(stc, _check_label_mode(stc, self._mode))
+            else:
+                _check_label_mode(stc, self._use_mode)
+            self._check_vertices(stc)
+            block.append(stc)
+            if stc._kernel is None:
+                n_bytes += stc.data.nbytes
+            else:  # the size of the data computed from the kernel
+                dtype = np.result_type(stc._kernel, stc._sens_data)
+                n_bytes += np.prod(stc.shape) * dtype.itemsize
+            if n_bytes >= _BLOCK_BYTES:
+                yield from self._extract_block(block)
+                block, n_bytes = list(), 0
+        if len(block):
+            yield from self._extract_block(block)
+
+    def _prepare(self, stc, mode):
+        self._vertno = copy.deepcopy(stc.vertices)  # avoid keeping a ref
+        self._use_mode = mode
+        nvert = [len(v) for v in self._vertno]
+        label_vertidx, label_flip = _prepare_label_extraction(
+            stc, self._labels, self._src, mode, self._allow_empty, self._use_sparse
+        )
+        self._label_modes = [mode] * len(label_vertidx)
+        if mode is not None:
+            _add_mixed_label_means(label_vertidx, label_flip, nvert, self._n_mean)
+            self._label_modes += ["mean"] * self._n_mean
+        logger.info(
+            "Extracting time courses for %d labels (mode: %s)", self.n_labels, mode
         )
-        if isinstance(stc, _BaseVolSourceEstimate | _BaseVectorSourceEstimate):
-            mode = "mean" if mode == "auto" else mode
+        self._linear = mode in ("mean", "mean_flip")
+        if self._linear:
+            self._weights = _label_weights(label_vertidx, label_flip, sum(nvert))
         else:
-            mode = "mean_flip" if mode == "auto" else mode
-        if vertno is None:
-            vertno = copy.deepcopy(stc.vertices)  # avoid keeping a ref
-            nvert = np.array([len(v) for v in vertno])
-            label_vertidx, src_flip = _prepare_label_extraction(
-                stc, labels, src, mode, allow_empty, use_sparse
-            )
-            func = _label_funcs[mode]
+            self._use, self._label_vertidx = _restrict_label_vertidx(label_vertidx)
+            self._label_flip = label_flip
+
+    def _check_vertices(self, stc):
         # make sure the stc is compatible with the source space
-        if len(vertno) != len(stc.vertices):
+        if len(self._vertno) != len(stc.vertices):
             raise ValueError("stc not compatible with source space")
-        for vn, svn in zip(vertno, stc.vertices):
+        for vn, svn in zip(self._vertno, stc.vertices):
             if len(vn) != len(svn):
                 raise ValueError(
                     "stc not compatible with source space. "
@@ -3713,35 +3928,77 @@ def _gen_extract_label_time_course(
             if not np.array_equal(svn, vn):
                 raise ValueError("stc not compatible with source space")
 
-        logger.info("Extracting time courses for %d labels (mode: %s)", n_labels, mode)
-
-        # do the extraction
-        if mode is None:
-            # prepopulate an empty list for easy array-like index-based assignment
-            label_tc = [None] * max(len(label_vertidx), len(src_flip))
+    def _get_kernel(self, kernel):
+        """Get the operator applied to the sensor data of kernel-backed stcs."""
+        # keep the last one, as successive stcs usually share the same kernel
+        if self._kernel[0] is not kernel:
+            if self._linear:
+                this_kernel = self._weights @ kernel
+            else:
+                this_kernel = kernel[self._use]
+            self._kernel = (kernel, this_kernel)
+        return self._kernel[1]
+
+    def _extract_block(self, stcs):
+        if self._linear:
+            # apply the weights to the data of all stcs at once
+            datas = [stc.data for stc in stcs if stc._kernel is None]
+            if len(datas):
+                label_tcs = self._weights @ np.concatenate(
+                    [data.reshape(len(data), -1) for data in datas], axis=1
+                )
+            start = 0
+            for stc in stcs:
+                if stc._kernel is None:
+                    stop = start + stc.data[0].size
+                    yield label_tcs[:, start:stop].reshape(
+                        (self.n_labels,) + stc.data.shape[1:]
+                    )
+                    start = stop
+                else:
+                    yield self._get_kernel(stc._kernel) @ stc._sens_data
+            return
+        datas = list()
+        for stc in stcs:
+            if stc._kernel is None:
+                datas.append(stc.data[self._use])
+            else:
+                datas.append(self._get_kernel(stc._kernel) @ stc._sens_data)
+        if self._use_mode is None:
+            label_tc = [[None] * len(self._label_vertidx) for _ in datas]
         else:
-            # For other modes, initialize the label_tc array
-            label_tc = np.zeros((n_labels,) + stc.data.shape[1:], dtype=stc.data.dtype)
-        for i, (vertidx, flip) in enumerate(zip(label_vertidx, src_flip)):
-            if vertidx is not None:
+            label_tc = [
+                np.zeros((self.n_labels,) + data.shape[1:], data.dtype)
+                for data in datas
+            ]
+        for li, (vertidx, flip, mode) in enumerate(
+            zip(self._label_vertidx, self._label_flip, self._label_modes)
+        ):
+            if vertidx is None:
+                continue
+            this_datas = list()
+            for data in datas:
                 if isinstance(vertidx, sparse.csr_array):
-                    assert mri_resolution
-                    assert vertidx.shape[1] == stc.data.shape[0]
-                    this_data = np.reshape(stc.data, (stc.data.shape[0], -1))
-                    this_data = vertidx @ this_data
-                    this_data.shape = (this_data.shape[0],) + stc.data.shape[1:]
+                    assert vertidx.shape[1] == data.shape[0]
+                    this_data = vertidx @ data.reshape(len(data), -1)
+                    this_data.shape = (this_data.shape[0],) + data.shape[1:]
                 else:
-                    this_data = stc.data[vertidx]
-                label_tc[i] = func(flip, this_data)
-
-        if mode is not None:
-            offset = nvert[:-n_mean].sum()  # effectively :2 or :0
-            for i, nv in enumerate(nvert[2:]):
-                if nv != 0:
-                    v2 = offset + nv
-                    label_tc[n_mode + i] = np.mean(stc.data[offset:v2], axis=0)
-                    offset = v2
-        yield label_tc
+                    this_data = data[vertidx]
+                this_datas.append(this_data)
+            if mode == "pca_flip":
+                # stack the stcs with the same number of time points
+                shapes = [this_data.shape for this_data in this_datas]
+                for shape in set(shapes):
+                    idx = [si for si, s in enumerate(shapes) if s == shape]
+                    tcs = _pca_flip_stack(
+                        flip, np.array([this_datas[si] for si in idx])
+                    )
+                    for si, tc in zip(idx, tcs):
+                        label_tc[si][li] = tc
+            else:
+                for si, this_data in enumerate(this_datas):
+                    label_tc[si][li] = _label_funcs[mode](flip, this_data)
+        yield from label_tc
 
 
 @verbose
@@ -116,3 +116,46 @@ def combine_adjacency(*structure):
     weights[n_off:] = 1.0
     graph = sparse.coo_array((weights, edges), (vertices.size, vertices.size))
     return graph
+
+
+class _SpatioTemporalAdjacency:
+    """Adjacency of spatio-temporal data, without the space x time product.
+
+    The points are ordered time x space, i.e., point ``t * n_vertices + s``
+    is vertex ``s`` at time ``t``. Only the (symmetric) spatial adjacency is
+    stored, each vertex being also adjacent to itself at the ``max_step``
+    neighboring times (see :func:`mne.stats.cluster_level._find_clusters`).
+
+    Parameters
+    ----------
+    adjacency : scipy.sparse.sparray | list of array
+        The spatial adjacency, or the indices of the neighbors of each vertex.
+    n_times : int
+        The number of time points.
+    """
+
+    def __init__(self, adjacency, n_times):
+        if isinstance(adjacency, list):
+            n_vertices = len(adjacency)
+            row = np.repeat(np.arange(n_vertices), [len(n) for n in adjacency])
+            col = np.concatenate(adjacency) if len(row) else np.zeros(0, int)
+        else:
+            adjacency = sparse.coo_array(adjacency)
+            n_vertices = adjacency.shape[0]
+            row, col = adjacency.row, adjacency.col
+        # symmetric, without the diagonal
+        keep = row != col
+        row, col = row[keep], col[keep]
+        spatial = sparse.csr_array(
+            (np.ones(2 * len(row), bool), (np.r_[row, col], np.r_[col, row])),
+            shape=(n_vertices, n_vertices),
+        )
+        spatial.sum_duplicates()
+        self.spatial = spatial
+        self.n_vertices = n_vertices
+        self.n_times = int(n_times)
+
+    @property
+    def shape(self):
+        n_tests = self.n_times * self.n_vertices
+        return (n_tests, n_tests)
@@ -4,6 +4,11 @@
 # License: BSD-3-Clause
 # Copyright the MNE-Python contributors.
 
+import hashlib
+import os
+import tempfile
+from functools import partial
+
 import numpy as np
 from scipy import ndimage, sparse
 from scipy.sparse.csgraph import connected_components
@@ -15,7 +20,9 @@ from ..parallel import parallel_func
 from ..source_estimate import MixedSourceEstimate, SourceEstimate, VolSourceEstimate
 from ..source_space import SourceSpaces
 from ..utils import (
+    _BLOCK_BYTES,
     ProgressBar,
+    _check_fname,
     _check_option,
     _pl,
     _validate_type,
@@ -25,98 +32,11 @@ from ..utils import (
     verbose,
     warn,
 )
-from .parametric import f_oneway, ttest_1samp_no_p
+from ._adjacency import _SpatioTemporalAdjacency, combine_adjacency
+from .parametric import f_oneway, ttest_1samp_no_p, ttest_ind_no_p
 
-
-def _get_buddies_fallback(r, s, neighbors, indices=None):
-    if indices is None:
-        buddies = np.where(r)[0]
-    else:
-        buddies = indices[r[indices]]
-    buddies = buddies[np.isin(s[buddies], neighbors, assume_unique=True)]
-    r[buddies] = False
-    return buddies.tolist()
-
-
-def _get_selves_fallback(r, s, ind, inds, t, t_border, max_step):
-    start = t_border[max(t[ind] - max_step, 0)]
-    stop = t_border[min(t[ind] + max_step + 1, len(t_border) - 1)]
-    indices = inds[start:stop]
-    selves = indices[r[indices]]
-    selves = selves[s[ind] == s[selves]]
-    r[selves] = False
-    return selves.tolist()
-
-
-def _where_first_fallback(x):
-    # this is equivalent to np.where(r)[0] for these purposes, but it's
-    # a little bit faster. Unfortunately there's no way to tell numpy
-    # just to find the first instance (to save checking every one):
-    next_ind = int(np.argmax(x))
-    if next_ind == 0:
-        next_ind = -1
-    return next_ind
-
-
-if has_numba:  # pragma: no cover
-
-    @jit()
-    def _get_buddies(r, s, neighbors, indices=None):
-        buddies = list()
-        # At some point we might be able to use the sorted-ness of s or
-        # neighbors to further speed this up
-        if indices is None:
-            n_check = len(r)
-        else:
-            n_check = len(indices)
-        for ii in range(n_check):
-            if indices is None:
-                this_idx = ii
-            else:
-                this_idx = indices[ii]
-            if r[this_idx]:
-                this_s = s[this_idx]
-                for ni in range(len(neighbors)):
-                    if this_s == neighbors[ni]:
-                        buddies.append(this_idx)
-                        r[this_idx] = False
-                        break
-        return buddies
-
-    @jit()
-    def _get_selves(r, s, ind, inds, t, t_border, max_step):
-        selves = list()
-        start = t_border[max(t[ind] - max_step, 0)]
-        stop = t_border[min(t[ind] + max_step + 1, len(t_border) - 1)]
-        for ii in range(start, stop):
-            this_idx = inds[ii]
-            if r[this_idx] and s[ind] == s[this_idx]:
-                selves.append(this_idx)
-                r[this_idx] = False
-        return selves
-
-    @jit()
-    def _where_first(x):
-        for ii in range(len(x)):
-            if x[ii]:
-                return ii
-        return -1
-
-else:  # pragma: no cover
-    # fastest ways we've found with NumPy
-    _get_buddies = _get_buddies_fallback
-    _get_selves = _get_selves_fallback
-    _where_first = _where_first_fallback
-
-
-@jit()
-def _masked_sum(x, c):
-    return np.sum(x[c])
-
-
-@jit()
-def _masked_sum_power(x, c, t_power):
-    return np.sum(np.sign(x[c]) * np.abs(x[c]) ** t_power)
+# Number of permutations of each block saved to disk with checkpoint_dir
+_CHECKPOINT_BLOCK_SIZE = 100
 
 
 @jit()
@@ -124,196 +44,201 @@ def _sum_cluster_data(data, tstep):
     return np.sign(data) * np.logical_not(data == 0) * tstep
 
 
-def _get_clusters_spatial(s, neighbors):
-    """Form spatial clusters using neighbor lists.
+def _get_graph(adjacency, n_tests, max_step):
+    """Get the CSR spatial adjacency of the points and their time steps."""
+    if isinstance(adjacency, list):
+        adjacency = _SpatioTemporalAdjacency(adjacency, n_tests // len(adjacency))
+    if isinstance(adjacency, _SpatioTemporalAdjacency):
+        spatial = adjacency.spatial
+        return spatial.indptr, spatial.indices, adjacency.n_vertices, max_step
+    if adjacency is False:
+        return np.zeros(n_tests + 1, np.intp), np.zeros(0, np.intp), n_tests, 0
+    adjacency = sparse.csr_array(adjacency)
+    return adjacency.indptr, adjacency.indices, n_tests, 0
 
-    This is equivalent to _get_components with n_times = 1, with a properly
-    reconfigured adjacency matrix (formed as "neighbors" list)
-    """
-    # s is a vector of spatial indices that are significant, like:
-    #     s = np.where(x_in)[0]
-    # for x_in representing a single time-instant
-    r = np.ones(s.shape, bool)
-    clusters = list()
-    next_ind = 0 if s.size > 0 else -1
-    while next_ind >= 0:
-        # put first point in a cluster, adjust remaining
-        t_inds = [next_ind]
-        r[next_ind] = 0
-        icount = 1  # count of nodes in the current cluster
-        while icount <= len(t_inds):
-            ind = t_inds[icount - 1]
-            # look across other vertices
-            buddies = _get_buddies(r, s, neighbors[s[ind]])
-            t_inds.extend(buddies)
-            icount += 1
-        next_ind = _where_first(r)
-        clusters.append(s[t_inds])
-    return clusters
 
+def _get_component_labels(x_in, adjacency, max_step=1):
+    """Label the connected components of the points of a mask.
 
-def _reassign(check, clusters, base, num):
-    """Reassign cluster numbers."""
-    # reconfigure check matrix
-    check[check == num] = base
-    # concatenate new values into clusters array
-    clusters[base - 1] = np.concatenate((clusters[base - 1], clusters[num - 1]))
-    clusters[num - 1] = np.array([], dtype=int)
+    Parameters
+    ----------
+    x_in : array of bool, shape (n_tests,)
+        The points to cluster.
+    adjacency : sparse array | list | _SpatioTemporalAdjacency | False
+        The adjacency between all points (sparse array), between spatial
+        points of spatio-temporal data organized as time x space (list of
+        neighbor indices or implicit spatio-temporal adjacency), or False for
+        no adjacency.
+    max_step : int
+        For spatio-temporal adjacency, the maximal number of time steps
+        between adjacent points.
 
+    Returns
+    -------
+    idx : array of int, shape (n_in,)
+        The indices of the points in the mask.
+    labels : array of int, shape (n_in,)
+        The component of each point. Components are numbered in the order of
+        their first point.
+    n_labels : int
+        The number of components.
+    """
+    x_in = np.asarray(x_in, dtype=bool)
+    idx = np.flatnonzero(x_in)
+    if adjacency is False or len(idx) == 0:
+        return idx, np.arange(len(idx)), len(idx)
+    indptr, indices, n_src, max_step = _get_graph(adjacency, x_in.size, max_step)
+    # position of each point of the mask in idx
+    pos = np.full(x_in.size, -1, np.intp)
+    pos[idx] = np.arange(len(idx))
+    # edges to the neighbors (at the same time) of each point
+    t, s = np.divmod(idx, n_src)
+    counts = indptr[s + 1] - indptr[s]
+    rows = np.repeat(np.arange(len(idx)), counts)
+    offsets = indptr[s] - (np.cumsum(counts) - counts)
+    gather = np.arange(len(rows)) + np.repeat(offsets, counts)
+    cols = pos[t[rows] * n_src + indices[gather]]
+    rows, cols = [rows], [cols]
+    # edges to the same point at later time steps
+    for step in range(1, max_step + 1):
+        later = idx + step * n_src
+        valid = later < x_in.size
+        rows.append(np.flatnonzero(valid))
+        cols.append(pos[later[valid]])
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    keep = cols >= 0
+    graph = sparse.csr_array(
+        (np.ones(keep.sum(), np.int8), (rows[keep], cols[keep])),
+        shape=(len(idx), len(idx)),
+    )
+    n_labels, labels = connected_components(graph, directed=False)
+    return idx, labels, n_labels
 
-def _get_clusters_st_1step(keepers, neighbors):
-    """Directly calculate clusters.
 
-    This uses knowledge that time points are
-    only adjacent to immediate neighbors for data organized as time x space.
+def _labels_to_clusters(idx, labels, n_labels):
+    """Split the points of each component (in increasing order)."""
+    order = np.argsort(labels, kind="stable")
+    splits = np.cumsum(np.bincount(labels, minlength=n_labels))[:-1]
+    return np.split(idx[order], splits)
 
-    This algorithm time increases linearly with the number of time points,
-    compared to with the square for the standard (graph) algorithm.
-
-    This algorithm creates clusters for each time point using a method more
-    efficient than the standard graph method (but otherwise equivalent), then
-    combines these clusters across time points in a reasonable way.
-    """
-    n_src = len(neighbors)
-    n_times = len(keepers)
-    # start cluster numbering at 1 for diffing convenience
-    enum_offset = 1
-    check = np.zeros((n_times, n_src), dtype=int)
-    clusters = list()
-    for ii, k in enumerate(keepers):
-        c = _get_clusters_spatial(k, neighbors)
-        for ci, cl in enumerate(c):
-            check[ii, cl] = ci + enum_offset
-        enum_offset += len(c)
-        # give them the correct offsets
-        c = [cl + ii * n_src for cl in c]
-        clusters += c
-
-    # now that each cluster has been assigned a unique number, combine them
-    # by going through each time point
-    for check1, check2, k in zip(check[:-1], check[1:], keepers[:-1]):
-        # go through each one that needs reassignment
-        inds = k[check2[k] - check1[k] > 0]
-        check1_d = check1[inds]
-        n = check2[inds]
-        nexts = np.unique(n)
-        for num in nexts:
-            prevs = check1_d[n == num]
-            base = np.min(prevs)
-            for pr in np.unique(prevs[prevs != base]):
-                _reassign(check1, clusters, base, pr)
-            # reassign values
-            _reassign(check2, clusters, base, num)
-    # clean up clusters
-    clusters = [cl for cl in clusters if len(cl) > 0]
-    return clusters
 
+def _get_components(x_in, adjacency):
+    """Get connected components from a mask and a adjacency matrix."""
+    return _labels_to_clusters(*_get_component_labels(x_in, adjacency))
 
-def _get_clusters_st_multistep(keepers, neighbors, max_step=1):
-    """Directly calculate clusters.
 
-    This uses knowledge that time points are
-    only adjacent to immediate neighbors for data organized as time x space.
+@jit()
+def _tfce_find(v, parent):
+    while parent[v] != v:
+        v = parent[v]
+    return v
 
-    This algorithm time increases linearly with the number of time points,
-    compared to with the square for the standard (graph) algorithm.
-    """
-    n_src = len(neighbors)
-    n_times = len(keepers)
-    t_border = list()
-    t_border.append(0)
-    for ki, k in enumerate(keepers):
-        keepers[ki] = k + ki * n_src
-        t_border.append(t_border[ki] + len(k))
-    t_border = np.array(t_border)
-    keepers = np.concatenate(keepers)
-    v = keepers
-    t, s = divmod(v, n_src)
-
-    r = np.ones(t.shape, dtype=bool)
-    clusters = list()
-    inds = np.arange(t_border[0], t_border[n_times])
-    next_ind = 0 if s.size > 0 else -1
-    while next_ind >= 0:
-        # put first point in a cluster, adjust remaining
-        t_inds = [next_ind]
-        r[next_ind] = False
-        icount = 1  # count of nodes in the current cluster
-        # look for significant values at the next time point,
-        # same sensor, not placed yet, and add those
-        while icount <= len(t_inds):
-            ind = t_inds[icount - 1]
-            selves = _get_selves(r, s, ind, inds, t, t_border, max_step)
-
-            # look at current time point across other vertices
-            these_inds = inds[t_border[t[ind]] : t_border[t[ind] + 1]]
-            buddies = _get_buddies(r, s, neighbors[s[ind]], these_inds)
-
-            t_inds += buddies + selves
-            icount += 1
-        next_ind = _where_first(r)
-        clusters.append(v[t_inds])
 
-    return clusters
+@jit()
+def _tfce_flush(r, k, size, opened, acc, h_cum, e_power):
+    # book the contributions of the component of root r for the thresholds
+    # since its last change down to (but excluding) threshold k
+    acc[r] += (h_cum[opened[r] + 1] - h_cum[k + 1]) * size[r] ** e_power
+    opened[r] = k
 
 
-def _get_clusters_st(x_in, neighbors, max_step=1):
-    """Choose the most efficient version."""
-    n_src = len(neighbors)
-    n_times = x_in.size // n_src
-    cl_goods = np.where(x_in)[0]
-    if len(cl_goods) > 0:
-        keepers = [np.array([], dtype=int)] * n_times
-        row, col = np.unravel_index(cl_goods, (n_times, n_src))
-        lims = [0]
-        if isinstance(row, int):
-            row = [row]
-            col = [col]
-        else:
-            order = np.argsort(row)
-            row = row[order]
-            col = col[order]
-            lims += (np.where(np.diff(row) > 0)[0] + 1).tolist()
-            lims.append(len(row))
-
-        for start, end in zip(lims[:-1], lims[1:]):
-            keepers[row[start]] = np.sort(col[start:end])
-        if max_step == 1:
-            return _get_clusters_st_1step(keepers, neighbors)
-        else:
-            return _get_clusters_st_multistep(keepers, neighbors, max_step)
-    else:
-        return []
+@jit()
+def _tfce_union(v, u, k, parent, size, opened, acc, h_cum, e_power):
+    if parent[u] < 0:  # not above threshold yet
+        return
+    rv = _tfce_find(v, parent)
+    ru = _tfce_find(u, parent)
+    if rv == ru:
+        return
+    _tfce_flush(rv, k, size, opened, acc, h_cum, e_power)
+    _tfce_flush(ru, k, size, opened, acc, h_cum, e_power)
+    if size[rv] < size[ru]:
+        rv, ru = ru, rv
+    # attach the smaller tree, keeping the sums along the paths unchanged
+    parent[ru] = rv
+    acc[ru] -= acc[rv]
+    size[rv] += size[ru]
 
 
-def _get_components(x_in, adjacency, return_list=True):
-    """Get connected components from a mask and a adjacency matrix."""
-    if adjacency is False:
-        components = np.arange(len(x_in))
-    else:
-        mask = np.logical_and(x_in[adjacency.row], x_in[adjacency.col])
-        data = adjacency.data[mask]
-        row = adjacency.row[mask]
-        col = adjacency.col[mask]
-        shape = adjacency.shape
-        idx = np.where(x_in)[0]
-        row = np.concatenate((row, idx))
-        col = np.concatenate((col, idx))
-        data = np.concatenate((data, np.ones(len(idx), dtype=data.dtype)))
-        adjacency = sparse.coo_array((data, (row, col)), shape=shape)
-        _, components = connected_components(adjacency)
-    if return_list:
-        start = np.min(components)
-        stop = np.max(components)
-        comp_list = [list() for i in range(start, stop + 1, 1)]
-        mask = np.zeros(len(comp_list), dtype=bool)
-        for ii, comp in enumerate(components):
-            comp_list[comp].append(ii)
-            mask[comp] += x_in[ii]
-        clusters = [np.array(k) for k, m in zip(comp_list, mask) if m]
-        return clusters
-    else:
-        return components
+@jit()
+def _tfce_union_find(order, levels, indptr, indices, n_src, max_step, h_cum, e_power):
+    n_tests = len(levels)
+    parent = np.full(n_tests, -1, np.int64)
+    size = np.zeros(n_tests, np.int64)
+    opened = np.zeros(n_tests, np.int64)
+    acc = np.zeros(n_tests)
+    for v in order:
+        k = levels[v]
+        parent[v] = v
+        size[v] = 1
+        opened[v] = k
+        t = v // n_src
+        s = v - t * n_src
+        for ii in range(indptr[s], indptr[s + 1]):
+            u = t * n_src + indices[ii]
+            _tfce_union(v, u, k, parent, size, opened, acc, h_cum, e_power)
+        for step in range(1, max_step + 1):
+            for u in (v - step * n_src, v + step * n_src):
+                if u >= 0 and u < n_tests:
+                    _tfce_union(v, u, k, parent, size, opened, acc, h_cum, e_power)
+    scores = np.zeros(n_tests)
+    for v in order:
+        if parent[v] == v:
+            _tfce_flush(v, -1, size, opened, acc, h_cum, e_power)
+    for v in order:
+        u = v
+        while parent[u] != u:
+            scores[v] += acc[u]
+            u = parent[u]
+        scores[v] += acc[u]
+    return scores
+
+
+def _tfce_incremental(
+    x, thresholds, tail, adjacency, max_step, include, h_power, e_power
+):
+    """Compute TFCE scores in a single sweep over decreasing thresholds.
+
+    Points are added from the most to the least extreme, and the components
+    are merged with a union-find structure as the threshold decreases. The
+    ``h ** h_power * e ** e_power`` contributions of each component are
+    accumulated lazily on its root, and only booked when the component
+    changes. This gives the same result as labeling the clusters at each
+    threshold (see :func:`_find_clusters`).
+    """
+    if adjacency is None:  # regular lattice, like ndimage.label
+        adjacency = _SpatioTemporalAdjacency(
+            combine_adjacency(*x.shape[1:]), x.shape[0]
+        )
+        max_step = 1
+    x = x.ravel()
+    include = include.ravel()
+    indptr, indices, n_src, max_step = _get_graph(adjacency, x.size, max_step)
+    scores = np.zeros(x.size)
+    if len(thresholds) == 0:
+        return scores
+    # the contribution of threshold k is h[k] ** h_power, use cumulative sums
+    h = np.abs(np.diff(thresholds, prepend=0.0)) ** h_power
+    h_cum = np.concatenate([[0.0], np.cumsum(h)])
+    # points above threshold k are y > t[k], with t increasing
+    t = -thresholds if tail == -1 else thresholds
+    for sign in (1, -1) if tail == 0 else (np.sign(tail),):
+        y = sign * x
+        levels = np.searchsorted(t, y, side="left") - 1
+        levels[~(include & (y > t[0]))] = -1
+        order = np.flatnonzero(levels >= 0)
+        order = order[np.argsort(-levels[order], kind="stable")]
+        scores += _tfce_union_find(
+            order,
+            levels,
+            indptr.astype(np.int64),
+            indices.astype(np.int64),
+            n_src,
+            max_step,
+            h_cum,
+            float(e_power),
+        )
+    return scores
 
 
 def _find_clusters(
@@ -326,6 +251,7 @@ def _find_clusters(
     partitions=None,
     t_power=1,
     show_info=False,
+    return_clusters=True,
 ):
     """Find all clusters which are above/below a certain threshold.
 
@@ -342,17 +268,19 @@ def _find_clusters(
         threshold-free cluster enhancement.
     tail : -1 | 0 | 1
         Type of comparison
-    adjacency : scipy.sparse.coo_array, None, or list
+    adjacency : scipy.sparse.coo_array, None, list, or _SpatioTemporalAdjacency
         Defines adjacency between features. The matrix is assumed to
         be symmetric and only the upper triangular half is used.
         If adjacency is a list, it is assumed that each entry stores the
         indices of the spatial neighbors in a spatio-temporal dataset x.
+        A _SpatioTemporalAdjacency stores the spatial adjacency of such a
+        dataset, without building the spatio-temporal product.
         Default is None, i.e, a regular lattice adjacency.
         False means no adjacency.
     max_step : int
-        If adjacency is a list, this defines the maximal number of steps
-        between vertices along the second dimension (typically time) to be
-        considered adjacent.
+        If adjacency is a list or a _SpatioTemporalAdjacency, this defines the
+        maximal number of steps between vertices along the second dimension
+        (typically time) to be considered adjacent.
     include : 1D bool array or None
         Mask to apply to the data of points to cluster. If None, all points
         are used.
@@ -367,12 +295,15 @@ def _find_clusters(
     show_info : bool
         If True, display information about thresholds used (for TFCE). Should
         only be done for the standard permutation.
+    return_clusters : bool
+        If False, only the sums are computed (e.g., for permutations).
 
     Returns
     -------
     clusters : list of slices or list of arrays (boolean masks)
         We use slices for 1D signals and mask to multidimensional
-        arrays. None is returned if threshold is a dict (TFCE)
+        arrays. None is returned if threshold is a dict (TFCE) or if
+        ``return_clusters=False``.
     sums : array
         Sum of x values in clusters.
     """
@@ -438,6 +369,19 @@ def _find_clusters(
     if tail == -1 and not np.all(np.diff(thresholds) < 0):
         raise ValueError("Thresholds must be monotonically decreasing")
 
+    # with Numba, TFCE merges clusters incrementally as the threshold decreases
+    if adjacency is None:
+        graph = x.ndim > 1
+    else:
+        graph = isinstance(adjacency, (list, _SpatioTemporalAdjacency))
+        graph = graph or adjacency is False or sparse.issparse(adjacency)
+        graph = graph and x.ndim == 1
+    if tfce and has_numba and graph:
+        scores = _tfce_incremental(
+            x, thresholds, tail, adjacency, max_step, include, h_power, e_power
+        )
+        return None, scores
+
     # set these here just in case thresholds == []
     clusters = list()
     sums = list()
@@ -457,9 +401,17 @@ def _find_clusters(
         for x_in in x_ins:
             if np.any(x_in):
                 out = _find_clusters_1dir_parts(
-                    x, x_in, adjacency, max_step, partitions, t_power, ndimage
+                    x,
+                    x_in,
+                    adjacency,
+                    max_step,
+                    partitions,
+                    t_power,
+                    ndimage,
+                    return_clusters or tfce,
                 )
-                clusters += out[0]
+                if return_clusters or tfce:
+                    clusters += out[0]
                 sums.append(out[1])
         if tfce:
             # the score of each point is the sum of the h^H * e^E for each
@@ -485,17 +437,21 @@ def _find_clusters(
     if tfce:
         sums = scores
         clusters = None  # clusters construction is made in _permutation_cluster_test
+    elif not return_clusters:
+        clusters = None
 
     return clusters, sums
 
 
 def _find_clusters_1dir_parts(
-    x, x_in, adjacency, max_step, partitions, t_power, ndimage
+    x, x_in, adjacency, max_step, partitions, t_power, ndimage, return_clusters=True
 ):
     """Deal with partitions, and pass the work to _find_clusters_1dir."""
-    if partitions is None:
+    # partitions only change the order of clusters, which does not matter
+    # if they are not returned
+    if partitions is None or not return_clusters:
         clusters, sums = _find_clusters_1dir(
-            x, x_in, adjacency, max_step, t_power, ndimage
+            x, x_in, adjacency, max_step, t_power, ndimage, return_clusters
         )
     else:
         # cluster each partition separately
@@ -510,8 +466,12 @@ def _find_clusters_1dir_parts(
     return clusters, sums
 
 
-def _find_clusters_1dir(x, x_in, adjacency, max_step, t_power, ndimage):
+def _find_clusters_1dir(
+    x, x_in, adjacency, max_step, t_power, ndimage, return_clusters=True
+):
     """Actually call the clustering algorithm."""
+    if t_power != 1:
+        x = np.sign(x) * np.abs(x) ** t_power
     if adjacency is None:
         labels, n_labels = ndimage.label(x_in)
 
@@ -523,12 +483,10 @@ def _find_clusters_1dir(x, x_in, adjacency, max_step, t_power, ndimage):
                 sums = list()
             else:
                 index = list(range(1, n_labels + 1))
-                if t_power == 1:
-                    sums = ndimage.sum(x, labels, index=index)
-                else:
-                    sums = ndimage.sum(
-                        np.sign(x) * np.abs(x) ** t_power, labels, index=index
-                    )
+                sums = ndimage.sum(x, labels, index=index)
+        elif not return_clusters:
+            clusters = None
+            sums = ndimage.sum(x, labels, index=np.arange(1, n_labels + 1))
         else:
             # boolean masks (raveled)
             clusters = list()
@@ -536,29 +494,25 @@ def _find_clusters_1dir(x, x_in, adjacency, max_step, t_power, ndimage):
             for label in range(n_labels):
                 c = labels == label + 1
                 clusters.append(c.ravel())
-                if t_power == 1:
-                    sums[label] = np.sum(x[c])
-                else:
-                    sums[label] = np.sum(np.sign(x[c]) * np.abs(x[c]) ** t_power)
+                sums[label] = np.sum(x[c])
     else:
         if x.ndim > 1:
             raise Exception(
                 "Data should be 1D when using a adjacency to define clusters."
             )
-        if isinstance(adjacency, sparse.spmatrix):
-            adjacency = sparse.coo_array(adjacency)
-        if sparse.issparse(adjacency) or adjacency is False:
-            clusters = _get_components(x_in, adjacency)
-        elif isinstance(adjacency, list):  # use temporal adjacency
-            clusters = _get_clusters_st(x_in, adjacency, max_step)
-        else:
+        if not (
+            sparse.issparse(adjacency)
+            or adjacency is False
+            or isinstance(adjacency, (list, _SpatioTemporalAdjacency))
+        ):
             raise TypeError(
                 f"adjacency must be a sparse array or list, got {type(adjacency)}"
             )
-        if t_power == 1:
-            sums = [_masked_sum(x, c) for c in clusters]
-        else:
-            sums = [_masked_sum_power(x, c, t_power) for c in clusters]
+        idx, labels, n_labels = _get_component_labels(x_in, adjacency, max_step)
+        sums = np.bincount(labels, weights=x[idx], minlength=n_labels)
+        clusters = None
+        if return_clusters:
+            clusters = _labels_to_clusters(idx, labels, n_labels)
 
     return clusters, np.atleast_1d(sums)
 
@@ -618,7 +572,7 @@ def _setup_adjacency(adjacency, n_tests, n_times):
             "If adjacency matrix is given, it must be a SciPy sparse matrix."
         )
     if adjacency.shape[0] == n_tests:  # use global algorithm
-        adjacency = adjacency.tocoo()
+        adjacency = sparse.csr_array(adjacency)
     else:  # use temporal adjacency algorithm
         got_times, mod = divmod(n_tests, adjacency.shape[0])
         if got_times != n_times or mod != 0:
@@ -630,14 +584,135 @@ def _setup_adjacency(adjacency, n_tests, n_times):
                 "vertices can be excluded during forward computation"
             )
         # we claim to only use upper triangular part... not true here
-        adjacency = (adjacency + adjacency.transpose()).tocsr()
-        adjacency = [
-            adjacency.indices[adjacency.indptr[i] : adjacency.indptr[i + 1]]
-            for i in range(len(adjacency.indptr) - 1)
-        ]
+        adjacency = _SpatioTemporalAdjacency(adjacency, n_times)
     return adjacency
 
 
+def _get_batch_stat_fun(stat_fun, n_groups):
+    """Get a function computing a built-in stat_fun for blocks of permutations.
+
+    The returned function takes the data (with samples along the first axis)
+    and a block of permutations (sign flips for ``n_groups == 1``, sample
+    orders otherwise), and returns the statistics of each permutation. All
+    permutations are computed at once with matrix products, using that the
+    sum of squares of the data is invariant under permutations. If stat_fun
+    is not a (partial of a) built-in function, None is returned.
+    """
+    kwargs = dict()
+    if isinstance(stat_fun, partial) and not stat_fun.args:
+        stat_fun, kwargs = stat_fun.func, stat_fun.keywords
+    if n_groups == 1 and stat_fun is ttest_1samp_no_p:
+        return partial(_ttest_1samp_no_p_batch, **kwargs)
+    elif n_groups == 2 and stat_fun is ttest_ind_no_p:
+        return partial(_ttest_ind_no_p_batch, **kwargs)
+    elif n_groups > 1 and stat_fun is f_oneway and not kwargs:
+        return _f_oneway_batch
+    return None
+
+
+def _iter_batch_stats(batch_fun, X, orders, slices=None):
+    """Yield the statistics of each permutation, computed in blocks."""
+    n_groups = 1 if slices is None else len(slices)
+    if slices is not None:
+        # sums of squares are computed about the mean to limit round-off
+        X = X - X.mean(axis=0)
+        # group indicators, so that X is multiplied by all of them at once
+        groups = np.zeros(X.shape[0], int)
+        for gi, sl in enumerate(slices):
+            groups[sl] = gi
+    X = np.asarray(X, dtype=np.result_type(X.dtype, np.float64))
+    if slices is None:
+        # sign flips change the mean, so it is kept aside and the deviations
+        # are centered again to remove the round-off of the first pass
+        center = X.mean(axis=0)
+        X = X - center
+        X -= X.mean(axis=0)
+    sumsq = np.sum(X * X, axis=0)
+    n_block = int(_BLOCK_BYTES // (X.itemsize * X.shape[1] * n_groups))
+    n_block = max(n_block, 1)
+    for start in range(0, len(orders), n_block):
+        block = np.asarray(orders[start : start + n_block])
+        if slices is None:
+            yield from batch_fun(X, (2 * block - 1).astype(X.dtype), sumsq, center)
+        else:
+            indicators = np.zeros((len(block), n_groups, X.shape[0]), X.dtype)
+            rows = np.arange(len(block))[:, np.newaxis]
+            indicators[rows, groups[np.newaxis], block] = 1
+            yield from batch_fun(X, indicators, sumsq)
+
+
+def _ttest_1samp_no_p_batch(X, signs, sumsq, center, sigma=0, method="relative"):
+    """Compute ttest_1samp_no_p for sign flips of shape (n_perm, n_samples).
+
+    ``X`` contains the deviations from ``center``, the mean of the data.
+    """
+    _check_option("method", method, ["absolute", "relative"])
+    n_samples = X.shape[0]
+    # For data center + X, the sum of squared deviations of each sign flip is
+    # expanded such that the large terms in the center cancel analytically
+    flip_mean = signs.sum(axis=1, keepdims=True) / n_samples
+    dev_sum = signs @ X
+    mean = center * flip_mean + dev_sum / n_samples
+    var = (
+        sumsq
+        + n_samples * center**2 * (1 - flip_mean**2)
+        - 2 * center * flip_mean * dev_sum
+        - dev_sum**2 / n_samples
+    ) / (n_samples - 1)
+    if sigma > 0:
+        if method == "relative":
+            var += sigma * np.max(var, axis=1, keepdims=True)
+        else:
+            var += sigma
+    return mean / np.sqrt(var / n_samples)
+
+
+def _group_sums(X, indicators):
+    """Sum X in each group of shape (n_perm, n_groups, n_samples)."""
+    n_perm, n_groups, n_samples = indicators.shape
+    sums = indicators.reshape(-1, n_samples) @ X
+    return sums.reshape(n_perm, n_groups, X.shape[1])
+
+
+def _ttest_ind_no_p_batch(X, indicators, sumsq, equal_var=True, sigma=0.0):
+    """Compute ttest_ind_no_p for group indicators of shape (n_perm, 2, n)."""
+    sums = _group_sums(X, indicators)
+    n1, n2 = indicators[0].sum(axis=1)
+    sq1 = sums[:, 0] ** 2 / n1
+    sq2 = sums[:, 1] ** 2 / n2
+    if equal_var:
+        df = n1 + n2 - 2.0
+        var = (sumsq - sq1 - sq2) / df
+        var = var * (1.0 / n1 + 1.0 / n2)
+    else:
+        sumsq1 = _group_sums(X * X, indicators[:, :1])[:, 0]
+        vn1 = (sumsq1 - sq1) / (n1 - 1) / n1
+        vn2 = (sumsq - sumsq1 - sq2) / (n2 - 1) / n2
+        var = vn1 + vn2
+    if sigma > 0:
+        var += sigma * np.max(var, axis=1, keepdims=True)
+    denom = np.sqrt(var)
+    d = sums[:, 0] / n1 - sums[:, 1] / n2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.divide(d, denom)
+    return t
+
+
+def _f_oneway_batch(X, indicators, sumsq):
+    """Compute f_oneway for group indicators of shape (n_perm, n_groups, n)."""
+    sums = _group_sums(X, indicators)
+    n_samples_per_class = indicators[0].sum(axis=1)
+    n_classes, n_samples = len(n_samples_per_class), X.shape[0]
+    square_of_sums_alldata = np.sum(sums, axis=1) ** 2 / n_samples
+    sstot = sumsq - square_of_sums_alldata
+    ssbn = np.sum(sums**2 / n_samples_per_class[:, np.newaxis], axis=1)
+    ssbn -= square_of_sums_alldata
+    sswn = sstot - ssbn
+    msb = ssbn / float(n_classes - 1)
+    msw = sswn / float(n_samples - n_classes)
+    return msb / msw
+
+
 def _do_permutations(
     X_full,
     slices,
@@ -668,12 +743,19 @@ def _do_permutations(
             np.empty((len(X_full[s]), buffer_size), dtype=X_full.dtype) for s in slices
         ]
 
+    # for built-in stat_fun, compute the statistics of blocks of permutations
+    batch_fun = _get_batch_stat_fun(stat_fun, len(slices))
+    if batch_fun is not None:
+        batch_stats = _iter_batch_stats(batch_fun, X_full, orders, slices)
+
     for seed_idx, order in enumerate(orders):
         # shuffle sample indices
         assert order is not None
         idx_shuffle_list = [order[s] for s in slices]
 
-        if buffer_size is None:
+        if batch_fun is not None:
+            t_obs_surr = next(batch_stats)
+        elif buffer_size is None:
             # shuffle all data at once
             X_shuffle_list = [X_full[idx, :] for idx in idx_shuffle_list]
             t_obs_surr = stat_fun(*X_shuffle_list)
@@ -707,6 +789,7 @@ def _do_permutations(
             partitions=partitions,
             include=include,
             t_power=t_power,
+            return_clusters=False,
         )
         perm_clusters_sums = out[1]
 
@@ -749,6 +832,11 @@ def _do_1samp_permutations(
         # allocate a buffer so we don't need to allocate memory in loop
         X_flip_buffer = np.empty((n_samp, buffer_size), dtype=X.dtype)
 
+    # for built-in stat_fun, compute the statistics of blocks of sign flips
+    batch_fun = _get_batch_stat_fun(stat_fun, 1)
+    if batch_fun is not None:
+        batch_stats = _iter_batch_stats(batch_fun, X, orders)
+
     for seed_idx, order in enumerate(orders):
         assert isinstance(order, np.ndarray)
         # new surrogate data with specified sign flip
@@ -757,7 +845,9 @@ def _do_1samp_permutations(
         if not np.all(np.equal(np.abs(signs), 1)):
             raise ValueError("signs from rng must be +/- 1")
 
-        if buffer_size is None:
+        if batch_fun is not None:
+            t_obs_surr = next(batch_stats)
+        elif buffer_size is None:
             # be careful about non-writable memmap (GH#1507)
             if X.flags.writeable:
                 X *= signs
@@ -795,6 +885,7 @@ def _do_1samp_permutations(
             partitions=partitions,
             include=include,
             t_power=t_power,
+            return_clusters=False,
         )
         perm_clusters_sums = out[1]
         if len(perm_clusters_sums) > 0:
@@ -809,6 +900,62 @@ def _do_1samp_permutations(
     return max_cluster_sums
 
 
+def _checkpoint_hash(t_obs, threshold, tail, adjacency, max_step, t_power, include):
+    """Hash everything the maximum cluster statistics depend on."""
+    hasher = hashlib.sha1()
+    hasher.update(np.ascontiguousarray(t_obs).tobytes())
+    if isinstance(threshold, dict):
+        threshold = sorted(threshold.items())
+    hasher.update(repr((threshold, tail, max_step, t_power)).encode())
+    if isinstance(adjacency, _SpatioTemporalAdjacency):
+        hasher.update(repr(adjacency.n_times).encode())
+        adjacency = adjacency.spatial
+    if sparse.issparse(adjacency):
+        adjacency = sparse.coo_array(adjacency)
+        for arr in (adjacency.row, adjacency.col, adjacency.data):
+            hasher.update(arr.astype(np.float64).tobytes())
+    else:
+        hasher.update(repr(adjacency).encode())
+    if include is not None:
+        hasher.update(np.ascontiguousarray(include).tobytes())
+    return hasher
+
+
+def _get_checkpoint_blocks(checkpoint_dir, hasher, orders):
+    """Split the permutations in blocks, each with its own checkpoint file."""
+    blocks = list()
+    for start in range(0, len(orders), _CHECKPOINT_BLOCK_SIZE):
+        idx = np.arange(start, min(start + _CHECKPOINT_BLOCK_SIZE, len(orders)))
+        block_hasher = hasher.copy()
+        block_hasher.update(np.asarray([orders[ii] for ii in idx]).tobytes())
+        fname = checkpoint_dir / f"perm_{block_hasher.hexdigest()}.npy"
+        blocks.append((idx, fname))
+    # start at a random block, so that processes (or machines) sharing the
+    # directory mostly compute different blocks
+    shift = int.from_bytes(os.urandom(4), "little") % max(len(blocks), 1)
+    return blocks[shift:] + blocks[:shift]
+
+
+def _do_checkpointed_permutations(fname, do_perm_func, *args):
+    """Load the results of a block of permutations, or compute and save them."""
+    *args, progress_bar = args
+    if fname.is_file():
+        max_cluster_sums = np.load(fname)
+        for ii in range(len(max_cluster_sums)):
+            progress_bar.update(ii + 1)
+        return max_cluster_sums
+    max_cluster_sums = do_perm_func(*args, progress_bar)
+    # write atomically, so that an interrupted job never leaves a bad file,
+    # to a file of unique name, as jobs on other machines can use the same pid
+    fd, tmp_fname = tempfile.mkstemp(
+        suffix=".tmp.npy", prefix=f"{fname.stem}_", dir=fname.parent
+    )
+    with os.fdopen(fd, "wb") as fid:
+        np.save(fid, max_cluster_sums)
+    os.replace(tmp_fname, fname)
+    return max_cluster_sums
+
+
 def bin_perm_rep(ndim, a=0, b=1):
     """Ndim permutations with repetitions of (a,b).
 
@@ -903,6 +1050,7 @@ def _permutation_cluster_test(
     out_type,
     check_disjoint,
     buffer_size,
+    checkpoint_dir=None,
 ):
     """Aux Function.
 
@@ -912,6 +1060,14 @@ def _permutation_cluster_test(
     """
     _check_option("out_type", out_type, ["mask", "indices"])
     _check_option("tail", tail, [-1, 0, 1])
+    if checkpoint_dir is not None:
+        checkpoint_dir = _check_fname(
+            checkpoint_dir,
+            "read",
+            must_exist=True,
+            name="checkpoint_dir",
+            need_dir=True,
+        )
     if not isinstance(threshold, dict):
         threshold = float(threshold)
         if (
@@ -1045,9 +1201,14 @@ def _permutation_cluster_test(
         slices = [slice(splits_idx[k], splits_idx[k + 1]) for k in range(len(X))]
         orders = [rng.permutation(len(X_full)) for _ in range(n_permutations - 1)]
     del rng
-    parallel, my_do_perm_func, n_jobs = parallel_func(
-        do_perm_func, n_jobs, verbose=False
-    )
+    if checkpoint_dir is None:
+        parallel, my_do_perm_func, n_jobs = parallel_func(
+            do_perm_func, n_jobs, verbose=False
+        )
+    else:
+        parallel, my_do_perm_func, n_jobs = parallel_func(
+            _do_checkpointed_permutations, n_jobs, verbose=False
+        )
 
     if len(clusters) == 0:
         warn("No clusters found, returning empty H0, clusters, and cluster_pv")
@@ -1071,28 +1232,51 @@ def _permutation_cluster_test(
         else:
             this_include = step_down_include
 
+        args = (
+            X_full,
+            slices,
+            threshold,
+            tail,
+            adjacency,
+            stat_fun,
+            max_step,
+            this_include,
+            partitions,
+            t_power,
+        )
         with ProgressBar(
             iterable=range(len(orders)), mesg=f"Permuting{extra}"
         ) as progress_bar:
-            H0 = parallel(
-                my_do_perm_func(
-                    X_full,
-                    slices,
-                    threshold,
-                    tail,
-                    adjacency,
-                    stat_fun,
-                    max_step,
-                    this_include,
-                    partitions,
-                    t_power,
-                    order,
-                    sample_shape,
-                    buffer_size,
-                    progress_bar.subset(idx),
+            if checkpoint_dir is None:
+                H0 = parallel(
+                    my_do_perm_func(
+                        *args,
+                        order,
+                        sample_shape,
+                        buffer_size,
+                        progress_bar.subset(idx),
+                    )
+                    for idx, order in split_list(orders, n_jobs, idx=True)
                 )
-                for idx, order in split_list(orders, n_jobs, idx=True)
-            )
+            else:
+                hasher = _checkpoint_hash(
+                    t_obs, threshold, tail, adjacency, max_step, t_power, this_include
+                )
+                blocks = _get_checkpoint_blocks(checkpoint_dir, hasher, orders)
+                H0 = parallel(
+                    my_do_perm_func(
+                        fname,
+                        do_perm_func,
+                        *args,
+                        [orders[ii] for ii in idx],
+                        sample_shape,
+                        buffer_size,
+                        progress_bar.subset(idx),
+                    )
+                    for idx, fname in blocks
+                )
+                # put the blocks back in the order of the permutations
+                H0 = [H0[bi] for bi in np.argsort([idx[0] for idx, _ in blocks])]
         # include original (true) ordering
         if tail == -1:  # up tail
             orig = cluster_stats.min()
@@ -1183,6 +1367,7 @@ def permutation_cluster_test(
     out_type="indices",
     check_disjoint=False,
     buffer_size=1000,
+    checkpoint_dir=None,
     verbose=None,
 ):
     """Cluster-level statistical permutation test.
@@ -1223,6 +1408,7 @@ def permutation_cluster_test(
     %(out_type_clust)s
     %(check_disjoint_clust)s
     %(buffer_size_clust)s
+    %(checkpoint_dir_clust)s
     %(verbose)s
 
     Returns
@@ -1261,6 +1447,7 @@ def permutation_cluster_test(
         out_type=out_type,
         check_disjoint=check_disjoint,
         buffer_size=buffer_size,
+        checkpoint_dir=checkpoint_dir,
     )
 
 
@@ -1281,6 +1468,7 @@ def permutation_cluster_1samp_test(
     out_type="indices",
     check_disjoint=False,
     buffer_size=1000,
+    checkpoint_dir=None,
     verbose=None,
 ):
     """Non-parametric cluster-level paired t-test.
@@ -1310,6 +1498,7 @@ def permutation_cluster_1samp_test(
     %(out_type_clust)s
     %(check_disjoint_clust)s
     %(buffer_size_clust)s
+    %(checkpoint_dir_clust)s
     %(verbose)s
 
     Returns
@@ -1371,6 +1560,7 @@ def permutation_cluster_1samp_test(
         out_type=out_type,
         check_disjoint=check_disjoint,
         buffer_size=buffer_size,
+        checkpoint_dir=checkpoint_dir,
     )
 
 
@@ -1391,6 +1581,7 @@ def spatio_temporal_cluster_1samp_test(
     out_type="indices",
     check_disjoint=False,
     buffer_size=1000,
+    checkpoint_dir=None,
     verbose=None,
 ):
     """Non-parametric cluster-level paired t-test for spatio-temporal data.
@@ -1424,6 +1615,7 @@ def spatio_temporal_cluster_1samp_test(
     %(out_type_clust)s
     %(check_disjoint_clust)s
     %(buffer_size_clust)s
+    %(checkpoint_dir_clust)s
     %(verbose)s
 
     Returns
@@ -1468,6 +1660,7 @@ def spatio_temporal_cluster_1samp_test(
         out_type=out_type,
         check_disjoint=check_disjoint,
         buffer_size=buffer_size,
+        checkpoint_dir=checkpoint_dir,
     )
 
 
@@ -1488,6 +1681,7 @@ def spatio_temporal_cluster_test(
     out_type="indices",
     check_disjoint=False,
     buffer_size=1000,
+    checkpoint_dir=None,
     verbose=None,
 ):
     """Non-parametric cluster-level test for spatio-temporal data.
@@ -1523,6 +1717,7 @@ def spatio_temporal_cluster_test(
     %(out_type_clust)s
     %(check_disjoint_clust)s
     %(buffer_size_clust)s
+    %(checkpoint_dir_clust)s
     %(verbose)s
 
     Returns
@@ -1567,6 +1762,7 @@ def spatio_temporal_cluster_test(
         out_type=out_type,
         check_disjoint=check_disjoint,
         buffer_size=buffer_size,
+        checkpoint_dir=checkpoint_dir,
     )
 
 
@@ -1605,24 +1801,16 @@ def _st_mask_from_s_inds(n_times, n_vertices, vertices, set_as=True):
 @verbose
 def _get_partitions_from_adjacency(adjacency, n_times, verbose=None):
     """Specify disjoint subsets (e.g., hemispheres) based on adjacency."""
-    if isinstance(adjacency, list):
-        test = np.ones(len(adjacency))
-        test_adj = np.zeros((len(adjacency), len(adjacency)), dtype="bool")
-        for vi in range(len(adjacency)):
-            test_adj[adjacency[vi], vi] = True
-        test_adj = sparse.coo_array(test_adj, dtype="float")
+    if isinstance(adjacency, _SpatioTemporalAdjacency):
+        # vertices are only adjacent to themselves across time points
+        test_adj, n_reps = adjacency.spatial, adjacency.n_times
     else:
-        test = np.ones(adjacency.shape[0])
-        test_adj = adjacency
-
-    part_clusts = _find_clusters(test, 0, 1, test_adj)[0]
-    if len(part_clusts) > 1:
-        logger.info(f"{len(part_clusts)} disjoint adjacency sets found")
-        partitions = np.zeros(len(test), dtype="int")
-        for ii, pc in enumerate(part_clusts):
-            partitions[pc] = ii
-        if isinstance(adjacency, list):
-            partitions = np.tile(partitions, n_times)
+        test_adj, n_reps = adjacency, 1
+    test = np.ones(test_adj.shape[0], bool)
+    _, partitions, n_parts = _get_component_labels(test, test_adj)
+    if n_parts > 1:
+        logger.info(f"{n_parts} disjoint adjacency sets found")
+        partitions = np.tile(partitions, n_reps)
     else:
         logger.info("No disjoint adjacency sets found")
         partitions = None
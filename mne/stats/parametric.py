@@ -2,7 +2,7 @@
 # License: BSD-3-Clause
 # Copyright the MNE-Python contributors.
 
-from functools import reduce
+from functools import lru_cache, reduce
 from string import ascii_uppercase
 
 import numpy as np
@@ -237,8 +237,9 @@ def _get_contrast_indices(effect_idx, n_factors):  # noqa: D401
     return np.array([int(i) for i in binrepr], dtype=int)
 
 
-def _iter_contrasts(n_subjects, factor_levels, effect_picks):
-    """Set up contrasts."""
+@lru_cache(maxsize=32)
+def _get_contrasts(factor_levels, effect_picks):
+    """Get the contrast matrices of effects and their ranks (cached)."""
     sc = []
     n_factors = len(factor_levels)
     # prepare computation of Kronecker products
@@ -250,13 +251,22 @@ def _iter_contrasts(n_subjects, factor_levels, effect_picks):
         # main + interaction effects for contrasts
         sc.append([np.ones([n_levels, 1]), detrend(np.eye(n_levels), type="constant")])
 
+    contrasts = list()
     for this_effect in effect_picks:
         contrast_idx = _get_contrast_indices(this_effect + 1, n_factors)
         c_ = sc[0][contrast_idx[n_factors - 1]]
         for i_contrast in range(1, n_factors):
             this_contrast = contrast_idx[(n_factors - 1) - i_contrast]
             c_ = np.kron(c_, sc[i_contrast][this_contrast])
-        df1 = np.linalg.matrix_rank(c_)
+        c_.flags.writeable = False
+        contrasts.append((c_, np.linalg.matrix_rank(c_)))
+    return tuple(contrasts)
+
+
+def _iter_contrasts(n_subjects, factor_levels, effect_picks):
+    """Set up contrasts."""
+    factor_levels = tuple(int(n_levels) for n_levels in factor_levels)
+    for c_, df1 in _get_contrasts(factor_levels, tuple(effect_picks)):
         df2 = df1 * (n_subjects - 1)
         yield c_, df1, df2
 
@@ -323,7 +333,11 @@ def f_mway_rm(data, factor_levels, effects="all", correction=False, return_pvals
             subject k   2.45 7.90 3.09 4.76
 
         The last dimensions is thought to carry the observations
-        for mass univariate analysis.
+        for mass univariate analysis. Several last dimensions can be used,
+        e.g. to compute the statistics of many permutations of the data in a
+        single call with shape ``(n_subjects, n_conditions, n_permutations,
+        n_observations)``, which is much faster than one call per
+        permutation.
     factor_levels : list-like
         The number of levels per factor.
     effects : str | list
@@ -374,24 +388,32 @@ def f_mway_rm(data, factor_levels, effects="all", correction=False, return_pvals
     n_obs = data.shape[2]
     n_replications = data.shape[0]
 
-    # put last axis in front to 'iterate' over mass univariate instances.
-    data = np.rollaxis(data, 2)
+    contrasts = list(_iter_contrasts(n_replications, factor_levels, effect_picks))
+    # project the data on the contrasts of all effects at once, giving
+    # y_all of shape (n_columns, n_replications, n_obs)
+    y_all = np.tensordot(
+        np.concatenate([c_ for c_, _, _ in contrasts], axis=1), data, axes=([0], [1])
+    )
+    starts = np.cumsum([0] + [c_.shape[1] for c_, _, _ in contrasts])
+    # total and explained sums of squares of each effect
+    ss_total = np.add.reduceat(
+        np.einsum("ksn,ksn->kn", y_all, y_all), starts[:-1], axis=0
+    )
+    ss_effect = np.add.reduceat(
+        n_replications * np.mean(y_all, axis=1) ** 2, starts[:-1], axis=0
+    )
     fvalues, pvalues = [], []
-    for c_, df1, df2 in _iter_contrasts(n_replications, factor_levels, effect_picks):
-        y = np.dot(data, c_)
-        b = np.mean(y, axis=1)[:, np.newaxis, :]
-        ss = np.sum(np.sum(y * b, axis=2), axis=1)
-        mse = (np.sum(np.sum(y * y, axis=2), axis=1) - ss) / (df2 / df1)
+    for ei, (c_, df1, df2) in enumerate(contrasts):
+        ss = ss_effect[ei]
+        mse = (ss_total[ei] - ss) / (df2 / df1)
         fvals = ss / mse
         fvalues.append(fvals)
         if correction:
             # sample covariances, leave off "/ (y.shape[1] - 1)" norm because
-            # it falls out.
-            v = np.array([np.dot(y_.T, y_) for y_ in y])
-            v = np.array([np.trace(vv) for vv in v]) ** 2 / (
-                df1 * np.sum(np.sum(v * v, axis=2), axis=1)
-            )
-            eps = v
+            # it falls out. The trace of v is the total sum of squares.
+            y = y_all[starts[ei] : starts[ei + 1]]
+            v = np.einsum("isn,jsn->ijn", y, y)
+            eps = ss_total[ei] ** 2 / (df1 * np.einsum("ijn,ijn->n", v, v))
 
         df1, df2 = np.zeros(n_obs) + df1, np.zeros(n_obs) + df2
         if correction:
@@ -407,10 +429,12 @@ def f_mway_rm(data, factor_levels, effects="all", correction=False, return_pvals
         pvalues.append(pvals)
 
     # handle single effect returns
-    return [
-        np.squeeze(np.asarray([v.reshape(out_reshape) for v in vv]))
-        for vv in (fvalues, pvalues)
-    ]
+    fvalues = np.squeeze(np.asarray([v.reshape(out_reshape) for v in fvalues]))
+    if return_pvals:
+        pvalues = np.squeeze(np.asarray([v.reshape(out_reshape) for v in pvalues]))
+    else:
+        pvalues = np.empty(0)
+    return [fvalues, pvalues]
 
 
 def _parametric_ci(arr, ci=0.95):
@@ -9,15 +9,35 @@ from math import sqrt
 import numpy as np
 
 from ..parallel import parallel_func
-from ..utils import check_random_state, logger, verbose
+from ..utils import _BLOCK_BYTES, _check_option, check_random_state, logger, verbose
+from .cluster_level import _get_1samp_orders
 
+_PERM_BLOCK_SIZE = 1000
 
-def _max_stat(X, X2, perms, dof_scaling):
+
+def _iter_column_chunks(X, n_rows):
+    """Load the data of chunks of columns (e.g., from a memmap)."""
+    n_cols = max(int(_BLOCK_BYTES // (8 * n_rows)), 1)
+    for start in range(0, X.shape[1], n_cols):
+        sl = slice(start, start + n_cols)
+        yield sl, np.asarray(X[:, sl], dtype=float)
+
+
+def _max_stat(X, X2, orders, dof_scaling):
     """Aux function for permutation_t_test (for parallel comp)."""
     n_samples = len(X)
-    mus = np.dot(perms, X) / float(n_samples)
-    stds = np.sqrt(X2[None, :] - mus * mus) * dof_scaling  # std with splitting
-    max_abs = np.max(np.abs(mus) / (stds / sqrt(n_samples)), axis=1)  # t-max
+    max_abs = np.zeros(len(orders))
+    n_perms = min(len(orders), _PERM_BLOCK_SIZE)
+    # the data are loaded only once, blocks of permutations are applied to
+    # each chunk of columns
+    for sl, X_sl in _iter_column_chunks(X, max(n_perms, n_samples)):
+        for start in range(0, len(orders), n_perms):
+            perms = 2.0 * orders[start : start + n_perms] - 1  # 0, 1 -> 1, -1
+            mus = np.dot(perms, X_sl) / float(n_samples)
+            stds = np.sqrt(X2[None, sl] - mus * mus) * dof_scaling  # std w/splitting
+            this_max = np.max(np.abs(mus) / (stds / sqrt(n_samples)), axis=1)
+            this_abs = max_abs[start : start + n_perms]
+            np.maximum(this_abs, this_max, out=this_abs)  # t-max
     return max_abs
 
 
@@ -39,7 +59,8 @@ def permutation_t_test(
     Parameters
     ----------
     X : array, shape (n_samples, n_tests)
-        Samples (observations) by number of tests (variables).
+        Samples (observations) by number of tests (variables). Can be a
+        :class:`numpy.memmap`, which is then read in chunks of variables.
     n_permutations : int | 'all'
         Number of permutations. If n_permutations is 'all' all possible
         permutations are tested. It's the exact test, that
@@ -75,37 +96,47 @@ def permutation_t_test(
     ----------
     .. footbibliography::
     """
-    from .cluster_level import _get_1samp_orders
-
     n_samples, n_tests = X.shape
-    X2 = np.mean(X**2, axis=0)  # precompute moments
-    mu0 = np.mean(X, axis=0)
+    X2 = np.empty(n_tests)  # precompute moments
+    mu0 = np.empty(n_tests)
+    for sl, X_sl in _iter_column_chunks(X, n_samples):
+        X2[sl] = np.mean(X_sl**2, axis=0)
+        mu0[sl] = np.mean(X_sl, axis=0)
     dof_scaling = sqrt(n_samples / (n_samples - 1.0))
     std0 = np.sqrt(X2 - mu0**2) * dof_scaling  # get std with var splitting
-    T_obs = np.mean(X, axis=0) / (std0 / sqrt(n_samples))
+    T_obs = mu0 / (std0 / sqrt(n_samples))
     rng = check_random_state(seed)
     orders, _, extra = _get_1samp_orders(n_samples, n_permutations, tail, rng)
-    perms = 2 * np.array(orders) - 1  # from 0, 1 -> 1, -1
+    orders = np.array(orders, np.int8).reshape(-1, n_samples)
     logger.info(f"Permuting {len(orders)} times{extra}...")
-    parallel, my_max_stat, n_jobs = parallel_func(_max_stat, n_jobs)
+    # threads share the data, and BLAS releases the GIL
+    parallel, my_max_stat, n_jobs = parallel_func(_max_stat, n_jobs, prefer="threads")
     max_abs = np.concatenate(
         parallel(
-            my_max_stat(X, X2, p, dof_scaling) for p in np.array_split(perms, n_jobs)
+            my_max_stat(X, X2, o, dof_scaling) for o in np.array_split(orders, n_jobs)
         )
     )
     max_abs = np.concatenate((max_abs, [np.abs(T_obs).max()]))
     H0 = np.sort(max_abs)
+    # fraction of H0 >= each statistic
     if tail == 0:
-        p_values = (H0 >= np.abs(T_obs[:, np.newaxis])).mean(-1)
+        stat = np.abs(T_obs)
     elif tail == 1:
-        p_values = (H0 >= T_obs[:, np.newaxis]).mean(-1)
+        stat = T_obs
     elif tail == -1:
-        p_values = (-H0 <= T_obs[:, np.newaxis]).mean(-1)
+        stat = -T_obs
+    p_values = (len(H0) - np.searchsorted(H0, stat, side="left")) / len(H0)
     return T_obs, p_values, H0
 
 
 def bootstrap_confidence_interval(
-    arr, ci=0.95, n_bootstraps=2000, stat_fun="mean", random_state=None
+    arr,
+    ci=0.95,
+    n_bootstraps=2000,
+    stat_fun="mean",
+    random_state=None,
+    *,
+    resampling="multinomial",
 ):
     """Get confidence intervals from non-parametric bootstrap.
 
@@ -121,31 +152,69 @@ def bootstrap_confidence_interval(
         Can be "mean", "median", or a callable operating along ``axis=0``.
     random_state : int | float | array_like | None
         The seed at which to initialize the bootstrap.
+    resampling : ``'multinomial'`` | ``'poisson'``
+        How the samples are drawn in each bootstrap. ``'multinomial'``
+        (default) draws ``n_samples`` samples with replacement. ``'poisson'``
+        repeats each sample a number of times drawn independently from a
+        Poisson distribution with mean 1, so that the weights of the samples
+        do not depend on each other (e.g., for data arriving in chunks).
+        Bootstraps in which no sample is drawn are drawn again.
+
+        .. versionadded:: 1.11
 
     Returns
     -------
     cis : ndarray, shape (2, ...)
         Containing the lower boundary of the CI at ``cis[0, ...]`` and the
         upper boundary of the CI at ``cis[1, ...]``.
-    """
-    if stat_fun == "mean":
-
-        def stat_fun(x):
-            return x.mean(axis=0)
-
-    elif stat_fun == "median":
-
-        def stat_fun(x):
-            return np.median(x, axis=0)
 
+    Notes
+    -----
+    For ``stat_fun="mean"``, the means of all bootstraps are computed at
+    once as the product of the matrix of the number of times each sample is
+    drawn with the data, in chunks of features.
+    """
+    _check_option("resampling", resampling, ("multinomial", "poisson"))
+    if isinstance(stat_fun, str):
+        _check_option("stat_fun", stat_fun, ("mean", "median"))
     elif not callable(stat_fun):
         raise ValueError("stat_fun must be 'mean', 'median' or callable.")
     n_trials = arr.shape[0]
     indices = np.arange(n_trials, dtype=int)  # BCA would be cool to have too
     rng = check_random_state(random_state)
-    boot_indices = rng.choice(indices, replace=True, size=(n_bootstraps, len(indices)))
-    stat = np.array([stat_fun(arr[inds]) for inds in boot_indices])
+    if resampling == "multinomial":
+        boot_indices = rng.choice(
+            indices, replace=True, size=(n_bootstraps, len(indices))
+        )
+        # number of times each sample is drawn in each bootstrap
+        counts = np.zeros((n_bootstraps, n_trials))
+        np.add.at(counts, (np.arange(n_bootstraps)[:, np.newaxis], boot_indices), 1)
+    else:
+        counts = rng.poisson(1.0, size=(n_bootstraps, n_trials)).astype(float)
+        # redraw the bootstraps without any sample
+        empty = np.where(counts.sum(axis=1) == 0)[0]
+        while len(empty):
+            counts[empty] = rng.poisson(1.0, size=(len(empty), n_trials))
+            empty = empty[counts[empty].sum(axis=1) == 0]
+        boot_indices = [np.repeat(indices, count.astype(int)) for count in counts]
     ci = (((1 - ci) / 2) * 100, (1 - ((1 - ci) / 2)) * 100)
+    if stat_fun == "mean":
+        weights = counts / counts.sum(axis=1, keepdims=True)
+        data = arr.reshape(n_trials, -1)
+        cis = np.empty((2, data.shape[1]))
+        n_chunk = max(int(_BLOCK_BYTES // (8 * n_bootstraps)), 1)
+        for start in range(0, data.shape[1], n_chunk):
+            sl = slice(start, start + n_chunk)
+            # features x bootstraps, for a contiguous partition of each row
+            means = data[:, sl].T @ weights.T
+            cis[:, sl] = np.percentile(means, ci, axis=1)
+        return cis.reshape((2,) + arr.shape[1:])
+    if stat_fun == "median":
+
+        def stat_fun(x):
+            return np.median(x, axis=0)
+
+    stat = np.array([stat_fun(arr[inds]) for inds in boot_indices])
     ci_low, ci_up = np.percentile(stat, ci, axis=0)
     return np.array([ci_low, ci_up])
 
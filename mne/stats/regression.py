@@ -4,18 +4,31 @@
 
 from collections import namedtuple
 from inspect import isgenerator
+from itertools import chain
 
 import numpy as np
 from scipy import linalg, sparse, stats
+from scipy.sparse.linalg import LinearOperator, lsqr
 
 from .._fiff.pick import _picks_to_idx, pick_info, pick_types
 from ..epochs import BaseEpochs
 from ..evoked import Evoked, EvokedArray
+from ..parallel import parallel_func
 from ..source_estimate import SourceEstimate
-from ..utils import _reject_data_segments, fill_doc, logger, warn
+from ..utils import (
+    _BLOCK_BYTES,
+    _reject_data_segments,
+    _validate_type,
+    fill_doc,
+    logger,
+    warn,
+)
 
+# Relative tolerance of the iterative rERP solvers
+_RERP_TOL = 1e-10
 
-def linear_regression(inst, design_matrix, names=None):
+
+def linear_regression(inst, design_matrix, names=None, contrasts=None):
     """Fit Ordinary Least Squares (OLS) regression.
 
     Parameters
@@ -34,6 +47,13 @@ def linear_regression(inst, design_matrix, names=None):
         of columns present in design matrix (including the intercept, if
         present). Otherwise, the default names are ``'x0'``, ``'x1'``,
         ``'x2', …, 'x(n-1)'`` for ``n`` regressors.
+    contrasts : dict | None
+        Linear combinations of the regressors to test, as a dict mapping
+        contrast names to arrays of shape ``(n_regressors,)`` with the weight
+        of each regressor, e.g. ``dict(a_vs_b=[0, 1, -1])``. The results of
+        the contrasts are returned along with those of the regressors.
+
+        .. versionadded:: 1.11
 
     Returns
     -------
@@ -53,6 +73,13 @@ def linear_regression(inst, design_matrix, names=None):
         the original data was ``(n_observations, n_channels, n_timepoints)``,
         then the shape of each of the arrays will be
         ``(n_channels, n_timepoints)``.
+
+    Notes
+    -----
+    Epochs that are not preloaded and source estimates are processed in
+    chunks of observations, updating a QR decomposition of the design matrix
+    and the data. The memory used thus does not depend on the number of
+    observations.
     """
     if names is None:
         names = [f"x{i}" for i in range(design_matrix.shape[1])]
@@ -72,23 +99,32 @@ def linear_regression(inst, design_matrix, names=None):
         if [inst.ch_names[p] for p in picks] != inst.ch_names:
             warn("Fitting linear model to non-data or bad channels. Check picking")
         msg = "Fitting linear model to epochs"
-        data = inst.get_data(copy=False)
-        out = EvokedArray(np.zeros(data.shape[1:]), inst.info, inst.tmin)
+        out = EvokedArray(
+            np.zeros((len(inst.ch_names), len(inst.times))), inst.info, inst.tmin
+        )
+        if inst.preload:
+            data = inst.get_data(copy=False)
+        else:
+            data = iter(inst)
     elif isgenerator(inst):
         msg = "Fitting linear model to source estimates (generator input)"
         out = next(inst)
-        data = np.array([out.data] + [i.data for i in inst])
+        data = (stc.data for stc in chain([out], inst))
     elif isinstance(inst, list) and isinstance(inst[0], SourceEstimate):
         msg = "Fitting linear model to source estimates (list input)"
         out = inst[0]
-        data = np.array([i.data for i in inst])
+        data = (stc.data for stc in inst)
     else:
         raise ValueError("Input must be epochs or iterable of source estimates")
-    logger.info(msg + f", ({np.prod(data.shape[1:])} targets, {len(names)} regressors)")
-    lm_params = _fit_lm(data, design_matrix, names)
+    shape = out.data.shape
+    logger.info(msg + f", ({np.prod(shape)} targets, {len(names)} regressors)")
+    if isinstance(data, np.ndarray):
+        lm_params = _fit_lm(data, design_matrix, names, contrasts)
+    else:
+        lm_params = _fit_lm_chunks(data, shape, design_matrix, names, contrasts)
     lm = namedtuple("lm", "beta stderr t_val p_val mlog10_p_val")
     lm_fits = {}
-    for name in names:
+    for name in lm_params[0]:
         parameters = [p[name] for p in lm_params]
         for ii, value in enumerate(parameters):
             out_ = out.copy()
@@ -101,15 +137,13 @@ def linear_regression(inst, design_matrix, names=None):
     return lm_fits
 
 
-def _fit_lm(data, design_matrix, names):
-    """Aux function."""
-    n_samples = len(data)
-    n_features = np.prod(data.shape[1:])
+def _check_lm(n_samples, design_matrix, names, contrasts):
+    """Check the design and get the weights of the regressors and contrasts."""
     if design_matrix.ndim != 2:
         raise ValueError("Design matrix must be a 2d array")
     n_rows, n_predictors = design_matrix.shape
 
-    if n_samples != n_rows:
+    if n_samples is not None and n_samples != n_rows:
         raise ValueError(
             "Number of rows in design matrix must be equal to number of observations"
         )
@@ -118,18 +152,110 @@ def _fit_lm(data, design_matrix, names):
             "Number of regressor names must be equal to "
             "number of column in design matrix"
         )
+    weights = [np.eye(n_predictors)]
+    names = list(names)
+    _validate_type(contrasts, (dict, None), "contrasts")
+    for name, contrast in (contrasts or dict()).items():
+        contrast = np.asarray(contrast, float)
+        if contrast.shape != (n_predictors,):
+            raise ValueError(
+                f"contrasts[{repr(name)}] must have shape ({n_predictors},) (one "
+                f"weight per regressor), got {contrast.shape}"
+            )
+        if name in names:
+            raise ValueError(f"Contrast name {repr(name)} is already used")
+        weights.append(contrast[np.newaxis])
+        names.append(name)
+    return np.concatenate(weights), names
+
+
+def _fit_lm(data, design_matrix, names, contrasts=None):
+    """Aux function."""
+    n_samples = len(data)
+    n_features = np.prod(data.shape[1:])
+    weights, names = _check_lm(n_samples, design_matrix, names, contrasts)
 
     y = np.reshape(data, (n_samples, n_features))
     betas, resid_sum_squares, _, _ = linalg.lstsq(a=design_matrix, b=y)
+    design_invcov = linalg.inv(np.dot(design_matrix.T, design_matrix))
+    return _lm_stats(
+        betas,
+        resid_sum_squares,
+        design_matrix,
+        design_invcov,
+        weights,
+        names,
+        data.shape[1:],
+    )
+
+
+def _fit_lm_chunks(chunks, shape, design_matrix, names, contrasts=None):
+    """Fit the linear model to data coming in chunks of observations."""
+    weights, names = _check_lm(None, design_matrix, names, contrasts)
+    n_features = int(np.prod(shape))
+    n_chunk = max(int(_BLOCK_BYTES // (8 * n_features)), 1)
+    n_rows, n_predictors = design_matrix.shape
+    # Update the QR decomposition of the design matrix with a few rows at a
+    # time, rotating the data along with it: the rows beyond the R factor are
+    # residuals, so the residual sum of squares is computed without the
+    # cancellation of the normal equations (e.g., for data with a large mean)
+    design_r = np.zeros((0, n_predictors))
+    rot_y = np.zeros((0, n_features))
+    resid_sum_squares = np.zeros(n_features)
+    n_samples = 0
+    for y in _iter_chunks(chunks, n_chunk):
+        y = y.reshape(len(y), n_features)
+        x = design_matrix[n_samples : n_samples + len(y)]
+        n_samples += len(y)
+        if n_samples > n_rows:
+            break
+        for start in range(0, len(y), n_predictors):
+            stop = start + n_predictors
+            q, r = np.linalg.qr(np.vstack([design_r, x[start:stop]]), "complete")
+            rot_y = q.T @ np.vstack([rot_y, y[start:stop]])
+            design_r = r[:n_predictors]
+            resid_sum_squares += np.einsum(
+                "ij,ij->j", rot_y[n_predictors:], rot_y[n_predictors:]
+            )
+            rot_y = rot_y[:n_predictors]
+    if n_samples != n_rows:
+        raise ValueError(
+            "Number of rows in design matrix must be equal to number of observations"
+        )
+    betas = linalg.solve_triangular(design_r, rot_y)
+    design_invcov = linalg.inv(design_matrix.T @ design_matrix)
+    return _lm_stats(
+        betas, resid_sum_squares, design_matrix, design_invcov, weights, names, shape
+    )
+
+
+def _iter_chunks(data, n_chunk):
+    """Stack the observations of an iterable in chunks."""
+    chunk = list()
+    for d in data:
+        chunk.append(d)
+        if len(chunk) == n_chunk:
+            yield np.array(chunk)
+            chunk = list()
+    if len(chunk):
+        yield np.array(chunk)
+
 
+def _lm_stats(
+    betas, resid_sum_squares, design_matrix, design_invcov, weights, names, shape
+):
+    """Compute the statistics of the regressors and contrasts."""
+    n_rows, n_predictors = design_matrix.shape
     df = n_rows - n_predictors
-    sqrt_noise_var = np.sqrt(resid_sum_squares / df).reshape(data.shape[1:])
-    design_invcov = linalg.inv(np.dot(design_matrix.T, design_matrix))
-    unscaled_stderrs = np.sqrt(np.diag(design_invcov))
+    sqrt_noise_var = np.sqrt(resid_sum_squares / df).reshape(shape)
+    betas = weights @ betas
+    unscaled_stderrs = np.sqrt(
+        np.einsum("ij,jk,ik->i", weights, design_invcov, weights)
+    )
     tiny = np.finfo(np.float64).tiny
     beta, stderr, t_val, p_val, mlog10_p_val = (dict() for _ in range(5))
     for x, unscaled_stderr, predictor in zip(betas, unscaled_stderrs, names):
-        beta[predictor] = x.reshape(data.shape[1:])
+        beta[predictor] = x.reshape(shape)
         stderr[predictor] = sqrt_noise_var * unscaled_stderr
         p_val[predictor] = np.empty_like(stderr[predictor])
         t_val[predictor] = np.empty_like(stderr[predictor])
@@ -168,6 +294,9 @@ def linear_regression_raw(
     decim=1,
     picks=None,
     solver="cholesky",
+    *,
+    alpha=0.0,
+    n_jobs=None,
 ):
     """Estimate regression-based evoked potentials/fields by linear modeling.
 
@@ -243,8 +372,36 @@ def linear_regression_raw(
         matrix b; or a string.
         X is of shape (n_times, n_predictors * time_window_length).
         y is of shape (n_channels, n_times).
-        If str, must be ``'cholesky'``, in which case the solver used is
-        ``linalg.solve(dot(X.T, X), dot(X.T, y))``.
+        If str, must be one of:
+
+        ``'cholesky'``
+            The solver used is ``linalg.solve(dot(X.T, X), dot(X.T, y))``,
+            with ``dot(X.T, X)`` stored as a dense matrix.
+        ``'cg'``
+            Conjugate gradient on the normal equations, for blocks of
+            channels at once.
+        ``'lsqr'``
+            :func:`scipy.sparse.linalg.lsqr` on ``X``, for each channel.
+            Slower than ``'cg'``, but more accurate for ill-conditioned
+            predictors (e.g., strongly overlapping events).
+
+        The iterative solvers ``'cg'`` and ``'lsqr'`` only use products with
+        the sparse ``X``, and are preconditioned with the blocks of
+        ``dot(X.T, X)`` of each condition, so that their memory use does not
+        scale with ``n_times * n_predictors``.
+
+        .. versionchanged:: 1.11
+           Added the ``'cg'`` and ``'lsqr'`` solvers.
+    alpha : float
+        The ridge (L2) regularization of the coefficients used by the
+        built-in solvers, i.e. ``dot(X.T, X) + alpha * I`` is inverted. Note
+        that the scale of ``alpha`` depends on the number of events.
+
+        .. versionadded:: 1.11
+    %(n_jobs)s
+        Blocks of channels are solved in parallel by the iterative solvers.
+
+        .. versionadded:: 1.11
 
     Returns
     -------
@@ -258,19 +415,9 @@ def linear_regression_raw(
     .. footbibliography::
     """
     if isinstance(solver, str):
-        if solver not in {"cholesky"}:
+        if solver not in {"cholesky", "cg", "lsqr"}:
             raise ValueError(f"No such solver: {solver}")
-        if solver == "cholesky":
-
-            def solver(X, y):
-                a = (X.T * X).toarray()  # dot product of sparse matrices
-                return linalg.solve(
-                    a, X.T * y, assume_a="pos", overwrite_a=True, overwrite_b=True
-                ).T
-
-    elif callable(solver):
-        pass
-    else:
+    elif not callable(solver):
         raise TypeError("The solver must be a str or a callable.")
 
     # build data
@@ -292,6 +439,9 @@ def linear_regression_raw(
 
     # remove "empty" and contaminated data points
     X, data = _clean_rerp_input(X, data, reject, flat, decim, info, tstep)
+    if isinstance(solver, str):
+        n_lags = [tmax_s[cond] - tmin_s[cond] for cond in conds]
+        solver = _get_rerp_solver(solver, n_lags, alpha, n_jobs)
 
     # solve linear system
     coefs = solver(X, data.T)
@@ -309,6 +459,106 @@ def linear_regression_raw(
     return evokeds
 
 
+def _get_rerp_solver(solver, n_lags, alpha, n_jobs):
+    """Get a built-in solver of the rERP linear system."""
+    alpha = float(alpha)
+    if solver == "cholesky":
+
+        def solver(X, y):
+            a = (X.T * X).toarray()  # dot product of sparse matrices
+            a.flat[:: len(a) + 1] += alpha
+            return linalg.solve(
+                a, X.T * y, assume_a="pos", overwrite_a=True, overwrite_b=True
+            ).T
+
+        return solver
+
+    fun = _rerp_cg if solver == "cg" else _rerp_lsqr
+
+    def solver(X, y):
+        X = sparse.csr_array(X)
+        precond = _rerp_preconditioner(X, n_lags, alpha)
+        parallel, p_fun, n_jobs_ = parallel_func(fun, n_jobs, prefer="threads")
+        blocks = np.array_split(np.arange(y.shape[1]), n_jobs_)
+        coefs = parallel(
+            p_fun(X, y[:, block], alpha, precond) for block in blocks if len(block)
+        )
+        return np.concatenate(coefs, axis=1).T
+
+    return solver
+
+
+def _rerp_preconditioner(X, n_lags, alpha):
+    """Get the square roots of the pseudo-inverses of the condition blocks."""
+    sqrt_invs = list()
+    starts = np.concatenate([[0], np.cumsum(n_lags)])
+    for start, stop in zip(starts[:-1], starts[1:]):
+        X_cond = X[:, start:stop]
+        block = (X_cond.T @ X_cond).toarray()
+        block.flat[:: len(block) + 1] += alpha
+        eigvals, eigvecs = linalg.eigh(block)
+        mask = eigvals > eigvals[-1] * len(block) * np.finfo(float).eps
+        eigvecs = eigvecs[:, mask]
+        sqrt_invs.append((eigvecs / np.sqrt(eigvals[mask])) @ eigvecs.T)
+    return sparse.block_diag(sqrt_invs, format="csr")
+
+
+def _rerp_cg(X, y, alpha, precond):
+    """Solve the normal equations with preconditioned conjugate gradient.
+
+    All columns of ``y`` are solved at once, with their own step sizes.
+    """
+    precond = precond @ precond
+    rhs = X.T @ y
+    norms = np.linalg.norm(rhs, axis=0)
+    norms[norms == 0] = 1.0
+    coefs = np.zeros_like(rhs)
+    resid = rhs.copy()
+    direction = precond @ resid
+    rz = np.einsum("ij,ij->j", resid, direction)
+    for _ in range(2 * X.shape[1]):
+        product = X.T @ (X @ direction) + alpha * direction
+        denom = np.einsum("ij,ij->j", direction, product)
+        step = np.divide(rz, denom, out=np.zeros_like(rz), where=denom > 0)
+        coefs += step * direction
+        resid -= step * product
+        if (np.linalg.norm(resid, axis=0) < _RERP_TOL * norms).all():
+            break
+        z = precond @ resid
+        rz_new = np.einsum("ij,ij->j", resid, z)
+        ratio = np.divide(rz_new, rz, out=np.zeros_like(rz), where=rz > 0)
+        direction = z + ratio * direction
+        rz = rz_new
+    else:
+        warn("The conjugate gradient solver did not converge")
+    return coefs
+
+
+def _rerp_lsqr(X, y, alpha, precond):
+    """Solve the least squares problems with right-preconditioned LSQR."""
+    n_times, n_preds = X.shape
+    sqrt_alpha = np.sqrt(alpha)
+
+    def matvec(z):
+        z = precond @ z
+        return np.concatenate([X @ z, sqrt_alpha * z])
+
+    def rmatvec(u):
+        return precond @ (X.T @ u[:n_times] + sqrt_alpha * u[n_times:])
+
+    op = LinearOperator(
+        (n_times + n_preds, n_preds), matvec=matvec, rmatvec=rmatvec, dtype=float
+    )
+    coefs = np.zeros((n_preds, y.shape[1]))
+    for ci in range(y.shape[1]):
+        rhs = np.concatenate([y[:, ci], np.zeros(n_preds)])
+        out = lsqr(op, rhs, atol=_RERP_TOL, btol=_RERP_TOL, iter_lim=2 * n_preds)
+        if out[1] == 7:
+            warn("The LSQR solver did not converge")
+        coefs[:, ci] = precond @ out[0]
+    return coefs
+
+
 def _prepare_rerp_data(raw, events, picks=None, decim=1):
     """Prepare events and data, primarily for `linear_regression_raw`."""
     picks = _picks_to_idx(raw.info, picks)
@@ -19,6 +19,11 @@ from mne import MixedSourceEstimate, SourceEstimate, SourceSpaces, VolSourceEsti
 from mne.fixes import _eye_array
 from mne.stats import combine_adjacency, ttest_ind_no_p
 from mne.stats.cluster_level import (
+    _find_clusters,
+    _get_batch_stat_fun,
+    _get_partitions_from_adjacency,
+    _iter_batch_stats,
+    _setup_adjacency,
     f_oneway,
     permutation_cluster_1samp_test,
     permutation_cluster_test,
@@ -332,6 +337,81 @@ def test_cluster_permutation_t_test(numba_conditional, stat_fun):
             )
 
 
+@pytest.mark.parametrize(
+    "stat_fun, n_groups",
+    [
+        (ttest_1samp_no_p, 1),
+        (partial(ttest_1samp_no_p, sigma=1e-1), 1),
+        (partial(ttest_1samp_no_p, sigma=1e-1, method="absolute"), 1),
+        (ttest_ind_no_p, 2),
+        (partial(ttest_ind_no_p, equal_var=False, sigma=1e-1), 2),
+        (f_oneway, 2),
+        (f_oneway, 3),
+    ],
+)
+def test_batch_stat_fun(stat_fun, n_groups):
+    """Test computing built-in statistics for blocks of permutations."""
+    rng = np.random.RandomState(0)
+    assert _get_batch_stat_fun(lambda *args: args[0][0], n_groups) is None
+    batch_fun = _get_batch_stat_fun(stat_fun, n_groups)
+    cases = [(rng.randn(25, 40) + 0.3, 1e-10)]
+    if n_groups == 1:
+        # a large mean relative to the spread of the data must not cancel the
+        # variances of the sign flips
+        cases.append((1e3 + 1e-6 * rng.randn(25, 40), 1e-6))
+    for X, rtol in cases:
+        if n_groups == 1:
+            orders = rng.randint(0, 2, (30, len(X)))
+            orders[:2] = [[1], [0]]  # include the unflipped data
+            want = [stat_fun(X * (2 * order[:, np.newaxis] - 1)) for order in orders]
+            got = list(_iter_batch_stats(batch_fun, X, orders))
+        else:
+            splits = np.linspace(0, len(X), n_groups + 1).astype(int)
+            slices = [
+                slice(start, stop) for start, stop in zip(splits[:-1], splits[1:])
+            ]
+            orders = [rng.permutation(len(X)) for _ in range(30)]
+            want = [stat_fun(*[X[order[sl]] for sl in slices]) for order in orders]
+            got = list(_iter_batch_stats(batch_fun, X, orders, slices))
+        assert np.isfinite(got).all()
+        assert_allclose(got, want, rtol=rtol, atol=1e-12)
+
+
+def test_permutation_checkpoint(tmp_path, monkeypatch):
+    """Test resuming permutations from checkpoints."""
+    from mne.stats import cluster_level
+
+    monkeypatch.setattr(cluster_level, "_CHECKPOINT_BLOCK_SIZE", 10)
+    condition1, condition2 = _get_conditions()[:2]
+    kwargs = dict(n_permutations=95, seed=0, tail=1, out_type="mask", step_down_p=0.05)
+    _, _, want_pv, want_H0 = permutation_cluster_test(
+        [condition1, condition2], **kwargs
+    )
+    _, _, pv, H0 = permutation_cluster_test(
+        [condition1, condition2], checkpoint_dir=tmp_path, **kwargs
+    )
+    assert_array_equal(H0, want_H0)
+    assert_array_equal(pv, want_pv)
+    fnames = sorted(tmp_path.glob("perm_*.npy"))
+    assert len(fnames) % 10 == 0  # one set of blocks per step-down iteration
+    # resume after losing some blocks, reusing the others
+    for fname in fnames[::3]:
+        fname.unlink()
+    np.save(fnames[1], np.full(10, 1e6))
+    _, _, _, H0 = permutation_cluster_test(
+        [condition1, condition2], checkpoint_dir=tmp_path, **kwargs
+    )
+    assert len(list(tmp_path.glob("perm_*.npy"))) == len(fnames)
+    assert np.sum(H0 == 1e6) == 10
+    # a different test does not use the same blocks
+    _, _, _, H0 = permutation_cluster_1samp_test(
+        condition1, checkpoint_dir=tmp_path, n_permutations=50, seed=0
+    )
+    assert len(list(tmp_path.glob("perm_*.npy"))) == len(fnames) + 5
+    with pytest.raises(FileNotFoundError, match="checkpoint_dir"):
+        permutation_cluster_1samp_test(condition1, checkpoint_dir=tmp_path / "foo")
+
+
 def test_cluster_permutation_with_adjacency(numba_conditional, monkeypatch):
     """Test cluster level permutations with adjacency matrix."""
     pytest.importorskip("sklearn")
@@ -567,6 +647,64 @@ def test_permutation_cluster_signs(threshold, kind):
     assert_array_equal(clu_signs, want_signs)
 
 
+@pytest.mark.parametrize("max_step", (1, 2))
+def test_spatio_temporal_components(max_step):
+    """Test spatio-temporal clustering against the full adjacency graph."""
+    rng = np.random.RandomState(0)
+    n_src, n_times = 30, 20
+    spatial = sparse.random(n_src, n_src, density=0.1, random_state=rng)
+    spatial = ((spatial + spatial.T) > 0).astype(float)
+    neighbors = [spatial[[ii]].indices for ii in range(n_src)]
+    temporal = sparse.diags(
+        np.ones((2 * max_step, n_times)),
+        [step for step in range(-max_step, max_step + 1) if step],
+        shape=(n_times, n_times),
+    )
+    full = sparse.kron(sparse.eye(n_times), spatial) + sparse.kron(
+        temporal, sparse.eye(n_src)
+    )
+    full = sparse.coo_array(full)
+    for _ in range(5):
+        x = np.convolve(rng.randn(n_src * n_times), np.ones(5), "same")
+        clusters, sums = _find_clusters(x, 1.5, 0, neighbors, max_step=max_step)
+        want_clusters, want_sums = _find_clusters(x, 1.5, 0, full)
+        assert len(clusters) == len(want_clusters) > 1
+        for cluster, want in zip(clusters, want_clusters):
+            assert_array_equal(cluster, want)
+        assert_allclose(sums, want_sums)
+        out = _find_clusters(x, 1.5, 0, neighbors, max_step, return_clusters=False)
+        assert out[0] is None
+        assert_allclose(out[1], sums)
+
+
+def test_spatio_temporal_adjacency():
+    """Test the implicit spatio-temporal adjacency."""
+    rng = np.random.RandomState(0)
+    n_src, n_times = 30, 20
+    spatial = sparse.random(n_src, n_src, density=0.1, random_state=rng)
+    spatial = ((spatial + spatial.T) > 0).astype(float).tolil()
+    spatial[:10, 10:] = spatial[10:, :10] = 0  # two disjoint sets
+    spatial = sparse.csr_array(spatial)
+    full = combine_adjacency(n_times, spatial)
+    n_tests = n_src * n_times
+    adjacency = _setup_adjacency(spatial, n_tests, n_times)
+    assert not sparse.issparse(adjacency)
+    assert adjacency.shape == full.shape
+    assert_array_equal(adjacency.spatial.toarray(), spatial.toarray() > 0)
+    partitions = _get_partitions_from_adjacency(adjacency, n_times)
+    want = _get_partitions_from_adjacency(_setup_adjacency(full, n_tests, n_times), 1)
+    assert len(np.unique(partitions)) > 1
+    assert_array_equal(partitions, want)
+    x = np.convolve(rng.randn(n_tests), np.ones(5), "same")
+    for kwargs in (dict(), dict(partitions=partitions)):
+        clusters, sums = _find_clusters(x, 1.5, 0, adjacency, **kwargs)
+        want_clusters, want_sums = _find_clusters(x, 1.5, 0, full, **kwargs)
+        assert len(clusters) == len(want_clusters) > 1
+        for cluster, want in zip(clusters, want_clusters):
+            assert_array_equal(cluster, want)
+        assert_allclose(sums, want_sums)
+
+
 def test_permutation_adjacency_equiv(numba_conditional):
     """Test cluster level permutations with and without adjacency."""
     pytest.importorskip("sklearn")
@@ -817,6 +955,44 @@ def test_tfce_thresholds(numba_conditional):
     permutation_cluster_1samp_test(X=data[..., 0], threshold=dict(start=0, step=0.2))
 
 
+@pytest.mark.parametrize(
+    "tail, threshold",
+    [
+        (0, dict(start=0, step=0.2)),
+        (1, dict(start=0.5, step=0.1, h_power=1.5, e_power=0.7)),
+        (-1, dict(start=0, step=-0.3)),
+    ],
+)
+def test_tfce_incremental(tail, threshold, monkeypatch):
+    """Test that incremental TFCE matches TFCE computed at each threshold."""
+    pytest.importorskip("numba")
+    from mne.stats import cluster_level
+
+    rng = np.random.RandomState(0)
+    n_src, n_times = 30, 20
+    spatial = sparse.random(n_src, n_src, density=0.1, random_state=rng)
+    spatial = ((spatial + spatial.T) > 0).astype(float)
+    neighbors = [spatial[[ii]].indices for ii in range(n_src)]
+    full = sparse.coo_array(combine_adjacency(n_times, spatial))
+    x = np.convolve(rng.randn(n_src * n_times), np.ones(5), "same")
+    include = rng.rand(x.size) > 0.1
+    for adjacency, x_use, max_step in (
+        (neighbors, x, 2),
+        (full, x, 1),
+        (False, x, 1),
+        (None, x.reshape(n_times, n_src), 1),
+    ):
+        kwargs = dict(
+            adjacency=adjacency, max_step=max_step, include=include.reshape(x_use.shape)
+        )
+        _, scores = _find_clusters(x_use, threshold, tail, **kwargs)
+        monkeypatch.setattr(cluster_level, "has_numba", False)
+        _, want = _find_clusters(x_use, threshold, tail, **kwargs)
+        monkeypatch.undo()
+        assert_allclose(scores, want, rtol=1e-10, atol=1e-12)
+        assert (scores > 0).sum() > 10
+
+
 # 1D gives slices, 2D+ gives boolean masks
 @pytest.mark.parametrize("shape", ((11,), (11, 3), (11, 1, 2)))
 @pytest.mark.parametrize("out_type", ("mask", "indices"))
@@ -128,6 +128,25 @@ def test_f_twoway_rm():
     assert_array_almost_equal(fvals, test_external["r_fvals_1way"], 5)
 
 
+@pytest.mark.parametrize("factor_levels", ([2, 3], [2, 2, 2]))
+def test_f_mway_rm_stacked(factor_levels):
+    """Test the repeated measures ANOVA of stacked permutations."""
+    rng = np.random.RandomState(0)
+    data = rng.randn(10, np.prod(factor_levels), 5, 20)
+    for correction in (False, True):
+        fvals, pvals = f_mway_rm(data, factor_levels, correction=correction)
+        assert fvals.shape == pvals.shape == (2 ** len(factor_levels) - 1, 5, 20)
+        for pi in range(data.shape[2]):
+            want_f, want_p = f_mway_rm(
+                data[:, :, pi], factor_levels, correction=correction
+            )
+            assert_allclose(fvals[:, pi], want_f, rtol=1e-10)
+            assert_allclose(pvals[:, pi], want_p, rtol=1e-10)
+    fvals_, pvals = f_mway_rm(data, factor_levels, return_pvals=False)
+    assert_allclose(fvals_, fvals)
+    assert pvals.size == 0
+
+
 @pytest.mark.parametrize(
     "kind, kwargs",
     [
@@ -80,6 +80,22 @@ def test_permutation_t_test_tail(tail_name, tail_code):
     assert_allclose(p_values[0], p_values_scipy, rtol=1e-2)
 
 
+def test_permutation_t_test_chunks(tmp_path, monkeypatch):
+    """Test permutation t-test on chunks of permutations and variables."""
+    from mne.stats import permutations
+
+    rng = np.random.RandomState(0)
+    X = rng.randn(10, 30) + 0.5
+    want = permutation_t_test(X, 200, seed=0)
+    X_mmap = np.lib.format.open_memmap(tmp_path / "X.npy", "w+", float, X.shape)
+    X_mmap[:] = X
+    monkeypatch.setattr(permutations, "_BLOCK_BYTES", 8 * 20 * 7)
+    monkeypatch.setattr(permutations, "_PERM_BLOCK_SIZE", 20)
+    got = permutation_t_test(X_mmap, 200, seed=0, n_jobs=2)
+    for g, w in zip(got, want):
+        assert_array_equal(g, w)
+
+
 def test_ci():
     """Test confidence intervals."""
     # isolated test of CI functions
@@ -92,3 +108,35 @@ def test_ci():
         bootstrap_confidence_interval(arr, stat_fun="mean", random_state=0),
         rtol=0.1,
     )
+
+
+def test_bootstrap_mean(monkeypatch):
+    """Test the bootstrap of the mean against resampling the data."""
+    from mne.stats import permutations
+
+    rng = np.random.RandomState(0)
+    arr = rng.randn(20, 3, 4)
+    monkeypatch.setattr(permutations, "_BLOCK_BYTES", 8 * 100 * 5)
+    for resampling in ("multinomial", "poisson"):
+        kwargs = dict(n_bootstraps=100, random_state=0, resampling=resampling)
+        cis = bootstrap_confidence_interval(arr, **kwargs)
+        want = bootstrap_confidence_interval(
+            arr, stat_fun=lambda x: x.mean(0), **kwargs
+        )
+        assert cis.shape == (2, 3, 4)
+        assert_allclose(cis, want, rtol=1e-12)
+        assert (cis[0] < cis[1]).all()
+    with pytest.raises(ValueError, match="Invalid value for the 'resampling'"):
+        bootstrap_confidence_interval(arr, resampling="foo")
+
+
+@pytest.mark.parametrize("stat_fun", ["mean", "median", lambda x: x.max(0)])
+def test_bootstrap_poisson_small(stat_fun):
+    """Test Poisson bootstraps of few samples, some of which draw none."""
+    arr = np.arange(3.0)[:, np.newaxis] + 10
+    cis = bootstrap_confidence_interval(
+        arr, stat_fun=stat_fun, random_state=0, resampling="poisson"
+    )
+    assert cis.shape == (2, 1)
+    assert (cis >= 10).all()
+    assert (cis <= 12).all()
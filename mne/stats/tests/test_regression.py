@@ -5,6 +5,7 @@
 import numpy as np
 import pytest
 from numpy.testing import assert_allclose, assert_array_equal, assert_equal
+from scipy import linalg
 from scipy.signal.windows import hann
 
 import mne
@@ -76,6 +77,72 @@ def test_regression():
     linear_regression(epochs.copy().pick("eeg"), design_matrix)
 
 
+def test_regression_streaming(tmp_path, monkeypatch):
+    """Test OLS regression on data that are not preloaded, with contrasts."""
+    from mne.stats import regression
+
+    rng = np.random.RandomState(0)
+    n_epochs, n_times = 40, 50
+    info = mne.create_info(3, 100.0, "eeg")
+    data = rng.randn(3, n_epochs * n_times) * 1e-6
+    raw = RawArray(data, info)
+    fname = tmp_path / "test_raw.fif"
+    raw.save(fname)
+    raw = mne.io.read_raw_fif(fname)
+    events = np.array(
+        [np.arange(n_epochs) * n_times, np.zeros(n_epochs), np.ones(n_epochs)], int
+    ).T
+    epochs = mne.Epochs(raw, events, tmin=0, tmax=(n_times - 1) / 100.0, baseline=None)
+    design_matrix = np.c_[np.ones(n_epochs), rng.randn(n_epochs), rng.randn(n_epochs)]
+    contrasts = dict(diff=[0, 1, -1])
+    monkeypatch.setattr(regression, "_BLOCK_BYTES", 8 * 3 * n_times * 7)
+    lm = linear_regression(epochs, design_matrix, contrasts=contrasts)
+    assert list(lm) == ["x0", "x1", "x2", "diff"]
+    want = linear_regression(epochs.load_data(), design_matrix, contrasts=contrasts)
+    for name in lm:
+        for value, want_value in zip(lm[name], want[name]):
+            assert_allclose(value.data, want_value.data, rtol=1e-7)
+    assert_allclose(lm["diff"].beta.data, lm["x1"].beta.data - lm["x2"].beta.data)
+    # t value of the contrast, from the covariance of the betas
+    y = epochs.get_data().reshape(n_epochs, -1)
+    resid = y - design_matrix @ linalg.lstsq(design_matrix, y)[0]
+    noise_var = (resid**2).sum(0) / (n_epochs - 3)
+    c = np.array(contrasts["diff"], float)
+    var = c @ linalg.inv(design_matrix.T @ design_matrix) @ c * noise_var
+    assert_allclose(
+        lm["diff"].t_val.data.ravel(), want["diff"].beta.data.ravel() / np.sqrt(var)
+    )
+    with pytest.raises(ValueError, match="must have shape"):
+        linear_regression(epochs, design_matrix, contrasts=dict(diff=[1, -1]))
+    with pytest.raises(ValueError, match="already used"):
+        linear_regression(epochs, design_matrix, contrasts=dict(x1=[1, -1, 0]))
+    with pytest.raises(ValueError, match="Number of rows"):
+        linear_regression((lm["x0"].beta for _ in range(2)), design_matrix)
+
+
+@pytest.mark.parametrize("offset", [0.0, 1e4, 1e5])
+def test_regression_offset(offset):
+    """Test OLS regression on source estimates with a large mean."""
+    rng = np.random.default_rng(0)
+    n_stcs = 50
+    vertices = [np.arange(3), np.arange(2)]
+    data = offset + 1e-3 * rng.standard_normal((n_stcs, 5, 4))
+    stcs = [mne.SourceEstimate(d, vertices, 0, 0.001) for d in data]
+    design_matrix = np.c_[np.ones(n_stcs), rng.standard_normal(n_stcs)]
+    y = data.reshape(n_stcs, -1)
+    betas, resid_sum_squares = linalg.lstsq(design_matrix, y)[:2]
+    noise_var = resid_sum_squares / (n_stcs - 2)
+    stderrs = np.sqrt(np.diag(linalg.inv(design_matrix.T @ design_matrix)))
+    for lm in (
+        linear_regression(stcs, design_matrix),
+        linear_regression((stc for stc in stcs), design_matrix),
+    ):
+        for beta, stderr, name in zip(betas, stderrs, ["x0", "x1"]):
+            t_val = beta / (stderr * np.sqrt(noise_var))
+            assert_allclose(lm[name].beta.data.ravel(), beta, rtol=1e-6, atol=1e-9)
+            assert_allclose(lm[name].t_val.data.ravel(), t_val, rtol=1e-6)
+
+
 @testing.requires_testing_data
 def test_continuous_regression_no_overlap():
     """Test regression without overlap correction, on real data."""
@@ -155,3 +222,28 @@ def test_continuous_regression_with_overlap():
     pytest.raises(ValueError, linear_regression_raw, raw, events, solver=solT)
     pytest.raises(ValueError, linear_regression_raw, raw, events, solver="err")
     pytest.raises(TypeError, linear_regression_raw, raw, events, solver=0)
+
+
+@pytest.mark.parametrize("solver", ("cg", "lsqr"))
+@pytest.mark.parametrize("alpha", (0.0, 10.0))
+def test_continuous_regression_iterative(solver, alpha):
+    """Test the iterative rERP solvers against the direct one."""
+    rng = np.random.RandomState(0)
+    sfreq, n_times = 100.0, 20000
+    onsets = np.sort(rng.choice(np.arange(100, n_times - 100), 300, replace=False))
+    events = np.c_[onsets, np.zeros_like(onsets), rng.randint(1, 3, len(onsets))]
+    data = np.zeros((3, n_times))
+    for ii, effect in enumerate((hann(51), -hann(31))):
+        for onset in onsets[events[:, 2] == ii + 1]:
+            data[:, onset : onset + len(effect)] += effect * [[1], [2], [3]]
+    data += 0.1 * rng.randn(*data.shape)
+    raw = RawArray(data, mne.create_info(3, sfreq, "eeg"))
+    kwargs = dict(event_id=dict(a=1, b=2), tmin=-0.1, tmax=dict(a=0.6, b=0.4))
+    want = linear_regression_raw(raw, events, alpha=alpha, **kwargs)
+    got = linear_regression_raw(
+        raw, events, solver=solver, alpha=alpha, n_jobs=2, **kwargs
+    )
+    for cond in want:
+        assert_allclose(got[cond].data, want[cond].data, rtol=1e-6, atol=1e-8)
+    if alpha == 0:
+        assert_allclose(want["a"].data[0, 10:61], hann(51), atol=0.05)
@@ -9,6 +9,7 @@ import pytest
 from numpy.testing import assert_allclose, assert_array_equal, assert_array_less
 from scipy.sparse import csr_array
 from scipy.sparse import eye as speye
+from scipy.sparse import random as sparse_random
 from scipy.spatial.distance import cdist
 
 import mne
@@ -35,7 +36,9 @@ from mne._freesurfer import _get_atlas_values, _get_mri_info_data
 from mne.datasets import testing
 from mne.fixes import _get_img_fdata
 from mne.minimum_norm import apply_inverse, make_inverse_operator, read_inverse_operator
+from mne.morph import _compute_morph_matrix, _morph_cache
 from mne.source_space._source_space import _add_interpolator, _grid_interp
+from mne.surface import _get_ico_surface, write_surface
 from mne.transforms import quat_to_rot
 from mne.utils import _record_warnings, catch_logging
 
@@ -136,6 +139,109 @@ def test_sparse_morph():
     assert_allclose(stc_fs.data, stc_fs_return.data[np.concatenate(orders)])
 
 
+@pytest.mark.parametrize("vector", (False, True))
+def test_apply_many(vector, monkeypatch):
+    """Test morphing many source estimates with one sparse product per block."""
+    rng = np.random.default_rng(0)
+    vertices_from = [np.arange(0, 20, 2), np.arange(1, 16)]
+    vertices_to = [np.arange(12), np.arange(8)]
+    morph_mat = sparse_random(20, 25, density=0.2, random_state=0, format="csr")
+    morph = SourceMorph(
+        "sample",
+        "fsaverage",
+        "surface",
+        *(None,) * 6,
+        morph_mat,
+        vertices_to,
+        *(None,) * 4,
+        dict(vertices_from=vertices_from),
+        None,
+    )
+    klass = VectorSourceEstimate if vector else SourceEstimate
+    stcs = list()
+    for n_times in (1, 5, 3, 7):
+        shape = (25, 3, n_times) if vector else (25, n_times)
+        stcs.append(klass(rng.standard_normal(shape), vertices_from, 0.1, 0.01))
+    monkeypatch.setattr(mne.morph, "_MORPH_BLOCK_BYTES", 4000 * (3 if vector else 1))
+    with catch_logging() as log:
+        stcs_to = morph.apply_many(iter(stcs), n_jobs=2, verbose=True)
+    assert "4 source estimates in 2 blocks" in log.getvalue()
+    assert len(stcs_to) == len(stcs)
+    for stc, stc_to in zip(stcs, stcs_to):
+        want = morph.apply(stc)
+        assert isinstance(stc_to, klass)
+        assert stc_to.subject == "fsaverage"
+        assert_allclose(stc_to.tmin, stc.tmin)
+        assert_array_equal(stc_to.vertices[1], vertices_to[1])
+        assert_allclose(stc_to.data, want.data, rtol=1e-12)
+    with pytest.raises(ValueError, match="vertices do not match"):
+        morph.apply_many(
+            [
+                stcs[0],
+                klass(stcs[1].data[:24], [np.arange(0, 18, 2), vertices_from[1]], 0, 1),
+            ]
+        )
+    with pytest.raises(ValueError, match="must match"):
+        morph.apply_many([klass(stcs[0].data, vertices_from, 0, 1, "foo")])
+
+
+def test_morph_mat_cache(tmp_path, monkeypatch):
+    """Test the memory and disk caches of surface morph matrices."""
+    surf = _get_ico_surface(2)
+    for subject, quat in (("a", [0.0, 0.0, 0.0]), ("b", [0.05, 0.1, 0.0])):
+        (tmp_path / subject / "surf").mkdir(parents=True)
+        rr = surf["rr"] @ quat_to_rot(np.array(quat)).T * 100
+        for hemi in ("lh", "rh"):
+            write_surface(
+                tmp_path / subject / "surf" / f"{hemi}.sphere.reg", rr, surf["tris"]
+            )
+    vertices_from = [np.arange(0, 162, 20), np.arange(0, 162, 10)]
+    vertices_to = [np.arange(162), np.arange(0, 162, 2)]
+    kwargs = dict(
+        subject_from="a",
+        subject_to="b",
+        vertices_from=vertices_from,
+        vertices_to=vertices_to,
+        subjects_dir=tmp_path,
+    )
+    _morph_cache.clear()
+    with pytest.warns(RuntimeWarning, match="consider increasing"):
+        morph_mat = _compute_morph_matrix(smooth=1, **kwargs)
+    assert morph_mat.shape == (243, 26)
+    # in memory (the warning is emitted again)
+    with catch_logging(True) as log, pytest.warns(RuntimeWarning, match="consider"):
+        morph_mat_2 = _compute_morph_matrix(smooth=1, **kwargs)
+    assert "Using cached morph matrix" in log.getvalue()
+    assert_allclose(morph_mat_2.toarray(), morph_mat.toarray())
+    morph_mat_2.data[:] = 0  # a copy
+    with catch_logging(True) as log:
+        morph_mat_3 = _compute_morph_matrix(smooth=None, **kwargs)
+    assert "Using cached" not in log.getvalue()
+    assert_allclose(morph_mat_3.sum(axis=1), 1.0)
+    # on disk, in the morph-maps directory
+    monkeypatch.delenv("MNE_CACHE_DIR", raising=False)
+    monkeypatch.setenv("MNE_CACHE_MORPH", "true")
+    _morph_cache.clear()
+    _compute_morph_matrix(smooth=None, **kwargs)
+    fnames = list((tmp_path / "morph-maps").glob("a-b-morph-mat_*.npz"))
+    assert len(fnames) == 1
+    _morph_cache.clear()
+    with catch_logging(True) as log:
+        morph_mat_4 = _compute_morph_matrix(smooth=None, **kwargs)
+    assert "Loaded cached a-b-morph-mat" in log.getvalue()
+    assert_allclose(morph_mat_4.toarray(), morph_mat_3.toarray())
+    # or in MNE_CACHE_DIR, and recomputed when the surfaces change
+    monkeypatch.setenv("MNE_CACHE_DIR", str(tmp_path))
+    write_surface(
+        tmp_path / "b" / "surf" / "rh.sphere.reg",
+        rr * 1.01,
+        surf["tris"],
+        overwrite=True,
+    )
+    _compute_morph_matrix(smooth=None, **kwargs)
+    assert len(list((tmp_path / "morph").glob("a-b-morph-mat_*.npz"))) == 1
+
+
 @testing.requires_testing_data
 def test_xhemi_morph():
     """Test cross-hemisphere morphing."""
@@ -688,6 +794,11 @@ def test_volume_source_morph_round_trip(
         stc_from_unit_rt_lin = morph_to_from.apply(morph_from_to.apply(stc_from_unit))
         assert_allclose(stc_from_unit_rt.data, stc_from_unit_rt_lin.data)
         del stc_from_unit_rt_lin
+        # many at once
+        stcs_to = morph_from_to.apply_many([stc_from, stc_from_unit], n_jobs=2)
+        for stc, stc_to in zip([stc_from, stc_from_unit], stcs_to):
+            assert_allclose(stc_to.data, morph_from_to.apply(stc).data)
+        del stcs_to
     del stc_from, stc_from_rt
     # before and after morph, check the proportion of vertices
     # that are inside and outside the brainmask.mgz
@@ -29,6 +29,7 @@ from mne import (
     Epochs,
     EvokedArray,
     Label,
+    LabelExtractor,
     MixedSourceEstimate,
     MixedVectorSourceEstimate,
     SourceEstimate,
@@ -73,7 +74,13 @@ from mne.minimum_norm import (
     read_inverse_operator,
 )
 from mne.morph_map import _make_morph_map_hemi
-from mne.source_estimate import _get_vol_mask, _make_stc, grade_to_tris
+from mne.source_estimate import (
+    _get_vol_mask,
+    _make_stc,
+    _pca_flip,
+    _pca_flip_stack,
+    grade_to_tris,
+)
 from mne.source_space._source_space import _get_src_nn
 from mne.transforms import apply_trans, invert_transform, transform_surface_to
 from mne.utils import (
@@ -801,6 +808,18 @@ def test_extract_label_time_course(kind, vector):
         ]
         assert len(label_tc) == n_stcs
         assert len(label_tc_method) == n_stcs
+        extractor = LabelExtractor(labels, src, mode=mode)
+        assert f"{n_labels + len(vol_means)} labels" in repr(extractor)
+        with _record_warnings():
+            label_tc_ex = extractor.apply((stc for stc in stcs), return_generator=True)
+            label_tc_ex = list(label_tc_ex) + [extractor.apply(stcs[0])]
+        assert len(label_tc_ex) == n_stcs + 1
+        for tc1, tc2 in zip(label_tc + label_tc[:1], label_tc_ex):
+            if mode is None:
+                for arr1, arr2 in zip(tc1, tc2):
+                    assert_allclose(arr1, arr2, rtol=1e-8, atol=1e-16)
+            else:
+                assert_allclose(tc1, tc2, rtol=1e-8, atol=1e-16)
         for j, (tc1, tc2) in enumerate(zip(label_tc, label_tc_method)):
             if mode is None:
                 assert all(arr.shape[1] == tc1[0].shape[1] for arr in tc1)
@@ -841,6 +860,71 @@ def test_extract_label_time_course(kind, vector):
     assert x.size == 0
 
 
+def test_pca_flip_stack(monkeypatch):
+    """Test computing pca_flip for stacked data."""
+    rng = np.random.default_rng(0)
+    flip = np.sign(rng.standard_normal((150, 1)))
+    data = rng.standard_normal((3, 150, 120))
+    data[:, :, :10] += 10 * flip  # a dominant component
+    data[1] *= -1
+    want = [_pca_flip(flip, this_data) for this_data in data]
+    got = _pca_flip_stack(flip, data)  # first singular vectors only
+    assert_allclose(got, want, rtol=1e-10, atol=1e-12)
+    monkeypatch.setattr(mne.source_estimate, "_PCA_FLIP_TRUNCATE", 1000)
+    assert_allclose(_pca_flip_stack(flip, data), want, rtol=1e-10, atol=1e-12)
+    data[0] = 0.0
+    assert_array_equal(_pca_flip_stack(flip, data)[0], 0.0)
+    # complex data
+    monkeypatch.setattr(mne.source_estimate, "_PCA_FLIP_TRUNCATE", 100)
+    data = data + 1j * rng.standard_normal(data.shape)
+    want = [_pca_flip(flip, this_data) for this_data in data]
+    got = _pca_flip_stack(flip, data)
+    assert np.iscomplexobj(got)
+    assert_allclose(got, want, rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize("mode", ["mean", "max", "pca_flip"])
+def test_label_extractor_lazy(mode, monkeypatch):
+    """Test that generators of kernel-backed estimates are consumed lazily."""
+    vertices = [np.arange(10), np.arange(10)]
+    src = SourceSpaces(
+        [
+            dict(type="surf", id=ii, vertno=vertno, nn=np.tile([0, 0, 1.0], (10, 1)))
+            for ii, vertno in zip((101, 102), vertices)
+        ]
+    )
+    labels = [Label(np.arange(5), hemi="lh"), Label(np.arange(3, 8), hemi="rh")]
+    rng = np.random.default_rng(0)
+    kernel = rng.standard_normal((20, 4))
+    sens_datas = rng.standard_normal((100, 4, 50))
+    n_read = [0]
+
+    def gen():
+        for sens_data in sens_datas:
+            n_read[0] += 1
+            yield SourceEstimate((kernel, sens_data), vertices, 0, 1e-3)
+
+    # a block holds the data of three estimates
+    monkeypatch.setattr(mne.source_estimate, "_BLOCK_BYTES", 3 * 20 * 50 * 8)
+    label_tcs = extract_label_time_course(
+        gen(), labels, src, mode=mode, return_generator=True
+    )
+    label_tc = next(label_tcs)
+    assert n_read[0] == 3
+    label_tcs = [label_tc] + list(label_tcs)
+    assert n_read[0] == len(sens_datas)
+    want = [
+        extract_label_time_course(
+            SourceEstimate(kernel @ sens_data, vertices, 0, 1e-3),
+            labels,
+            src,
+            mode=mode,
+        )
+        for sens_data in sens_datas
+    ]
+    assert_allclose(label_tcs, want, rtol=1e-10, atol=1e-12)
+
+
 @testing.requires_testing_data
 @pytest.mark.parametrize(
     "label_type, mri_res, vector, test_label, cf, call",
@@ -7,6 +7,7 @@ __all__ = [
     "EpochsSpectrumArray",
     "EpochsTFR",
     "EpochsTFRArray",
+    "RawSpectrogram",
     "RawTFR",
     "RawTFRArray",
     "Spectrum",
@@ -41,6 +42,7 @@ __all__ = [
     "tfr_stockwell",
     "write_tfrs",
 ]
+from ._spectrogram import RawSpectrogram
 from ._stft import istft, stft, stftfreq
 from ._stockwell import tfr_array_stockwell, tfr_stockwell
 from .ar import fit_iir_model_raw
@@ -0,0 +1,271 @@
+"""Incrementally computed spectrogram of continuous data."""
+
+# Authors: The MNE-Python contributors.
+# License: BSD-3-Clause
+# Copyright the MNE-Python contributors.
+
+import numpy as np
+from scipy.fft import rfft
+
+from .._fiff.pick import _picks_to_idx, pick_info
+from ..utils import (
+    _BLOCK_BYTES,
+    _check_option,
+    _time_mask,
+    _validate_type,
+    fill_doc,
+    logger,
+    verbose,
+)
+from ._stft import stftfreq
+
+
+@fill_doc
+class RawSpectrogram:
+    """Spectrogram of continuous data, computed once and extended on demand.
+
+    The data are cut into frames of ``wsize`` samples every ``tstep``
+    samples, which are multiplied by the sine window used by
+    :func:`~mne.time_frequency.stft` and Fourier transformed. The power of
+    each frame is computed only once: calling :meth:`update` after data have
+    been appended to the :class:`~mne.io.Raw` instance (e.g., with
+    :meth:`mne.io.Raw.append`) only transforms the new frames.
+
+    Parameters
+    ----------
+    raw : instance of Raw
+        The continuous data. They do not need to be preloaded, in which case
+        they are read from disk in blocks.
+    wsize : int
+        Length of the frames in samples (must be a multiple of 4).
+    tstep : int | None
+        Step between successive frames in samples (must be a multiple of 2, a
+        divider of ``wsize`` and at most ``wsize / 2``). ``None`` (default)
+        uses ``wsize / 2``.
+    %(picks_good_data_noref)s
+    %(verbose)s
+
+    Attributes
+    ----------
+    ch_names : list of str
+        The channel names.
+    freqs : array, shape (n_freqs,)
+        The frequencies in Hz.
+    times : array, shape (n_frames,)
+        The time of the center of each frame in seconds, in the time
+        reference of ``raw.times``.
+    %(info_not_none)s
+
+    See Also
+    --------
+    mne.io.Raw.compute_psd
+    stft
+
+    Notes
+    -----
+    Each frame contains the power spectral density of the windowed data (with
+    the same scaling as :func:`scipy.signal.periodogram`), such that
+    averaging frames gives a Welch-like estimate of the PSD.
+
+    Projectors are applied to the data only if they have been applied to
+    ``raw`` (see :meth:`mne.io.Raw.apply_proj`).
+
+    Only frames entirely within the data are computed, so the last
+    ``wsize - tstep`` samples at most are pending until more data are
+    appended.
+
+    .. versionadded:: 1.11
+    """
+
+    @verbose
+    def __init__(self, raw, wsize=256, tstep=None, *, picks=None, verbose=None):
+        from ..io import BaseRaw
+
+        _validate_type(raw, BaseRaw, "raw")
+        wsize = int(wsize)
+        if wsize % 4:
+            raise ValueError("The window length must be a multiple of 4.")
+        tstep = wsize // 2 if tstep is None else int(tstep)
+        if tstep < 1:
+            raise ValueError(f"The step size must be positive, got {tstep}.")
+        if (wsize % tstep) or (tstep % 2):
+            raise ValueError(
+                "The step size must be a multiple of 2 and a divider of the window "
+                "length."
+            )
+        if tstep > wsize / 2:
+            raise ValueError("The step size must be at most half the window length.")
+        self._raw = raw
+        self._picks = _picks_to_idx(raw.info, picks, "data", with_ref_meg=False)
+        self.info = pick_info(raw.info, self._picks)
+        self._wsize = wsize
+        self._tstep = tstep
+        self._freqs = stftfreq(wsize, raw.info["sfreq"])
+        # sine window of stft() with scipy.signal.periodogram "density" scaling
+        self._window = np.sin(np.arange(0.5, wsize + 0.5) / wsize * np.pi)
+        self._scale = np.full(
+            len(self._freqs), 2.0 / (self.sfreq * np.sum(self._window**2))
+        )
+        self._scale[0] /= 2.0
+        if wsize % 2 == 0:
+            self._scale[-1] /= 2.0
+        self._blocks = list()
+        self._data = np.zeros((len(self._picks), len(self._freqs), 0))
+        self.update()
+
+    def __repr__(self):
+        """Build string representation of the RawSpectrogram object."""
+        return (
+            f"<RawSpectrogram | {len(self.ch_names)} channels × "
+            f"{len(self.freqs)} freqs × {self.n_frames} frames, "
+            f"{self.freqs[0]:0.1f}-{self.freqs[-1]:0.1f} Hz, "
+            f"hop {self._tstep / self.sfreq:0.3f} s>"
+        )
+
+    @property
+    def ch_names(self):
+        return self.info["ch_names"]
+
+    @property
+    def sfreq(self):
+        return self.info["sfreq"]
+
+    @property
+    def freqs(self):
+        return self._freqs
+
+    @property
+    def n_frames(self):
+        return self._data.shape[-1] + sum(block.shape[-1] for block in self._blocks)
+
+    @property
+    def times(self):
+        starts = np.arange(self.n_frames) * self._tstep
+        return (starts + self._wsize / 2.0) / self.sfreq
+
+    @verbose
+    def update(self, verbose=None):
+        """Compute the frames of data appended to the Raw instance.
+
+        Parameters
+        ----------
+        %(verbose)s
+
+        Returns
+        -------
+        n_new : int
+            The number of new frames.
+        """
+        n_frames = self.n_frames
+        n_total = max((self._raw.n_times - self._wsize) // self._tstep + 1, 0)
+        if n_total <= n_frames:
+            return 0
+        logger.info(f"Computing {n_total - n_frames} new spectrogram frames")
+        n_picks = len(self._picks)
+        n_block = int(
+            _BLOCK_BYTES // (8 * n_picks * (self._wsize + 2 * len(self.freqs)))
+        )
+        n_block = max(n_block, 1)
+        for start in range(n_frames, n_total, n_block):
+            stop = min(start + n_block, n_total)
+            data = self._raw.get_data(
+                self._picks,
+                start * self._tstep,
+                (stop - 1) * self._tstep + self._wsize,
+            )
+            frames = np.lib.stride_tricks.sliding_window_view(
+                data, self._wsize, axis=-1
+            )[:, :: self._tstep]
+            power = rfft(frames * self._window, axis=-1)
+            power = (power.real**2 + power.imag**2) * self._scale
+            self._blocks.append(power.transpose(0, 2, 1))
+        return n_total - n_frames
+
+    def _get_frames(self):
+        if len(self._blocks):
+            self._data = np.concatenate([self._data] + self._blocks, axis=-1)
+            self._blocks = list()
+        return self._data
+
+    @fill_doc
+    def get_data(self, fmin=0.0, fmax=np.inf, tmin=None, tmax=None, return_times=False):
+        """Get the spectrogram.
+
+        Parameters
+        ----------
+        %(fmin_fmax_psd)s
+        %(tmin_tmax_psd)s
+        return_times : bool
+            Whether to also return the frequencies and frame times.
+
+        Returns
+        -------
+        data : array, shape (n_channels, n_freqs, n_frames)
+            The power spectral density of each frame.
+        freqs : array, shape (n_freqs,)
+            The frequencies. Only returned if ``return_times=True``.
+        times : array, shape (n_frames,)
+            The frame times. Only returned if ``return_times=True``.
+        """
+        freq_mask = (self.freqs >= fmin) & (self.freqs <= fmax)
+        times = self.times
+        time_mask = _time_mask(times, tmin, tmax, sfreq=self.sfreq)
+        data = self._get_frames()[:, freq_mask][:, :, time_mask]
+        if return_times:
+            return data, self.freqs[freq_mask], times[time_mask]
+        return data
+
+    def get_band_power(self, bands, window=None, step=None, average="mean"):
+        """Get the power in frequency bands, aggregated over time windows.
+
+        Parameters
+        ----------
+        bands : dict
+            The frequency bands, as a dict mapping band names to ``(fmin, fmax)``
+            tuples in Hz (both included).
+        window : float | None
+            Duration (in seconds) of the windows over which frames are
+            aggregated. ``None`` (default) returns the band power of each frame.
+        step : float | None
+            Step (in seconds) between successive windows. ``None`` (default)
+            uses non-overlapping windows.
+        average : ``'mean'`` | ``'median'``
+            How to aggregate frames within each window.
+
+        Returns
+        -------
+        power : array, shape (n_channels, n_bands, n_windows)
+            The band power (PSD integrated over each band).
+        times : array, shape (n_windows,)
+            The time of the center of each window.
+        """
+        _validate_type(bands, dict, "bands")
+        _check_option("average", average, ("mean", "median"))
+        frames = self._get_frames()
+        df = self.freqs[1] - self.freqs[0]
+        power = np.empty((frames.shape[0], len(bands), frames.shape[2]))
+        for bi, (name, (fmin, fmax)) in enumerate(bands.items()):
+            freq_mask = (self.freqs >= fmin) & (self.freqs <= fmax)
+            if not freq_mask.any():
+                raise ValueError(
+                    f"No frequencies found in band {name!r} between {fmin} and "
+                    f"{fmax} Hz"
+                )
+            power[:, bi] = frames[:, freq_mask].sum(axis=1) * df
+        times = self.times
+        if window is None:
+            return power, times
+        frame_step = self._tstep / self.sfreq
+        n_win = max(int(round(window / frame_step)), 1)
+        n_step = n_win if step is None else max(int(round(step / frame_step)), 1)
+        starts = np.arange(0, power.shape[-1] - n_win + 1, n_step)
+        if average == "mean":
+            cumsum = np.concatenate(
+                [np.zeros(power.shape[:2] + (1,)), np.cumsum(power, axis=-1)], axis=-1
+            )
+            power = (cumsum[..., starts + n_win] - cumsum[..., starts]) / n_win
+        else:
+            power = np.lib.stride_tricks.sliding_window_view(power, n_win, axis=-1)
+            power = np.median(power[:, :, starts], axis=-1)
+        times = (times[starts] + times[starts + n_win - 1]) / 2.0
+        return power, times
@@ -61,42 +61,85 @@ def _precompute_st_windows(n_samp, start_f, stop_f, sfreq, width):
     return windows
 
 
+# Memory (in bytes) allowed for the complex coefficients of each block of
+# frequencies (and epochs) transformed at once
+_ST_BLOCK_BYTES = 4e6
+
+
+def _st_blocks(n_epochs, n_freqs, n_samp):
+    """Get the epoch and frequency slices of the blocks to transform at once."""
+    n_elem = max(int(_ST_BLOCK_BYTES // 16), 1)
+    n_freq_block = max(n_elem // (n_epochs * n_samp), 1)
+    n_epoch_block = n_epochs
+    if n_freq_block == 1:
+        n_epoch_block = max(n_elem // n_samp, 1)
+    for e_start in range(0, n_epochs, n_epoch_block):
+        for f_start in range(0, n_freqs, n_freq_block):
+            yield (
+                slice(e_start, e_start + n_epoch_block),
+                slice(f_start, f_start + n_freq_block),
+            )
+
+
+def _st_shifted_spectra(x, start_f, n_freqs):
+    """Get a view of the spectrum of x shifted by each frequency."""
+    n_samp = x.shape[-1]
+    X = fft(x)
+    XX = np.concatenate([X, X], axis=-1)
+    # shape (..., n_freqs, n_samp), with XX[..., f, :] = XX[..., f : f + n_samp]
+    return np.lib.stride_tricks.sliding_window_view(XX, n_samp, axis=-1)[
+        ..., start_f : start_f + n_freqs, :
+    ]
+
+
 def _st(x, start_f, windows):
     """Compute ST based on Ali Moukadem MATLAB code (used in tests)."""
-    from scipy.fft import fft, ifft
-
     n_samp = x.shape[-1]
     ST = np.empty(x.shape[:-1] + (len(windows), n_samp), dtype=np.complex128)
     # do the work
-    Fx = fft(x)
-    XF = np.concatenate([Fx, Fx], axis=-1)
-    for i_f, window in enumerate(windows):
-        f = start_f + i_f
-        ST[..., i_f, :] = ifft(XF[..., f : f + n_samp] * window)
+    XX = _st_shifted_spectra(x, start_f, len(windows))
+    for _, f_sl in _st_blocks(1, len(windows), int(np.prod(x.shape[:-1])) * n_samp):
+        ST[..., f_sl, :] = ifft(XX[..., f_sl, :] * windows[f_sl], axis=-1)
     return ST
 
 
 def _st_power_itc(x, start_f, compute_itc, zero_pad, decim, W):
     """Aux function."""
     decim = _ensure_slice(decim)
-    n_samp = x.shape[-1]
+    n_epochs, n_samp = x.shape
     decim_indices = decim.indices(n_samp - zero_pad)
     n_out = len(range(*decim_indices))
-    psd = np.empty((len(W), n_out))
-    itc = np.empty_like(psd) if compute_itc else None
-    X = fft(x)
-    XX = np.concatenate([X, X], axis=-1)
-    for i_f, window in enumerate(W):
-        f = start_f + i_f
-        ST = ifft(XX[:, f : f + n_samp] * window)
-        TFR = ST[:, slice(*decim_indices)]
-        TFR_abs = np.abs(TFR)
-        TFR_abs[TFR_abs == 0] = 1.0
+    d_start, _, d_step = decim_indices
+    n_fold = n_samp // d_step
+    if d_step > 1 and n_fold * d_step == n_samp:
+        # Only every d_step-th sample (from d_start) of the inverse FFT is kept,
+        # which is the inverse FFT of the (shifted) spectrum folded d_step times
+        W = W * np.exp(2j * np.pi * d_start / n_samp * np.arange(n_samp))
+    else:
+        n_fold = None
+    # accumulate over epochs, one block of frequencies (and epochs) at a time
+    psd = np.zeros((len(W), n_out))
+    itc = np.zeros((len(W), n_out), np.complex128) if compute_itc else None
+    XX = _st_shifted_spectra(x, start_f, len(W))
+    for e_sl, f_sl in _st_blocks(n_epochs, len(W), n_samp):
+        ST = XX[e_sl, f_sl] * W[f_sl]
+        if n_fold is None:
+            TFR = ifft(ST, axis=-1)[..., slice(*decim_indices)]
+        else:
+            ST = ST.reshape(ST.shape[:-1] + (d_step, n_fold)).sum(axis=-2)
+            TFR = ifft(ST, axis=-1)[..., :n_out]
+            TFR /= d_step
+        del ST
+        TFR_pow = TFR.real**2
+        TFR_pow += TFR.imag**2
+        TFR_pow[TFR_pow == 0] = 1.0
         if compute_itc:
-            TFR /= TFR_abs
-            itc[i_f] = np.abs(np.mean(TFR, axis=0))
-        TFR_abs *= TFR_abs
-        psd[i_f] = np.mean(TFR_abs, axis=0)
+            TFR /= np.sqrt(TFR_pow)
+            itc[f_sl] += TFR.sum(axis=0)
+        psd[f_sl] += TFR_pow.sum(axis=0)
+    psd /= n_epochs
+    if compute_itc:
+        itc = np.abs(itc) / n_epochs
     return psd, itc
 
 
@@ -12,13 +12,14 @@ from .._fiff.pick import _picks_to_idx, pick_channels
 from ..parallel import parallel_func
 from ..time_frequency.multitaper import (
     _compute_mt_params,
-    _csd_from_mt,
     _mt_spectra,
     _psd_from_mt_adaptive,
 )
 from ..utils import (
+    _BLOCK_BYTES,
     ProgressBar,
     _check_fname,
+    _get_blas_funcs,
     _import_h5io_funcs,
     _validate_type,
     copy_function_doc_to_method_doc,
@@ -1358,14 +1359,19 @@ def _execute_csd_function(
     # execution.
     parallel, my_csd, n_jobs = parallel_func(csd_function, n_jobs, verbose=verbose)
 
-    # Compute CSD for each trial
+    # Compute the spectra of each trial, and accumulate their outer products
+    # in the packed CSD matrices once enough spectra have been buffered
     n_blocks = int(np.ceil(n_epochs / float(n_jobs)))
+    spectra = list()
     for i in ProgressBar(range(n_blocks), mesg="CSD epoch blocks"):
         epoch_block = X[i * n_jobs : (i + 1) * n_jobs]
-        csds = parallel(my_csd(this_epoch, *params) for this_epoch in epoch_block)
-
-        # Add CSD matrices in-place
-        csds_mean += np.sum(csds, axis=0)
+        spectra.extend(
+            parallel(my_csd(this_epoch, *params) for this_epoch in epoch_block)
+        )
+        n_bytes = sum(this_spectra.nbytes for this_spectra in spectra)
+        if n_bytes >= _BLOCK_BYTES or i == n_blocks - 1:
+            _csd_accumulate(csds_mean, spectra, n_jobs)
+            spectra = list()
 
     csds_mean /= n_epochs
     logger.info("[done]")
@@ -1385,9 +1391,7 @@ def _execute_csd_function(
 
 
 def _csd_fourier(X, sfreq, n_times, freq_mask, n_fft):
-    """Compute cross spectral density (CSD) using short-time fourier transform.
-
-    Computes the CSD for a single epoch of data.
+    """Compute the scaled Fourier spectra of a single epoch of data.
 
     Parameters
     ----------
@@ -1402,42 +1406,27 @@ def _csd_fourier(X, sfreq, n_times, freq_mask, n_fft):
         Which frequencies to use.
     n_fft : int
         Length of the FFT.
+
+    Returns
+    -------
+    x_mt : ndarray, shape (n_channels, 1, n_freqs)
+        The spectra, scaled such that their outer product is the CSD of the
+        epoch (see :func:`_csd_accumulate`).
     """
     x_mt, _ = _mt_spectra(X, np.hanning(n_times), sfreq, n_fft)
-
-    # Hack so we can sum over axis=-2
-    weights = np.array([1.0])[:, np.newaxis, np.newaxis, np.newaxis]
-
     x_mt = x_mt[:, :, freq_mask]
 
-    # Calculating CSD
-    # Tiling x_mt so that we can easily use _csd_from_mt()
-    x_mt = x_mt[:, np.newaxis, :, :]
-    x_mt = np.tile(x_mt, [1, x_mt.shape[0], 1, 1])
-    y_mt = np.transpose(x_mt, axes=[1, 0, 2, 3])
-    weights_y = np.transpose(weights, axes=[1, 0, 2, 3])
-    csds = _csd_from_mt(x_mt, y_mt, weights, weights_y)
-
-    # FIXME: don't compute full matrix in the first place
-    csds = np.array(
-        [_sym_mat_to_vector(csds[:, :, i]) for i in range(csds.shape[-1])]
-    ).T
-
-    # Scaling by number of samples and compensating for loss of power
-    # due to windowing (see section 11.5.2 in Bendat & Piersol).
-    csds /= n_times
-    csds *= 8 / 3.0
-
-    # Scaling by sampling frequency for compatibility with Matlab
-    csds /= sfreq
-
-    return csds
+    # Scaling by 2 (one-sided spectrum), by number of samples and compensating
+    # for loss of power due to windowing (see section 11.5.2 in Bendat &
+    # Piersol), and by sampling frequency for compatibility with Matlab
+    x_mt *= np.sqrt(2 * 8 / 3.0 / (n_times * sfreq))
+    return x_mt
 
 
 def _csd_multitaper(
     X, sfreq, n_times, window_fun, eigvals, freq_mask, n_fft, adaptive, max_iter=250
 ):
-    """Compute cross spectral density (CSD) using multitaper module."""
+    """Compute the weighted multitaper spectra of a single epoch of data."""
     x_mt, _ = _mt_spectra(X, window_fun, sfreq, n_fft)
 
     if adaptive:
@@ -1445,38 +1434,23 @@ def _csd_multitaper(
         _, weights = _psd_from_mt_adaptive(
             x_mt, eigvals, freq_mask, max_iter, return_weights=True
         )
-        # Tiling weights so that we can easily use _csd_from_mt()
-        weights = weights[:, np.newaxis, :, :]
-        weights = np.tile(weights, [1, x_mt.shape[0], 1, 1])
     else:
         # Do not use adaptive weights
-        weights = np.sqrt(eigvals)[np.newaxis, np.newaxis, :, np.newaxis]
+        weights = np.sqrt(eigvals)[np.newaxis, :, np.newaxis]
 
     x_mt = x_mt[:, :, freq_mask]
 
-    # Calculating CSD
-    # Tiling x_mt so that we can easily use _csd_from_mt()
-    x_mt = x_mt[:, np.newaxis, :, :]
-    x_mt = np.tile(x_mt, [1, x_mt.shape[0], 1, 1])
-    y_mt = np.transpose(x_mt, axes=[1, 0, 2, 3])
-    weights_y = np.transpose(weights, axes=[1, 0, 2, 3])
-    csds = _csd_from_mt(x_mt, y_mt, weights, weights_y)
-
-    # FIXME: don't compute full matrix in the first place
-    csds = np.array(
-        [_sym_mat_to_vector(csds[:, :, i]) for i in range(csds.shape[-1])]
-    ).T
-
-    # Scaling by sampling frequency for compatibility with Matlab
-    csds /= sfreq
-
-    return csds
+    # Normalize the weights of each channel, so that the sum over tapers of
+    # the products of the spectra of each pair of channels is their weighted
+    # CSD, and scale by 2 (one-sided spectrum) and by sampling frequency for
+    # compatibility with Matlab
+    weights = weights / np.sqrt(np.sum(weights**2, axis=-2, keepdims=True))
+    x_mt *= weights * np.sqrt(2 / sfreq)
+    return x_mt
 
 
 def _csd_morlet(data, sfreq, wavelets, nfft, tslice=None, use_fft=True, decim=1):
-    """Compute cross spectral density (CSD) using the given Morlet wavelets.
-
-    Computes the CSD for a single epoch of data.
+    """Compute the scaled Morlet wavelet transform of a single epoch of data.
 
     Parameters
     ----------
@@ -1506,13 +1480,9 @@ def _csd_morlet(data, sfreq, wavelets, nfft, tslice=None, use_fft=True, decim=1)
 
     Returns
     -------
-    csd : ndarray, shape ((n_channels**2 + n_channels) / 2 , n_wavelets)
-        For each wavelet, the upper triangle of the cross spectral density
-        matrix.
-
-    See Also
-    --------
-    _vector_to_sym_mat : For converting the CSD to a full matrix.
+    psds : ndarray, shape (n_channels, n_times, n_wavelets)
+        The wavelet transform, scaled such that its outer product is the CSD
+        of the epoch (see :func:`_csd_accumulate`).
     """
     # Compute PSD
     psds = _cwt_array(data, wavelets, nfft, mode="same", use_fft=use_fft, decim=decim)
@@ -1524,16 +1494,45 @@ def _csd_morlet(data, sfreq, wavelets, nfft, tslice=None, use_fft=True, decim=1)
         tslice = slice(tstart, tstop, tstep)
         psds = psds[:, :, tslice]
 
-    psds_conj = np.conj(psds)
+    # Averaging over time, and scaling by sampling frequency for
+    # compatibility with Matlab
+    return psds.transpose(0, 2, 1) / np.sqrt(psds.shape[2] * sfreq)
 
-    # Compute the spectral density between all pairs of series
-    n_channels = data.shape[0]
-    csds = np.vstack(
-        [np.mean(psds[[i]] * psds_conj[i:], axis=2) for i in range(n_channels)]
-    )
 
-    # Scaling by sampling frequency for compatibility with Matlab
-    csds /= sfreq
+def _csd_accumulate(csds, spectra, n_jobs=None):
+    """Add the CSD of spectra to the packed upper triangles of CSD matrices.
+
+    Parameters
+    ----------
+    csds : ndarray, shape ((n_channels**2 + n_channels) / 2, n_freqs)
+        For each frequency, the upper triangle of the cross spectral density
+        matrix. Modified in-place.
+    spectra : list of ndarray, shape (n_channels, n_samples, n_freqs)
+        The (scaled) spectra, e.g. one per epoch. For each frequency, the
+        spectra ``x`` of all samples (e.g., tapers or time points) are summed
+        as ``x @ x.conj().T``.
+    n_jobs : int | None
+        The number of threads across which the frequencies are split.
+    """
+    # Make the spectra of each frequency Fortran contiguous for BLAS herk
+    spectra = np.concatenate(spectra, axis=1).transpose(2, 1, 0)
+    spectra = np.ascontiguousarray(spectra, dtype=np.complex128)
+    parallel, my_herk, n_jobs = parallel_func(_csd_herk, n_jobs, prefer="threads")
+    n_jobs = min(n_jobs, len(spectra))
+    bounds = np.linspace(0, len(spectra), n_jobs + 1).astype(int)
+    slices = [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+    for sl, out in zip(slices, parallel(my_herk(spectra[sl]) for sl in slices)):
+        csds[:, sl] += out
+
+
+def _csd_herk(spectra):
+    """Compute the packed CSD of spectra with shape (n_freqs, n_samp, n_ch)."""
+    herk = _get_blas_funcs(np.complex128, "herk")
+    triu = np.triu_indices(spectra.shape[2])
+    csds = np.empty((len(triu[0]), len(spectra)), np.complex128)
+    for fi, x in enumerate(spectra):
+        # only the upper triangle of x.T @ x.T.conj().T is computed
+        csds[:, fi] = herk(1.0, x.T)[triu]
     return csds
 
 
@@ -1576,20 +1575,16 @@ def csd_tfr(epochs_tfr, tmin=None, tmax=None, picks=None, projs=None, verbose=No
     tstop = None if tmax is None else np.searchsorted(times, tmax + 1e-10)
     X = X[:, :, :, tstart:tstop]
 
-    for idx, epochs_data in enumerate(X):
-        # This is equivalent to:
-        # csds = np.vstack([np.mean(epochs_data[[i]] * epochs_data_conj[i:],
-        #                           axis=2) for i in range(n_channels)])
-        # There is a redundancy in the calculation here because we don't really
-        # need the lower triangle of the matrix, but it should still be faster
-        # than a loop (hopefully!).
-        csds = np.einsum("xft,yft->xyf", epochs_data, np.conj(epochs_data))
-        csds = csds[np.triu_indices(n_channels) + (slice(None),)]
-        csds /= epochs_data.shape[-1]
-
-        # Scaling by sampling frequency for compatibility with Matlab
-        csds /= epochs_tfr.info["sfreq"]
-        data += csds
+    # Accumulate the CSD of blocks of epochs, scaling by number of samples
+    # and by sampling frequency for compatibility with Matlab
+    scale = 1.0 / np.sqrt(X.shape[-1] * epochs_tfr.info["sfreq"])
+    n_block = max(int(_BLOCK_BYTES // max(X[:1].nbytes, 1)), 1)
+    for start in range(0, len(X), n_block):
+        spectra = [
+            epochs_data.transpose(0, 2, 1) * scale
+            for epochs_data in X[start : start + n_block]
+        ]
+        _csd_accumulate(data, spectra)
 
     # scale to compute mean
     data /= len(epochs_tfr)
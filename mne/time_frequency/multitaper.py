@@ -4,6 +4,8 @@
 
 # Parts of this code were copied from NiTime http://nipy.sourceforge.net/nitime
 
+from functools import lru_cache
+
 import numpy as np
 from scipy.fft import rfft, rfftfreq
 from scipy.integrate import trapezoid
@@ -11,7 +13,7 @@ from scipy.signal import get_window
 from scipy.signal.windows import dpss as sp_dpss
 
 from ..parallel import parallel_func
-from ..utils import _check_option, logger, verbose, warn
+from ..utils import _BLOCK_BYTES, _check_option, logger, verbose, warn
 
 
 def dpss_windows(N, half_nbw, Kmax, *, sym=True, norm=None, low_bias=True):
@@ -63,25 +65,51 @@ def dpss_windows(N, half_nbw, Kmax, *, sym=True, norm=None, low_bias=True):
     ----------
     .. footbibliography::
     """
-    # TODO VERSION can be removed with SciPy 1.16 is min,
-    # workaround for https://github.com/scipy/scipy/pull/22344
-    if N <= 1:
-        dpss, eigvals = np.ones((1, 1)), np.ones(1)
+    if N * Kmax <= _DPSS_CACHE_MAX_ELEMENTS:
+        dpss, eigvals = _dpss_cached(N, float(half_nbw), Kmax, sym, norm)
     else:
-        dpss, eigvals = sp_dpss(
-            N, half_nbw, Kmax, sym=sym, norm=norm, return_ratios=True
-        )
+        dpss, eigvals = _dpss(N, half_nbw, Kmax, sym, norm)
     if low_bias:
         idx = eigvals > 0.9
         if not idx.any():
             warn("Could not properly use low_bias, keeping lowest-bias taper")
             idx = [np.argmax(eigvals)]
-        dpss, eigvals = dpss[idx], eigvals[idx]
+    else:
+        idx = slice(None)
+    # always copy, the cached arrays must not be modified
+    dpss, eigvals = dpss[idx].copy(), eigvals[idx].copy()
     assert len(dpss) > 0  # should never happen
     assert dpss.shape[1] == N  # old nitime bug
     return dpss, eigvals
 
 
+# Tapers are cached by (N, half_nbw, Kmax, sym, norm) as they get recomputed
+# for every frequency of every TFR call and every PSD call. Only small banks
+# are kept (at most 256 * 2 ** 16 * 8 B = 128 MB) so that long raw instances
+# do not fill the memory with tapers that will likely never be used again.
+_DPSS_CACHE_MAX_ELEMENTS = 2**16
+
+
+def _dpss(N, half_nbw, Kmax, sym, norm):
+    # TODO VERSION can be removed with SciPy 1.16 is min,
+    # workaround for https://github.com/scipy/scipy/pull/22344
+    if N <= 1:
+        dpss, eigvals = np.ones((1, 1)), np.ones(1)
+    else:
+        dpss, eigvals = sp_dpss(
+            N, half_nbw, Kmax, sym=sym, norm=norm, return_ratios=True
+        )
+    return dpss, eigvals
+
+
+@lru_cache(maxsize=256)
+def _dpss_cached(N, half_nbw, Kmax, sym, norm):
+    dpss, eigvals = _dpss(N, half_nbw, Kmax, sym, norm)
+    dpss.flags.writeable = False
+    eigvals.flags.writeable = False
+    return dpss, eigvals
+
+
 def _psd_from_mt_adaptive(x_mt, eigvals, freq_mask, max_iter=250, return_weights=False):
     r"""Use iterative procedure to compute the PSD from tapered spectra.
 
@@ -127,65 +155,78 @@ def _psd_from_mt_adaptive(x_mt, eigvals, freq_mask, max_iter=250, return_weights
     x_var = trapezoid(psd_est, dx=np.pi / n_freqs) / (2 * np.pi)
     del psd_est
 
-    # allocate space for output
-    psd = np.empty((n_signals, np.sum(freq_mask)))
-
-    # only keep the frequencies of interest
+    # only keep the frequencies of interest, and work on the tapered powers of
+    # all signals and frequencies at once, shape (n_tapers, n_signals * n_freqs)
     x_mt = x_mt[:, :, freq_mask]
+    n_freqs = x_mt.shape[2]
+    x_pow = (x_mt.real**2 + x_mt.imag**2).transpose(1, 0, 2).reshape(n_tapers, -1)
+    del x_mt
+    x_var = np.repeat(x_var, n_freqs)
+    eigvals = eigvals[:, np.newaxis]
+    rt_eig = rt_eig[:, np.newaxis]
 
+    # allocate space for output
+    psd = np.empty(n_signals * n_freqs)
     if return_weights:
-        weights = np.empty((n_signals, n_tapers, psd.shape[1]))
-
-    for i, (xk, var) in enumerate(zip(x_mt, x_var)):
-        # combine the SDFs in the traditional way in order to estimate
-        # the variance of the timeseries
-
-        # The process is to iteratively switch solving for the following
-        # two expressions:
-        # (1) Adaptive Multitaper SDF:
-        # S^{mt}(f) = [ sum |d_k(f)|^2 S_k(f) ]/ sum |d_k(f)|^2
-        #
-        # (2) Weights
-        # d_k(f) = [sqrt(lam_k) S^{mt}(f)] / [lam_k S^{mt}(f) + E{B_k(f)}]
-        #
-        # Where lam_k are the eigenvalues corresponding to the DPSS tapers,
-        # and the expected value of the broadband bias function
-        # E{B_k(f)} is replaced by its full-band integration
-        # (1/2pi) int_{-pi}^{pi} E{B_k(f)} = sig^2(1-lam_k)
-
-        # start with an estimate from incomplete data--the first 2 tapers
-        psd_iter = _psd_from_mt(xk[:2, :], rt_eig[:2, np.newaxis])
-
-        err = np.zeros_like(xk)
-        for n in range(max_iter):
-            d_k = psd_iter / (
-                eigvals[:, np.newaxis] * psd_iter + (1 - eigvals[:, np.newaxis]) * var
+        weights = np.empty((n_tapers, n_signals * n_freqs))
+
+    # combine the SDFs in the traditional way in order to estimate
+    # the variance of the timeseries
+
+    # The process is to iteratively switch solving for the following
+    # two expressions:
+    # (1) Adaptive Multitaper SDF:
+    # S^{mt}(f) = [ sum |d_k(f)|^2 S_k(f) ]/ sum |d_k(f)|^2
+    #
+    # (2) Weights
+    # d_k(f) = [sqrt(lam_k) S^{mt}(f)] / [lam_k S^{mt}(f) + E{B_k(f)}]
+    #
+    # Where lam_k are the eigenvalues corresponding to the DPSS tapers,
+    # and the expected value of the broadband bias function
+    # E{B_k(f)} is replaced by its full-band integration
+    # (1/2pi) int_{-pi}^{pi} E{B_k(f)} = sig^2(1-lam_k)
+
+    # start with an estimate from incomplete data--the first 2 tapers
+    psd_iter = 2 * (eigvals[:2] * x_pow[:2]).sum(0) / eigvals[:2].sum()
+
+    # Each (signal, frequency) pair is iterated until the RMS difference of its
+    # weights from the previous iterate (across tapers) is less than 1e-10.
+    # Converged elements are written to the output and dropped from the
+    # working arrays, so later iterations only touch the remaining ones.
+    active = np.arange(n_signals * n_freqs)
+    err = np.zeros_like(x_pow)
+    for _ in range(max_iter):
+        d_k = psd_iter / (eigvals * psd_iter + (1 - eigvals) * x_var)
+        d_k *= rt_eig
+        err -= d_k
+        converged = np.mean(err**2, axis=0) < 1e-10
+        if converged.any():
+            psd[active[converged]] = psd_iter[converged]
+            if return_weights:
+                weights[:, active[converged]] = d_k[:, converged]
+            keep = ~converged
+            active, d_k, x_pow, x_var = (
+                active[keep],
+                d_k[:, keep],
+                x_pow[:, keep],
+                x_var[keep],
             )
-            d_k *= rt_eig[:, np.newaxis]
-            # Test for convergence -- this is overly conservative, since
-            # iteration only stops when all frequencies have converged.
-            # A better approach is to iterate separately for each freq, but
-            # that is a nonvectorized algorithm.
-            # Take the RMS difference in weights from the previous iterate
-            # across frequencies. If the maximum RMS error across freqs is
-            # less than 1e-10, then we're converged
-            err -= d_k
-            if np.max(np.mean(err**2, axis=0)) < 1e-10:
+            if not active.size:
                 break
 
-            # update the iterative estimate with this d_k
-            psd_iter = _psd_from_mt(xk, d_k)
-            err = d_k
-
-        if n == max_iter - 1:
-            warn("Iterative multi-taper PSD computation did not converge.")
-
-        psd[i, :] = psd_iter
-
+        # update the iterative estimate with this d_k
+        d_k_sq = d_k * d_k
+        psd_iter = 2 * (d_k_sq * x_pow).sum(0) / d_k_sq.sum(0)
+        err = d_k
+    else:
+        warn("Iterative multi-taper PSD computation did not converge.")
+        psd[active] = psd_iter
         if return_weights:
-            weights[i, :, :] = d_k
+            weights[:, active] = d_k
 
+    psd = psd.reshape(n_signals, n_freqs)
     if return_weights:
+        weights = weights.reshape(n_tapers, n_signals, n_freqs).transpose(1, 0, 2)
         return psd, weights
     else:
         return psd
@@ -213,33 +254,6 @@ def _psd_from_mt(x_mt, weights):
     return psd
 
 
-def _csd_from_mt(x_mt, y_mt, weights_x, weights_y):
-    """Compute CSD from tapered spectra.
-
-    Parameters
-    ----------
-    x_mt : array, shape=(..., n_tapers, n_freqs)
-        Tapered spectra for x
-    y_mt : array, shape=(..., n_tapers, n_freqs)
-        Tapered spectra for y
-    weights_x : array, shape=(n_tapers,)
-        Weights used to combine the tapered spectra of x_mt
-    weights_y : array, shape=(n_tapers,)
-        Weights used to combine the tapered spectra of y_mt
-
-    Returns
-    -------
-    csd: array
-        The computed CSD
-    """
-    csd = np.sum(weights_x * x_mt * (weights_y * y_mt).conj(), axis=-2)
-    denom = np.sqrt((weights_x * weights_x.conj()).real.sum(axis=-2)) * np.sqrt(
-        (weights_y * weights_y.conj()).real.sum(axis=-2)
-    )
-    csd *= 2 / denom
-    return csd
-
-
 def _mt_spectra(x, dpss, sfreq, n_fft=None, remove_dc=True):
     """Compute tapered spectra.
 
@@ -275,10 +289,16 @@ def _mt_spectra(x, dpss, sfreq, n_fft=None, remove_dc=True):
 
     # The following is equivalent to this, but uses less memory:
     # x_mt = fftpack.fft(x[:, np.newaxis, :] * dpss, n=n_fft)
+    # by transforming all tapers of up to 50 MB chunks of signals at once
     n_tapers = dpss.shape[0] if dpss.ndim > 1 else 1
-    x_mt = np.zeros(x.shape[:-1] + (n_tapers, len(freqs)), dtype=np.complex128)
-    for idx, sig in enumerate(x):
-        x_mt[idx] = rfft(sig[..., np.newaxis, :] * dpss, n=n_fft)
+    x_shape = x.shape[:-1]
+    x = x.reshape(-1, x.shape[-1])
+    x_mt = np.zeros((x.shape[0], n_tapers, len(freqs)), dtype=np.complex128)
+    n_chunk = max(int(_BLOCK_BYTES // (n_tapers * len(freqs) * 16)), 1)
+    for start in range(0, x.shape[0], n_chunk):
+        sl = slice(start, start + n_chunk)
+        x_mt[sl] = rfft(x[sl, np.newaxis, :] * dpss, n=n_fft)
+    x_mt.shape = x_shape + x_mt.shape[1:]
     # Adjust DC and maybe Nyquist, depending on one-sided transform
     x_mt[..., 0] /= np.sqrt(2.0)
     if n_fft % 2 == 0:
@@ -430,7 +450,7 @@ def psd_array_multitaper(
         psd = np.zeros((x.shape[0], n_freqs))
 
     # Let's go in up to 50 MB chunks of signals to save memory
-    n_chunk = max(50000000 // (len(freq_mask) * len(eigvals) * 16), 1)
+    n_chunk = max(int(_BLOCK_BYTES // (len(freq_mask) * len(eigvals) * 16)), 1)
     offsets = np.concatenate((np.arange(0, x.shape[0], n_chunk), [x.shape[0]]))
     for start, stop in zip(offsets[:-1], offsets[1:]):
         x_mt = _mt_spectra(x[start:stop], dpss, sfreq, remove_dc=remove_dc)[0]
@@ -8,10 +8,14 @@ from functools import partial
 import numpy as np
 from scipy.signal import spectrogram
 
+from ..annotations import _annotations_starts_stops
 from ..parallel import parallel_func
-from ..utils import _check_option, _ensure_int, logger, verbose
+from ..utils import _BLOCK_BYTES, _check_option, _ensure_int, logger, verbose
 from ..utils.numerics import _mask_to_onsets_offsets
 
+# Number of segment PSDs combined at each level of the remedian
+_REMEDIAN_BASE = 51
+
 
 # adapted from SciPy
 # https://github.com/scipy/scipy/blob/f71e7fad717801c4476312fe1e23f2dfbb4c9d7f/scipy/signal/_spectral_py.py#L2019  # noqa: E501
@@ -224,15 +228,8 @@ def psd_array_welch(
         assert np.allclose(good_mask, good_mask[[0]], equal_nan=True)
         t_onsets, t_offsets = _mask_to_onsets_offsets(good_mask[0])
         x_splits = [x[..., t_ons:t_off] for t_ons, t_off in zip(t_onsets, t_offsets)]
-        # weights reflect the number of samples used from each span. For spans longer
-        # than `n_per_seg`, trailing samples may be discarded. For spans shorter than
-        # `n_per_seg`, the wrapped function (`scipy.signal.spectrogram`) automatically
-        # reduces `n_per_seg` to match the span length (with a warning).
-        step = n_per_seg - n_overlap
         span_lengths = [span.shape[-1] for span in x_splits]
-        weights = [
-            w if w < n_per_seg else w - ((w - n_overlap) % step) for w in span_lengths
-        ]
+        weights = _welch_span_weights(span_lengths, n_per_seg, n_overlap)
         agg_func = partial(np.average, weights=weights)
         if n_jobs > 1:
             logger.info(
@@ -250,7 +247,6 @@ def psd_array_welch(
             with warnings.catch_warnings():
                 warnings.filterwarnings(
                     action="ignore",
-                    module="scipy",
                     category=UserWarning,
                     message=r"nperseg = \d+ is greater than input length",
                 )
@@ -270,3 +266,209 @@ def psd_array_welch(
         shape = shape + (-1,)
     psds.shape = shape
     return psds, freqs
+
+
+def _welch_span_weights(span_lengths, n_per_seg, n_overlap):
+    """Get the weight of each good data span in the (weighted) average."""
+    # weights reflect the number of samples used from each span. For spans longer
+    # than `n_per_seg`, trailing samples may be discarded. For spans shorter than
+    # `n_per_seg`, the wrapped function (`scipy.signal.spectrogram`) automatically
+    # reduces `n_per_seg` to match the span length (with a warning).
+    step = n_per_seg - n_overlap
+    return [w if w < n_per_seg else w - ((w - n_overlap) % step) for w in span_lengths]
+
+
+class _Remedian:
+    """Streaming approximation of the median along the last axis.
+
+    Values are gathered in buffers of ``base`` elements; each time a buffer
+    is full, its median is pushed to the buffer of the next level. Memory is
+    thus bounded by ``base * n_levels`` values per element, and the result is
+    exact as long as no more than ``base`` values are added (see Rousseeuw &
+    Bassett, 1990, J Am Stat Assoc 85(409):97-104).
+    """
+
+    def __init__(self, base=None):
+        self.base = _REMEDIAN_BASE if base is None else base
+        self.levels = list()
+        self.n = 0
+
+    def add(self, values):
+        """Add values, shape (..., n_values)."""
+        self.n += values.shape[-1]
+        self._add(values, 0)
+
+    def _add(self, values, level):
+        if len(self.levels) == level:
+            self.levels.append(values[..., :0])
+        while values.shape[-1]:
+            n_use = self.base - self.levels[level].shape[-1]
+            self.levels[level] = np.concatenate(
+                [self.levels[level], values[..., :n_use]], axis=-1
+            )
+            values = values[..., n_use:]
+            if self.levels[level].shape[-1] == self.base:
+                median = np.median(self.levels[level], axis=-1, keepdims=True)
+                self.levels[level] = self.levels[level][..., :0]
+                self._add(median, level + 1)
+
+    def median(self):
+        """Get the (approximate) median of all values added so far."""
+        if self.n <= self.base:
+            return np.median(self.levels[0], axis=-1)
+        # weighted median of the remaining values, where a value at level k
+        # stands for base ** k values
+        values = np.concatenate(self.levels, axis=-1)
+        weights = np.concatenate(
+            [
+                np.full(level.shape[-1], float(self.base) ** li)
+                for li, level in enumerate(self.levels)
+            ]
+        )
+        order = np.argsort(values, axis=-1)
+        values = np.take_along_axis(values, order, axis=-1)
+        cum_weights = np.cumsum(weights[order], axis=-1)
+        idx = (cum_weights < cum_weights[..., -1:] / 2.0).sum(-1, keepdims=True)
+        return np.take_along_axis(values, idx, axis=-1)[..., 0]
+
+
+def _welch_stream_block(data, func, freq_sl, average):
+    """Compute the segment spectra of a block of data and reduce them."""
+    _, _, spect = func(data)
+    spect = spect[..., freq_sl, :]
+    if average == "mean":
+        spect = spect.sum(axis=-1, keepdims=True)
+    return spect
+
+
+@verbose
+def _psd_welch_raw(
+    raw,
+    sfreq,
+    fmin=0,
+    fmax=np.inf,
+    n_fft=256,
+    n_overlap=0,
+    n_per_seg=None,
+    n_jobs=None,
+    average="mean",
+    window="hamming",
+    remove_dc=True,
+    *,
+    picks,
+    start,
+    stop,
+    reject_by_annotation,
+    output="power",
+    verbose=None,
+):
+    """Compute the Welch PSD of continuous data by streaming it from disk.
+
+    This is equivalent to ``psd_array_welch(raw.get_data(picks, start, stop,
+    reject_by_annotation="NaN" if reject_by_annotation else None), ...)`` but
+    reads and transforms blocks of consecutive segments one at a time, so that
+    neither the data nor the segment spectrogram are ever fully in memory.
+    The segment spectra of each block are summed for ``average="mean"``, and
+    combined with a :class:`_Remedian` for ``average="median"``, which is then
+    an approximation of the median.
+    """
+    _check_option("average", average, ("mean", "median"))
+    _check_option("output", output, ("power",))
+    detrend = "constant" if remove_dc else False
+    n_fft = _ensure_int(n_fft, "n_fft")
+    n_overlap = _ensure_int(n_overlap, "n_overlap")
+    if n_per_seg is not None:
+        n_per_seg = _ensure_int(n_per_seg, "n_per_seg")
+
+    # Prep the PSD
+    n_fft, n_per_seg, n_overlap = _check_nfft(stop - start, n_fft, n_per_seg, n_overlap)
+    win_size = n_fft / float(sfreq)
+    logger.info(f"Effective window size : {win_size:0.3f} (s)")
+    freqs = np.arange(n_fft // 2 + 1, dtype=float) * (sfreq / n_fft)
+    freq_mask = (freqs >= fmin) & (freqs <= fmax)
+    if not freq_mask.any():
+        raise ValueError(f"No frequencies found between fmin={fmin} and fmax={fmax}")
+    freq_sl = slice(*(np.where(freq_mask)[0][[0, -1]] + [0, 1]))
+    del freq_mask
+    freqs = freqs[freq_sl]
+
+    # Get the good data spans, like raw.get_data(..., reject_by_annotation="NaN")
+    good_mask = np.ones(stop - start, bool)
+    if reject_by_annotation:
+        onsets, ends = _annotations_starts_stops(raw, ["BAD"])
+        for onset, end in zip(onsets, ends):
+            good_mask[max(onset - start, 0) : max(end - start, 0)] = False
+    if not good_mask.any():
+        raise ValueError("No good data left after rejecting bad annotations.")
+    t_onsets, t_offsets = _mask_to_onsets_offsets(good_mask)
+    del good_mask
+    t_onsets, t_offsets = t_onsets + start, t_offsets + start
+    span_lengths = t_offsets - t_onsets
+    weights = _welch_span_weights(span_lengths, n_per_seg, n_overlap)
+    if (span_lengths < n_per_seg).any():
+        logger.info(
+            "At least one good data span is shorter than n_per_seg, and will be "
+            "analyzed with a shorter window than the rest of the file."
+        )
+
+    # Number of segments per block
+    step = n_per_seg - n_overlap
+    n_picks = len(picks)
+    n_seg_block = int(_BLOCK_BYTES // (8 * n_picks * (n_fft + step)))
+    n_seg_block = max(n_seg_block, 1)
+    logger.debug(
+        f"Spectogram using {n_fft}-point FFT on {n_per_seg} samples with "
+        f"{n_overlap} overlap and {window} window, streaming up to "
+        f"{n_seg_block} segments at a time"
+    )
+    _func = partial(
+        spectrogram,
+        detrend=detrend,
+        noverlap=n_overlap,
+        nperseg=n_per_seg,
+        nfft=n_fft,
+        fs=sfreq,
+        window=window,
+        mode="psd",
+    )
+
+    def func(*args, **kwargs):
+        # swallow SciPy warnings caused by short good data spans
+        with warnings.catch_warnings():
+            warnings.filterwarnings(
+                action="ignore",
+                category=UserWarning,
+                message=r"nperseg = \d+ is greater than input length",
+            )
+            return _func(*args, **kwargs)
+
+    # Parallelize across channels within each block
+    parallel, my_block_func, n_jobs = parallel_func(_welch_stream_block, n_jobs=n_jobs)
+    psds = np.zeros((n_picks, len(freqs)))
+    for t_ons, t_off, weight in zip(t_onsets, t_offsets, weights):
+        n_segments = max((t_off - t_ons - n_overlap) // step, 1)
+        accum = np.zeros_like(psds) if average == "mean" else _Remedian()
+        for seg_start in range(0, n_segments, n_seg_block):
+            seg_stop = min(seg_start + n_seg_block, n_segments)
+            b_start = t_ons + seg_start * step
+            b_stop = min(t_ons + (seg_stop - 1) * step + n_per_seg, t_off)
+            data = raw.get_data(picks, b_start, b_stop)
+            spect = np.concatenate(
+                parallel(
+                    my_block_func(d, func=func, freq_sl=freq_sl, average=average)
+                    for d in np.array_split(data, n_jobs)
+                    if d.size != 0
+                )
+            )
+            del data
+            if average == "mean":
+                accum += spect[..., 0]
+            else:
+                accum.add(spect)
+        if average == "mean":
+            span_psd = accum / n_segments
+        else:
+            span_psd = accum.median() / _median_biases(n_segments)[n_segments]
+        psds += weight * span_psd
+    psds /= np.sum(weights)
+    return psds, freqs
@@ -58,7 +58,7 @@ from ..viz.utils import (
     plt_show,
 )
 from .multitaper import _psd_from_mt, psd_array_multitaper
-from .psd import _check_nfft, psd_array_welch
+from .psd import _check_nfft, _psd_welch_raw, psd_array_welch
 
 
 class SpectrumMixin:
@@ -1160,11 +1160,24 @@ class Spectrum(BaseSpectrum):
         # get just the data we want
         if isinstance(self.inst, BaseRaw):
             start, stop = np.where(self._time_mask)[0][[0, -1]]
-            rba = "NaN" if reject_by_annotation else None
-            data = self.inst.get_data(
-                self._picks, start, stop + 1, reject_by_annotation=rba
-            )
-            if np.any(np.isnan(data)) and method == "multitaper":
+            if _can_stream_welch(self.inst, self.method, method_kw):
+                # read (and transform) the data from disk block by block
+                self._psd_func = partial(
+                    _psd_welch_raw,
+                    picks=self._picks,
+                    start=start,
+                    stop=stop + 1,
+                    reject_by_annotation=reject_by_annotation,
+                    remove_dc=remove_dc,
+                    **method_kw,
+                )
+                data = self.inst
+            else:
+                rba = "NaN" if reject_by_annotation else None
+                data = self.inst.get_data(
+                    self._picks, start, stop + 1, reject_by_annotation=rba
+                )
+            if method == "multitaper" and np.any(np.isnan(data)):
                 raise NotImplementedError(
                     'Cannot use method="multitaper" when reject_by_annotation=True. '
                     'Please use method="welch" instead.'
@@ -1220,6 +1233,16 @@ class Spectrum(BaseSpectrum):
         return BaseRaw._getitem(self, item, return_times=False)
 
 
+def _can_stream_welch(raw, method, method_kw):
+    """Check if the Welch PSD can be computed by streaming the data from disk."""
+    return (
+        not raw.preload
+        and method == "welch"
+        and method_kw.get("average", "mean") in ("mean", "median")
+        and method_kw.get("output", "power") == "power"
+    )
+
+
 def _check_data_shape(data, info, freqs, dim_names, weights, is_epoched):
     if data.ndim != len(dim_names):
         raise ValueError(
@@ -27,6 +27,7 @@ from mne.time_frequency import (
     read_csd,
     tfr_morlet,
 )
+from mne.time_frequency import csd as csd_module
 from mne.time_frequency.csd import _sym_mat_to_vector, _vector_to_sym_mat
 from mne.utils import sum_squared
 
@@ -568,6 +569,29 @@ def test_csd_multitaper():
             assert abs(signal_power_per_sample - mt_power_per_sample) < 0.001
 
 
+@pytest.mark.parametrize("n_jobs", (1, 2))
+def test_csd_accumulate(n_jobs, monkeypatch):
+    """Test accumulating the CSD of buffered blocks of epochs."""
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((5, 4, 200))
+    X -= X.mean(axis=-1, keepdims=True)
+    want = np.mean(
+        [
+            np.einsum("xf,yf->xyf", x_mt, x_mt.conj())
+            for x_mt in np.fft.rfft(X * np.hanning(200), axis=-1)[:, :, 1:]
+        ],
+        axis=0,
+    )
+    want *= 2 * 8 / 3.0 / (200 * 100.0)
+    want[:, :, -1] /= 2  # Nyquist
+    csd = csd_array_fourier(X, 100.0, n_jobs=n_jobs)
+    monkeypatch.setattr(csd_module, "_BLOCK_BYTES", 1)  # one block per epoch
+    csd_block = csd_array_fourier(X, 100.0, n_jobs=n_jobs)
+    assert_allclose(csd_block._data, csd._data)
+    for fi in range(len(csd.frequencies)):
+        assert_allclose(csd.get_data(index=fi), want[:, :, fi], atol=1e-15)
+
+
 def test_csd_morlet():
     """Test computing cross-spectral density using Morlet wavelets."""
     epochs = _generate_coherence_data()
@@ -4,10 +4,15 @@
 
 import numpy as np
 import pytest
-from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_allclose, assert_array_almost_equal, assert_array_equal
 
 from mne.time_frequency import psd_array_multitaper
-from mne.time_frequency.multitaper import dpss_windows
+from mne.time_frequency.multitaper import (
+    _mt_spectra,
+    _psd_from_mt,
+    _psd_from_mt_adaptive,
+    dpss_windows,
+)
 from mne.utils import _record_warnings
 
 
@@ -78,3 +83,36 @@ def test_adaptive_weights_convergence():
     ):
         psd_array_multitaper(data, sfreq, adaptive=True, max_iter=2)
     psd_array_multitaper(data, sfreq, adaptive=True, max_iter=200)
+
+
+def test_dpss_windows_cache():
+    """Test that cached DPSS windows are returned as independent copies."""
+    dpss, eigs = dpss_windows(100, 4, 8, sym=False)
+    dpss_2, eigs_2 = dpss_windows(100, 4, 8, sym=False)
+    assert_array_equal(dpss, dpss_2)
+    assert_array_equal(eigs, eigs_2)
+    assert dpss.flags.writeable and eigs.flags.writeable
+    dpss[:] = 0.0
+    dpss_2, _ = dpss_windows(100, 4, 8, sym=False)
+    assert np.abs(dpss_2).max() > 0
+
+
+def test_adaptive_weights_shapes():
+    """Test the shapes and normalization of the vectorized adaptive weights."""
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((2, 3, 200))
+    dpss, eigvals = dpss_windows(200, 4, 8, sym=False)
+    x_mt, freqs = _mt_spectra(x, dpss, 1000.0)
+    assert x_mt.shape == (2, 3, len(dpss), len(freqs))
+    x_mt = x_mt.reshape(6, len(dpss), len(freqs))
+    freq_mask = freqs > 10
+    psd, weights = _psd_from_mt_adaptive(x_mt, eigvals, freq_mask, return_weights=True)
+    assert psd.shape == (6, freq_mask.sum())
+    assert weights.shape == (6, len(dpss), freq_mask.sum())
+    # each signal must give the same result when processed on its own
+    for ii in range(len(x_mt)):
+        psd_1 = _psd_from_mt_adaptive(x_mt[ii : ii + 1], eigvals, freq_mask)
+        assert_allclose(psd_1[0], psd[ii])
+    # the PSD is the weighted combination of the tapered spectra
+    psd_w = _psd_from_mt(x_mt[:, :, freq_mask], weights)
+    assert_allclose(psd_w, psd, rtol=1e-4)
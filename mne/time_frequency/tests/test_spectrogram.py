@@ -0,0 +1,86 @@
+# Authors: The MNE-Python contributors.
+# License: BSD-3-Clause
+# Copyright the MNE-Python contributors.
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
+from scipy.signal import spectrogram
+
+from mne import create_info
+from mne.io import RawArray, read_raw_fif
+from mne.time_frequency import RawSpectrogram
+
+
+def _make_raw(n_times, seed=0):
+    info = create_info(3, 1000.0, "eeg")
+    data = np.random.default_rng(seed).standard_normal((3, n_times)) * 1e-5
+    return RawArray(data, info, verbose=False)
+
+
+@pytest.mark.parametrize("tstep", (None, 32))
+def test_raw_spectrogram(tstep, tmp_path):
+    """Test the incremental raw spectrogram against SciPy."""
+    raw = _make_raw(3000)
+    fname = tmp_path / "test_raw.fif"
+    raw.save(fname)
+    raw = read_raw_fif(fname, preload=False)
+    spect = RawSpectrogram(raw, wsize=128, tstep=tstep)
+    assert "RawSpectrogram" in repr(spect)
+    data, freqs, times = spect.get_data(return_times=True)
+    use_tstep = 64 if tstep is None else tstep
+    window = np.sin(np.arange(0.5, 128.5) / 128 * np.pi)
+    want_freqs, want_times, want = spectrogram(
+        raw.get_data(),
+        fs=raw.info["sfreq"],
+        window=window,
+        noverlap=128 - use_tstep,
+        detrend=False,
+    )
+    assert_allclose(freqs, want_freqs)
+    assert_allclose(times, want_times)
+    assert_allclose(data, want, rtol=1e-10)
+    # subselection
+    data = spect.get_data(fmin=10, fmax=100, tmin=0.5, tmax=1.0)
+    assert data.shape[1] == np.sum((freqs >= 10) & (freqs <= 100))
+    assert data.shape[2] == np.sum((times >= 0.5) & (times <= 1.0))
+
+
+def test_raw_spectrogram_update():
+    """Test extending the raw spectrogram when data are appended."""
+    raw = _make_raw(10000)
+    full = RawSpectrogram(raw.copy(), wsize=256).get_data()
+    raw_inc = raw.copy().crop(tmax=(4000 - 1) / raw.info["sfreq"])
+    spect = RawSpectrogram(raw_inc, wsize=256)
+    n_frames = spect.n_frames
+    assert n_frames == (4000 - 256) // 128 + 1
+    assert spect.update() == 0
+    raw_inc.append(raw.copy().crop(tmin=4000 / raw.info["sfreq"]))
+    assert spect.update() == full.shape[-1] - n_frames
+    assert_allclose(spect.get_data(), full, rtol=1e-10)
+
+    # band power over time windows
+    bands = dict(alpha=(8, 12), beta=(13, 30))
+    power, times = spect.get_band_power(bands)
+    assert power.shape == (3, 2, full.shape[-1])
+    assert_array_equal(times, spect.times)
+    df = spect.freqs[1] - spect.freqs[0]
+    mask = (spect.freqs >= 8) & (spect.freqs <= 12)
+    assert_allclose(power[:, 0], full[:, mask].sum(1) * df)
+    win_power, win_times = spect.get_band_power(bands, window=1.0, step=0.5)
+    n_win = int(round(1.0 / (128 / 1000.0)))
+    assert_allclose(win_power[..., 0], power[..., :n_win].mean(-1))
+    assert_allclose(win_power[..., 1], power[..., 4 : 4 + n_win].mean(-1))
+    assert_allclose(win_times[0], spect.times[:n_win].mean())
+    med_power, _ = spect.get_band_power(bands, window=1.0, average="median")
+    assert_allclose(med_power[..., 0], np.median(power[..., :n_win], -1))
+    with pytest.raises(ValueError, match="No frequencies found in band"):
+        spect.get_band_power(dict(foo=(1000, 2000)))
+    with pytest.raises(ValueError, match="must be a multiple of 4"):
+        RawSpectrogram(raw, wsize=255)
+    with pytest.raises(ValueError, match="at most half"):
+        RawSpectrogram(raw, wsize=256, tstep=256)
+    with pytest.raises(ValueError, match="must be positive"):
+        RawSpectrogram(raw, wsize=256, tstep=0)
+    with pytest.raises(ValueError, match="must be positive"):
+        RawSpectrogram(raw, wsize=256, tstep=-2)
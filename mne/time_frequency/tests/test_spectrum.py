@@ -11,9 +11,10 @@ from matplotlib.colors import same_color
 from numpy.testing import assert_allclose, assert_array_equal
 
 from mne import Annotations, BaseEpochs, create_info, make_fixed_length_epochs
-from mne.io import RawArray
+from mne.io import RawArray, read_raw_fif
 from mne.time_frequency import read_spectrum
 from mne.time_frequency.multitaper import _psd_from_mt
+from mne.time_frequency.psd import _Remedian
 from mne.time_frequency.spectrum import (
     EpochsSpectrumArray,
     SpectrumArray,
@@ -262,6 +263,54 @@ def test_spectrum_reject_by_annot(raw):
     assert spect_no_annot != spect_reject_annot
 
 
+@pytest.mark.parametrize("average", ("mean", "median"))
+@pytest.mark.parametrize("n_overlap", (0, 100))
+def test_spectrum_welch_streaming(average, n_overlap, tmp_path, monkeypatch):
+    """Test that the Welch PSD of non-preloaded raw matches the in-memory one."""
+    import mne.time_frequency.psd as psd_mod
+
+    info = create_info(4, 1000.0, "eeg")
+    data = np.random.default_rng(0).standard_normal((4, 20000)) * 1e-5
+    raw = RawArray(data, info)
+    # the second good span is shorter than n_per_seg
+    raw.set_annotations(
+        Annotations([3.0, 3.25, 15.0], [0.1, 0.5, 1.0], ["bad_a", "bad_b", "ok"])
+    )
+    fname = tmp_path / "test_raw.fif"
+    raw.save(fname)
+    raw = read_raw_fif(fname, preload=False)
+    # force reading the data in many blocks, and an exact median
+    monkeypatch.setattr(psd_mod, "_BLOCK_BYTES", 100e3)
+    monkeypatch.setattr(psd_mod, "_REMEDIAN_BASE", 1001)
+    kw = dict(n_fft=256, n_overlap=n_overlap, average=average, tmin=1, fmax=200)
+    want = raw.copy().load_data().compute_psd(**kw)
+    got = raw.compute_psd(**kw)
+    assert_allclose(got.get_data(), want.get_data(), rtol=1e-10)
+    assert_array_equal(got.freqs, want.freqs)
+    for rba in (True, False):
+        kw = dict(n_fft=64, n_overlap=n_overlap // 2, reject_by_annotation=rba)
+        want = raw.copy().load_data().compute_psd(**kw)
+        got = raw.compute_psd(**kw)
+        assert_allclose(got.get_data(), want.get_data(), rtol=1e-10)
+    # unaggregated segments are not streamed
+    got = raw.compute_psd(n_fft=64, average=None, reject_by_annotation=False)
+    assert got.get_data().ndim == 3
+
+
+def test_remedian():
+    """Test the streaming approximation of the median."""
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((3, 2000))
+    remedian = _Remedian(base=2001)
+    remedian.add(data[:, :1000])
+    remedian.add(data[:, 1000:])
+    assert_allclose(remedian.median(), np.median(data, axis=-1))
+    remedian = _Remedian(base=11)
+    for sl in np.array_split(np.arange(data.shape[-1]), 7):
+        remedian.add(data[:, sl])
+    assert_allclose(remedian.median(), np.median(data, axis=-1), atol=0.1)
+
+
 def test_spectrum_bads_exclude(raw):
     """Test bads are not removed unless exclude="bads"."""
     raw.pick("mag")  # get rid of IAS channel
@@ -24,6 +24,7 @@ from mne.time_frequency._stockwell import (
     _st_power_itc,
     tfr_stockwell,
 )
+from mne.time_frequency.tfr import _ensure_slice
 from mne.utils import _record_warnings
 
 base_dir = Path(__file__).parents[2] / "io" / "tests" / "data"
@@ -67,6 +68,24 @@ def test_stockwell_st_no_zero_pad():
     _st_power_itc(data, 10, True, 0, 1, W)
 
 
+@pytest.mark.parametrize("decim", (1, 3, 4, slice(1, None, 4), slice(3, 100, 8)))
+@pytest.mark.parametrize("block_bytes", (1e3, 50e6))
+def test_stockwell_power_itc_blocks(decim, block_bytes, monkeypatch):
+    """Test blocked stockwell power and ITC against the full transform."""
+    import mne.time_frequency._stockwell as st_mod
+
+    monkeypatch.setattr(st_mod, "_ST_BLOCK_BYTES", block_bytes)
+    data = np.random.default_rng(0).standard_normal((5, 128))
+    start_f, stop_f, zero_pad = 2, 20, 10
+    W = _precompute_st_windows(data.shape[-1], start_f, stop_f, 100.0, 1.0)
+    TFR = _st(data, start_f, W)[..., slice(*_ensure_slice(decim).indices(118))]
+    want_psd = np.mean(np.abs(TFR) ** 2, axis=0)
+    want_itc = np.abs(np.mean(TFR / np.abs(TFR), axis=0))
+    psd, itc = _st_power_itc(data, start_f, True, zero_pad, decim, W)
+    assert_allclose(psd, want_psd, rtol=1e-10)
+    assert_allclose(itc, want_itc, rtol=1e-10)
+
+
 def test_stockwell_core():
     """Test stockwell transform."""
     # adapted from
@@ -267,9 +267,6 @@ def _make_dpss(
     Cs : list of array
         The concentration weights. Only returned if return_weights=True.
     """
-    Ws = list()
-    Cs = list()
-
     freqs = np.array(freqs)
     if np.any(freqs <= 0):
         raise ValueError("all frequencies in 'freqs' must be greater than 0.")
@@ -282,25 +279,23 @@ def _make_dpss(
     if n_cycles.size != 1 and n_cycles.size != len(freqs):
         raise ValueError("n_cycles should be fixed or defined for each frequency.")
 
-    for m in range(n_taps):
-        Wm = list()
-        Cm = list()
-        for k, f in enumerate(freqs):
-            if len(n_cycles) != 1:
-                this_n_cycles = n_cycles[k]
-            else:
-                this_n_cycles = n_cycles[0]
+    Ws = [list() for _ in range(n_taps)]
+    Cs = [list() for _ in range(n_taps)]
+    for k, f in enumerate(freqs):
+        if len(n_cycles) != 1:
+            this_n_cycles = n_cycles[k]
+        else:
+            this_n_cycles = n_cycles[0]
 
-            t_win = this_n_cycles / float(f)
-            t = np.arange(0.0, t_win, 1.0 / sfreq)
-            # Making sure wavelets are centered before tapering
-            oscillation = np.exp(2.0 * 1j * np.pi * f * (t - t_win / 2.0))
+        t_win = this_n_cycles / float(f)
+        t = np.arange(0.0, t_win, 1.0 / sfreq)
+        # Making sure wavelets are centered before tapering
+        oscillation = np.exp(2.0 * 1j * np.pi * f * (t - t_win / 2.0))
 
-            # Get dpss tapers
-            tapers, conc = dpss_windows(
-                t.shape[0], time_bandwidth / 2.0, n_taps, sym=False
-            )
+        # Get dpss tapers (once for all tapers of this frequency)
+        tapers, conc = dpss_windows(t.shape[0], time_bandwidth / 2.0, n_taps, sym=False)
 
+        for m in range(n_taps):
             Wk = oscillation * tapers[m]
             if zero_mean:  # to make it zero mean
                 real_offset = Wk.mean()
@@ -308,11 +303,8 @@ def _make_dpss(
             Wk /= np.sqrt(0.5) * np.linalg.norm(Wk.ravel())
             Ck = np.sqrt(conc[m])
 
-            Wm.append(Wk)
-            Cm.append(Ck)
-
-        Ws.append(Wm)
-        Cs.append(Cm)
+            Ws[m].append(Wk)
+            Cs[m].append(Ck)
     if return_weights:
         return Ws, Cs
     return Ws
@@ -9,6 +9,8 @@ __all__ = [
     "ProgressBar",
     "SizeMixin",
     "TimeMixin",
+    "_ArrayCache",
+    "_BLOCK_BYTES",
     "_DefaultEventParser",
     "_PCA",
     "_ReuseCycle",
@@ -345,12 +347,14 @@ from .mixin import (
     _prepare_write_metadata,
 )
 from .numerics import (
+    _BLOCK_BYTES,
     _PCA,
     _apply_scaling_array,
     _apply_scaling_cov,
     _arange_div,
     _array_equal_nan,
     _array_repr,
+    _ArrayCache,
     _check_dt,
     _compute_row_norms,
     _custom_lru_cache,
@@ -110,6 +110,18 @@ _known_config_types = {
         "bool, whether to use OpenGL for rendering in the MNE Browse Raw window"
     ),
     "MNE_CACHE_DIR": "str, path to the cache directory for parallel execution",
+    "MNE_CACHE_FORWARD": (
+        "bool, whether to cache the BEM solutions at the sensors used to compute "
+        "forward solutions in memory (and in MNE_CACHE_DIR if set)"
+    ),
+    "MNE_CACHE_INVERSE": (
+        "bool, whether to cache prepared inverse operators and kernels in memory "
+        "(and in MNE_CACHE_DIR if set)"
+    ),
+    "MNE_CACHE_MORPH": (
+        "bool, whether to also store surface source morph matrices in "
+        "MNE_CACHE_DIR (or in the morph-maps directory of SUBJECTS_DIR)"
+    ),
     "MNE_COREG_ADVANCED_RENDERING": (
         "bool, whether to use advanced OpenGL rendering in mne coreg"
     ),
@@ -585,7 +585,11 @@ buffer_size : int | None
     reduce memory usage when ``n_jobs > 1`` and memory sharing between
     processes is enabled (see :func:`mne.set_cache_dir`), because ``X`` will be
     shared between processes and each process only needs to allocate space for
-    a small block of locations at a time.
+    a small block of locations at a time. It is not used when ``stat_fun`` is
+    :func:`~mne.stats.ttest_1samp_no_p`, :func:`~mne.stats.ttest_ind_no_p` or
+    :func:`~mne.stats.f_oneway` (or a :func:`functools.partial` of them),
+    because their statistics are then computed for blocks of permutations at
+    once, without copying ``X``.
 """
 
 docdict["by_event_type"] = """
@@ -713,6 +717,20 @@ check_disjoint : bool
     the second dimension of ``X`` (usually the "time" dimension) is large.
 """
 
+docdict["checkpoint_dir_clust"] = """
+checkpoint_dir : path-like | None
+    Existing directory in which the maximum cluster statistics of each block of
+    permutations are saved. Blocks already saved there are loaded instead of
+    being computed again. This makes it possible to resume a test that was
+    interrupted, or to share the work between processes or machines that run
+    the same test with the same directory, all of them obtaining identical
+    results. Files are named after a hash of the observed statistics,
+    thresholding parameters and permutations, so a directory can be shared
+    by different tests. ``None`` (default) does not save anything.
+
+    .. versionadded:: 1.11
+"""
+
 docdict["chpi_amplitudes"] = """
 chpi_amplitudes : dict
     The time-varying cHPI coil amplitudes, with entries
@@ -10,6 +10,8 @@ import operator
 import os
 import shutil
 import sys
+import tempfile
+import threading
 from contextlib import contextmanager
 from datetime import date, datetime, timedelta, timezone
 from io import BytesIO, StringIO
@@ -34,9 +36,15 @@ from .check import (
     _validate_type,
     check_random_state,
 )
+from .config import get_config
 from .docs import fill_doc
 from .misc import _empty_hash, _pl
 
+# Memory (in bytes) allowed for each block of data processed at once, e.g.,
+# when streaming data from disk or computing statistics for blocks of
+# permutations
+_BLOCK_BYTES = 50e6
+
 
 def split_list(v, n, idx=False):
     """Split list in n (approx) equal pieces, possibly giving indices."""
@@ -1118,6 +1126,104 @@ def _custom_lru_cache(maxsize):
     return dec
 
 
+class _ArrayCache:
+    """Least recently used store of dicts of arrays, optionally backed by disk.
+
+    Entries are kept in memory up to ``max_bytes``. If the ``config_key``
+    config is true and ``MNE_CACHE_DIR`` is set, entries are also written to
+    (and read from) the ``subdir`` subdirectory of the cache directory, so
+    that they can be reused by other processes. If ``MNE_CACHE_DIR`` is not
+    set, the ``cache_dir`` passed to :meth:`get` and :meth:`put` (if any) is
+    used instead. With ``memory=False``, nothing is stored (not even in
+    memory) unless the ``config_key`` config is true, see :attr:`enabled`.
+    """
+
+    def __init__(self, max_bytes, subdir, config_key, *, memory=True):
+        self.max_bytes = max_bytes
+        self.subdir = subdir
+        self.config_key = config_key
+        self.memory = memory
+        self._entries = dict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """Whether entries are stored, so that keys are worth computing."""
+        return self.memory or self._use_config()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, kind, key, *, cache_dir=None):
+        """Get an entry, or None if not cached."""
+        if not self.enabled:
+            return None
+        name = f"{kind}_{key:032x}"
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry is not None:
+                self._entries[name] = entry  # (re)insert in last position
+                logger.debug(f"    Using cached {kind} {name}")
+                return entry
+        fname = self._fname(name, cache_dir)
+        if fname is None or not fname.is_file():
+            return None
+        with np.load(fname) as npz:
+            entry = dict(npz)
+        logger.info(f"    Loaded cached {kind} from {fname}")
+        self._insert(name, entry)
+        return entry
+
+    def put(self, kind, key, entry, *, cache_dir=None):
+        """Store an entry."""
+        if not self.enabled:
+            return
+        name = f"{kind}_{key:032x}"
+        self._insert(name, entry)
+        fname = self._fname(name, cache_dir)
+        if fname is not None and not fname.is_file():
+            # write atomically, so that concurrent jobs never read a bad file
+            try:
+                fname.parent.mkdir(exist_ok=True)
+                fd, tmp_fname = tempfile.mkstemp(
+                    suffix=".tmp.npz", prefix=f"{name}_", dir=fname.parent
+                )
+                with os.fdopen(fd, "wb") as fid:
+                    np.savez(fid, **entry)
+                os.replace(tmp_fname, fname)
+            except OSError as exc:
+                warn(f"Could not write the cached {kind} to {fname}: {exc}")
+
+    def _insert(self, name, entry):
+        n_bytes = _entry_bytes(entry)
+        if n_bytes > self.max_bytes:
+            return
+        with self._lock:
+            self._entries.pop(name, None)
+            self._entries[name] = entry
+            total = sum(_entry_bytes(e) for e in self._entries.values())
+            while total > self.max_bytes:
+                # drop the least recently used entry
+                total -= _entry_bytes(self._entries.pop(next(iter(self._entries))))
+
+    def _use_config(self):
+        return get_config(self.config_key, "false").lower() == "true"
+
+    def _fname(self, name, cache_dir=None):
+        if not self._use_config():
+            return None
+        if get_config("MNE_CACHE_DIR", None) is not None:
+            cache_dir = Path(get_config("MNE_CACHE_DIR")) / self.subdir
+        if cache_dir is None:
+            return None
+        return Path(cache_dir) / f"{name}.npz"
+
+
+def _entry_bytes(entry):
+    return sum(np.asarray(value).nbytes for value in entry.values())
+
+
 def _array_repr(x):
     """Produce compact info about float ndarray x."""
     assert isinstance(x, np.ndarray), type(x)
@@ -22,6 +22,7 @@ from mne.utils import (
     _apply_scaling_array,
     _apply_scaling_cov,
     _array_equal_nan,
+    _ArrayCache,
     _custom_lru_cache,
     _date_to_julian,
     _freq_mask,
@@ -607,6 +608,31 @@ def test_custom_lru_cache():
     assert n_calls == [2, 2]  # never did any computation
 
 
+@pytest.mark.parametrize("memory", (True, False))
+def test_array_cache(memory, tmp_path, monkeypatch):
+    """Test the least recently used store of arrays."""
+    monkeypatch.delenv("MNE_CACHE_DIR", raising=False)
+    monkeypatch.setenv("MNE_CACHE_FOO", "false")
+    cache = _ArrayCache(100, "foo", "MNE_CACHE_FOO", memory=memory)
+    assert cache.enabled is memory
+    entry = dict(x=np.arange(10.0))
+    cache.put("x", 1, entry)
+    assert (cache.get("x", 1) is entry) is memory
+    # nothing is stored in memory unless enabled by the config
+    monkeypatch.setenv("MNE_CACHE_FOO", "true")
+    assert cache.enabled
+    cache.put("x", 1, entry)
+    cache.put("x", 2, dict(x=np.zeros(10)))
+    assert cache.get("x", 1) is None  # least recently used entry dropped
+    assert cache.get("x", 2) is not None
+    # disk store
+    cache.clear()
+    cache.put("x", 3, entry, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("x_*.npz"))) == 1
+    cache.clear()
+    assert_array_equal(cache.get("x", 3, cache_dir=tmp_path)["x"], entry["x"])
+
+
 def test_replace_md5(tmp_path):
     """Test _replace_md5."""
     old = tmp_path / "test"